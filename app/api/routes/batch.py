@@ -0,0 +1,119 @@
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.api.routes.device_profiles import _repo, _user_id
+from app.core.config import settings
+from app.db.session import fastapi_session
+from app.orchestrator.orchestrator import PipelineOrchestrator
+from app.profiles.dto import BatchBody, BatchOp, BatchOpResult, BatchResult, CloneFromTemplate, CreateProfile, UpdateProfile
+from app.profiles.pipeline import (
+    CloneExecutor,
+    CloneRequest,
+    CloneValidator,
+    CreateExecutor,
+    CreateRequest,
+    CreateValidator,
+    DeleteExecutor,
+    DeleteRequest,
+    DeleteValidator,
+    GetExecutor,
+    GetRequest,
+    GetValidator,
+    PatchExecutor,
+    PatchRequest,
+    PatchValidator,
+)
+from app.profiles.repository import ConflictError, DeviceProfileRepository, NotFoundError, PreconditionFailed
+
+
+router = APIRouter(prefix="/v1", tags=["batch"])
+
+
+def _create(repo: DeviceProfileRepository, user_id: str, op: BatchOp) -> Any:
+    orch = PipelineOrchestrator[CreateRequest, Any](validators=[CreateValidator()], executors=[CreateExecutor(repo)])
+    return orch.run(CreateRequest(owner_id=user_id, payload=CreateProfile.model_validate(op.body or {})))
+
+
+def _clone(repo: DeviceProfileRepository, user_id: str, op: BatchOp) -> Any:
+    orch = PipelineOrchestrator[CloneRequest, Any](validators=[CloneValidator()], executors=[CloneExecutor(repo)])
+    return orch.run(CloneRequest(owner_id=user_id, payload=CloneFromTemplate.model_validate(op.body or {})))
+
+
+def _patch(repo: DeviceProfileRepository, user_id: str, op: BatchOp) -> Any:
+    orch = PipelineOrchestrator[PatchRequest, Any](validators=[PatchValidator()], executors=[PatchExecutor(repo)])
+    return orch.run(PatchRequest(owner_id=user_id, profile_id=op.id or "", payload=UpdateProfile.model_validate(op.body or {})))
+
+
+def _delete(repo: DeviceProfileRepository, user_id: str, op: BatchOp) -> Any:
+    orch = PipelineOrchestrator[DeleteRequest, Any](validators=[DeleteValidator()], executors=[DeleteExecutor(repo)])
+    return orch.run(DeleteRequest(owner_id=user_id, profile_id=op.id or ""))
+
+
+def _get(repo: DeviceProfileRepository, user_id: str, op: BatchOp) -> Any:
+    orch = PipelineOrchestrator[GetRequest, Any](validators=[GetValidator()], executors=[GetExecutor(repo)])
+    return orch.run(GetRequest(user_id=user_id, profile_id=op.id or "", fields=op.fields))
+
+
+_OPS: Dict[str, Callable[[DeviceProfileRepository, str, BatchOp], Any]] = {
+    "create": _create,
+    "clone": _clone,
+    "patch": _patch,
+    "delete": _delete,
+    "get": _get,
+}
+
+
+def _run(repo: DeviceProfileRepository, user_id: str, op: BatchOp) -> Tuple[int, Any]:
+    # Status codes and error details match the single-profile routes.
+    try:
+        return 200, jsonable_encoder(_OPS[op.op](repo, user_id, op))
+    except ValidationError:
+        return 422, {"detail": "validation_error"}
+    except ConflictError:
+        return 409, {"detail": "conflict"}
+    except NotFoundError:
+        return 404, {"detail": "not_found"}
+    except PreconditionFailed:
+        return 412, {"detail": "version_mismatch"}
+    except ValueError as e:
+        return 400, {"detail": str(e)}
+
+
+@router.post("/batch")
+def run_batch(payload: BatchBody, request: Request, session: Session = Depends(fastapi_session)):
+    user_id = _user_id(request)
+    if not payload.operations or len(payload.operations) > settings.bulk_max_items:
+        raise HTTPException(status_code=400, detail="invalid_batch_size")
+    if any(op.op not in _OPS for op in payload.operations):
+        raise HTTPException(status_code=400, detail="invalid_op")
+    repo = _repo(session)
+    results = []
+    for i, op in enumerate(payload.operations):
+        if payload.atomic:
+            status, body = _run(repo, user_id, op)
+        else:
+            # Each operation in its own savepoint: a failed one is undone on its own and the
+            # others are committed together at the end.
+            savepoint = session.begin_nested()
+            status, body = _run(repo, user_id, op)
+            if status == 200:
+                savepoint.commit()
+            else:
+                savepoint.rollback()
+        results.append(BatchOpResult(index=i, status=status, body=body))
+        if payload.atomic and status != 200:
+            session.rollback()
+            # Earlier operations were undone with the rest of the transaction.
+            results[:i] = [BatchOpResult(index=j, status=424, body={"detail": "rolled_back"}) for j in range(i)]
+            results.extend(
+                BatchOpResult(index=j, status=424, body={"detail": "not_executed"})
+                for j in range(i + 1, len(payload.operations))
+            )
+            return JSONResponse(status_code=status, content=jsonable_encoder(BatchResult(results=results, committed=False)))
+    session.commit()
+    return BatchResult(results=results, committed=True)
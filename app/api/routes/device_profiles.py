@@ -1,22 +1,76 @@
+from typing import Iterator
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import ValidationError
 
-from app.db.session import fastapi_session
+from app.core.config import settings
+from app.db.session import fastapi_session, get_session
 from app.orchestrator.orchestrator import PipelineOrchestrator
-from app.profiles.dto import CreateProfile, UpdateProfile, CloneFromTemplate, ProfileResponse, VersionSnapshotResponse, VersionMeta
+from app.profiles.dto import (
+    BatchGetBody,
+    BatchGetResult,
+    BulkBody,
+    BulkCloneBody,
+    BulkDeleteBody,
+    BulkDeleteResult,
+    BulkResult,
+    CreateProfile,
+    UpdateProfile,
+    CloneFromTemplate,
+    FacetCounts,
+    UpsertResult,
+    ImportResult,
+    NearestMatch,
+    ProfileResponse,
+    VersionSnapshotResponse,
+    VersionMeta,
+)
 from app.profiles.pipeline import (
+    BatchGetExecutor,
+    BatchGetRequest,
+    BatchGetValidator,
+    BULK_INVALID,
+    BULK_NOT_FOUND,
+    BULK_VERSION_MISMATCH,
+    BulkCreateExecutor,
+    BulkCreateRequest,
+    BulkCreateValidator,
+    BulkCloneExecutor,
+    BulkCloneRequest,
+    BulkCloneValidator,
+    BulkDeleteExecutor,
+    BulkDeleteRequest,
+    BulkDeleteValidator,
+    BulkPatchExecutor,
+    BulkPatchRequest,
+    BulkPatchValidator,
     CreateExecutor,
     CreateRequest,
     CreateValidator,
+    DedupeCreateExecutor,
     CloneExecutor,
     CloneRequest,
     CloneValidator,
     DeleteExecutor,
     DeleteRequest,
     DeleteValidator,
+    UPSERT_CREATED,
+    UpsertExecutor,
+    UpsertRequest,
+    UpsertValidator,
+    ExportExecutor,
+    FacetsExecutor,
+    FacetsRequest,
+    NearestExecutor,
+    NearestRequest,
+    NearestValidator,
+    GetByNameExecutor,
+    GetByNameRequest,
+    GetByNameValidator,
     GetExecutor,
     GetRequest,
     GetValidator,
@@ -42,6 +96,7 @@ from app.profiles.pipeline import (
 )
 from app.profiles.repository import DeviceProfileRepository, NotFoundError, PreconditionFailed, ConflictError
 from app.core.idempotency import IdempotencyStore
+from app.profiles.importer import LineSplitter, NdjsonImporter
 
 
 router = APIRouter(prefix="/v1/device-profiles", tags=["device-profiles"])
@@ -59,7 +114,7 @@ def _user_id(request: Request) -> str:
 
 
 @router.post("/")
-def create_profile(payload: dict, request: Request, session: Session = Depends(fastapi_session)):
+def create_profile(payload: dict, request: Request, dedupe: bool = False, session: Session = Depends(fastapi_session)):
     repo = _repo(session)
     store = IdempotencyStore(session)
     try:
@@ -69,6 +124,7 @@ def create_profile(payload: dict, request: Request, session: Session = Depends(f
             cached = store.get(owner_id, idem_key)
             if cached is not None:
                 return cached
+        headers: dict[str, str] | None = None
         if "template_id" in payload:
             clone = CloneFromTemplate.model_validate(payload)
             clone_orch = PipelineOrchestrator[CloneRequest, ProfileResponse](
@@ -77,6 +133,15 @@ def create_profile(payload: dict, request: Request, session: Session = Depends(f
                 response_transformers=[IdentityResponse[ProfileResponse]()],
             )
             resp = clone_orch.run(CloneRequest(owner_id=owner_id, payload=clone))
+        elif dedupe:
+            create = CreateProfile.model_validate(payload)
+            dedupe_orch = PipelineOrchestrator[CreateRequest, tuple[ProfileResponse, bool]](
+                validators=[CreateValidator()],
+                executors=[DedupeCreateExecutor(repo)],
+                response_transformers=[IdentityResponse[tuple[ProfileResponse, bool]]()],
+            )
+            resp, existing = dedupe_orch.run(CreateRequest(owner_id=owner_id, payload=create))
+            headers = {"X-Deduplicated": "true" if existing else "false"}
         else:
             create = CreateProfile.model_validate(payload)
             create_orch = PipelineOrchestrator[CreateRequest, ProfileResponse](
@@ -89,6 +154,8 @@ def create_profile(payload: dict, request: Request, session: Session = Depends(f
             payload_json = jsonable_encoder(resp)
             store.save(owner_id, idem_key, payload_json)
         session.commit()
+        if headers is not None:
+            return JSONResponse(content=jsonable_encoder(resp), headers=headers)
         return resp
     except ConflictError:
         raise HTTPException(status_code=409, detail="conflict")
@@ -98,23 +165,259 @@ def create_profile(payload: dict, request: Request, session: Session = Depends(f
         raise HTTPException(status_code=422, detail="validation_error")
 
 
+# Status of a rolled-back atomic batch, by the most fundamental failure among its items.
+_BULK_FAILURE_STATUS = ((BULK_INVALID, 422), (BULK_NOT_FOUND, 404), (BULK_VERSION_MISMATCH, 412))
+
+
+def _bulk_failure_status(resp: BulkResult) -> int:
+    statuses = {r.status for r in resp.results}
+    return next((code for s, code in _BULK_FAILURE_STATUS if s in statuses), 409)
+
+
+def _finish_bulk_write(session: Session, store: IdempotencyStore, owner_id: str, idem_key: str | None, resp: BulkResult):
+    body = jsonable_encoder(resp)
+    if not resp.committed:
+        session.rollback()
+        return JSONResponse(status_code=_bulk_failure_status(resp), content=body)
+    # The key is only recorded for a batch that was written, so a rejected one can be retried.
+    if idem_key:
+        store.save(owner_id, idem_key, body)
+    session.commit()
+    return body
+
+
+@router.post(":bulk")
+def bulk_create_profiles(payload: BulkBody, request: Request, session: Session = Depends(fastapi_session)):
+    repo = _repo(session)
+    store = IdempotencyStore(session)
+    owner_id = _user_id(request)
+    idem_key = request.headers.get("Idempotency-Key")
+    if idem_key:
+        cached = store.get(owner_id, idem_key)
+        if cached is not None:
+            return cached
+    orch = PipelineOrchestrator[BulkCreateRequest, BulkResult](
+        validators=[BulkCreateValidator()],
+        executors=[BulkCreateExecutor(repo)],
+        response_transformers=[IdentityResponse[BulkResult]()],
+    )
+    try:
+        resp = orch.run(BulkCreateRequest(owner_id=owner_id, items=payload.items, atomic=payload.atomic))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _finish_bulk_write(session, store, owner_id, idem_key, resp)
+
+
+@router.post(":bulk-clone")
+def bulk_clone_profiles(payload: BulkCloneBody, request: Request, session: Session = Depends(fastapi_session)):
+    repo = _repo(session)
+    store = IdempotencyStore(session)
+    owner_id = _user_id(request)
+    idem_key = request.headers.get("Idempotency-Key")
+    if idem_key:
+        cached = store.get(owner_id, idem_key)
+        if cached is not None:
+            return cached
+    orch = PipelineOrchestrator[BulkCloneRequest, BulkResult](
+        validators=[BulkCloneValidator()],
+        executors=[BulkCloneExecutor(repo)],
+        response_transformers=[IdentityResponse[BulkResult]()],
+    )
+    try:
+        resp = orch.run(
+            BulkCloneRequest(owner_id=owner_id, template_id=payload.template_id, items=payload.items, atomic=payload.atomic)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="template_not_found")
+    return _finish_bulk_write(session, store, owner_id, idem_key, resp)
+
+
+@router.patch(":bulk")
+def bulk_patch_profiles(payload: BulkBody, request: Request, session: Session = Depends(fastapi_session)):
+    repo = _repo(session)
+    orch = PipelineOrchestrator[BulkPatchRequest, BulkResult](
+        validators=[BulkPatchValidator()],
+        executors=[BulkPatchExecutor(repo)],
+        response_transformers=[IdentityResponse[BulkResult]()],
+    )
+    try:
+        resp = orch.run(BulkPatchRequest(owner_id=_user_id(request), items=payload.items, atomic=payload.atomic))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ConflictError:
+        raise HTTPException(status_code=409, detail="conflict")
+    if not resp.committed:
+        session.rollback()
+        return JSONResponse(status_code=_bulk_failure_status(resp), content=jsonable_encoder(resp))
+    session.commit()
+    return resp
+
+
+@router.post(":bulk-delete")
+def bulk_delete_profiles(payload: BulkDeleteBody, request: Request, session: Session = Depends(fastapi_session)) -> BulkDeleteResult:
+    repo = _repo(session)
+    orch = PipelineOrchestrator[BulkDeleteRequest, BulkDeleteResult](
+        validators=[BulkDeleteValidator()],
+        executors=[BulkDeleteExecutor(repo)],
+        response_transformers=[IdentityResponse[BulkDeleteResult]()],
+    )
+    try:
+        return orch.run(
+            BulkDeleteRequest(
+                owner_id=_user_id(request),
+                ids=payload.ids,
+                filter=payload.filter,
+                dry_run=payload.dry_run,
+                max_rows=payload.max_rows,
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PreconditionFailed as e:
+        raise HTTPException(status_code=412, detail=str(e))
+
+
+@router.post(":batch-get")
+def batch_get_profiles(payload: BatchGetBody, request: Request, session: Session = Depends(fastapi_session)) -> BatchGetResult:
+    repo = _repo(session)
+    orch = PipelineOrchestrator[BatchGetRequest, BatchGetResult](
+        validators=[BatchGetValidator()],
+        executors=[BatchGetExecutor(repo)],
+        response_transformers=[IdentityResponse[BatchGetResult]()],
+    )
+    try:
+        return orch.run(BatchGetRequest(user_id=_user_id(request), ids=payload.ids, fields=payload.fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(":import")
+async def import_profiles(request: Request) -> ImportResult:
+    # Reads the body as it arrives and hands each batch of lines to a worker thread, so neither
+    # the request nor the result set is ever held in memory whole. Each batch commits on its own.
+    owner_id = _user_id(request)
+    splitter = LineSplitter()
+    pending: list[tuple[int, bytes]] = []
+    n = 0
+    with get_session() as session:
+        importer = NdjsonImporter(_repo(session), owner_id)
+        async for chunk in request.stream():
+            for line in splitter.feed(chunk):
+                n += 1
+                pending.append((n, line))
+            if len(pending) >= settings.import_batch_size:
+                await run_in_threadpool(importer.load, pending)
+                pending = []
+        pending.extend((n + 1 + i, line) for i, line in enumerate(splitter.close()))
+        await run_in_threadpool(importer.load, pending)
+    return importer.result
+
+
+@router.put("/by-name/{name}")
+def upsert_profile_by_name(name: str, payload: dict, request: Request, session: Session = Depends(fastapi_session)):
+    repo = _repo(session)
+    orch = PipelineOrchestrator[UpsertRequest, UpsertResult](
+        validators=[UpsertValidator()],
+        executors=[UpsertExecutor(repo)],
+        response_transformers=[IdentityResponse[UpsertResult]()],
+    )
+    try:
+        # The path names the profile; a body `name` may only differ in case (it sets the stored spelling).
+        body = CreateProfile.model_validate({"name": name, **payload})
+        out = orch.run(UpsertRequest(owner_id=_user_id(request), name=name, payload=body))
+    except ValidationError:
+        raise HTTPException(status_code=422, detail="validation_error")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    session.commit()
+    code = status.HTTP_201_CREATED if out.result == UPSERT_CREATED else status.HTTP_200_OK
+    return JSONResponse(status_code=code, content=jsonable_encoder(out), headers={"ETag": str(out.profile.version)})
+
+
+@router.get(":facets")
+def profile_facets(request: Request, session: Session = Depends(fastapi_session)) -> FacetCounts:
+    repo = _repo(session)
+    orch = PipelineOrchestrator[FacetsRequest, FacetCounts](
+        executors=[FacetsExecutor(repo)],
+        response_transformers=[IdentityResponse[FacetCounts]()],
+    )
+    return orch.run(FacetsRequest(owner_id=_user_id(request)))
+
+
+@router.get(":nearest")
+def nearest_profiles(
+    request: Request,
+    width: int,
+    height: int,
+    k: int = 10,
+    is_template: bool | None = None,
+    device_type: str | None = None,
+    session: Session = Depends(fastapi_session),
+) -> list[NearestMatch]:
+    repo = _repo(session)
+    orch = PipelineOrchestrator[NearestRequest, list[NearestMatch]](
+        validators=[NearestValidator()],
+        executors=[NearestExecutor(repo)],
+        response_transformers=[IdentityResponse[list[NearestMatch]]()],
+    )
+    try:
+        return orch.run(
+            NearestRequest(
+                user_id=_user_id(request),
+                width=width,
+                height=height,
+                k=k,
+                is_template=is_template,
+                device_type=device_type,
+            )
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_parameters")
+
+
+def _conditional_get(request: Request, resp: ProfileResponse | dict) -> Response:
+    # Sparse responses always carry version, so the ETag is the same for any fieldset.
+    etag = str(resp["version"] if isinstance(resp, dict) else resp.version)
+    inm = request.headers.get("If-None-Match")
+    if inm is not None and inm == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(content=jsonable_encoder(resp), headers={"ETag": etag})
+
+
+@router.get("/by-name/{name}")
+def get_profile_by_name(name: str, request: Request, fields: str | None = None, session: Session = Depends(fastapi_session)):
+    repo = _repo(session)
+    orch = PipelineOrchestrator[GetByNameRequest, ProfileResponse | dict](
+        validators=[GetByNameValidator()],
+        executors=[GetByNameExecutor(repo)],
+        response_transformers=[IdentityResponse[ProfileResponse | dict]()],
+    )
+    try:
+        resp = orch.run(GetByNameRequest(user_id=_user_id(request), name=name, fields=fields))
+        return _conditional_get(request, resp)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail="not_found")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_parameters")
+
+
 @router.get("/{profile_id}")
-def get_profile(profile_id: str, request: Request, session: Session = Depends(fastapi_session)):
+def get_profile(profile_id: str, request: Request, fields: str | None = None, session: Session = Depends(fastapi_session)):
     repo = _repo(session)
-    orch = PipelineOrchestrator[GetRequest, ProfileResponse](
+    orch = PipelineOrchestrator[GetRequest, ProfileResponse | dict](
         validators=[GetValidator()],
         executors=[GetExecutor(repo)],
-        response_transformers=[IdentityResponse[ProfileResponse]()],
+        response_transformers=[IdentityResponse[ProfileResponse | dict]()],
     )
     try:
-        resp = orch.run(GetRequest(user_id=_user_id(request), profile_id=profile_id))
-        etag = str(resp.version)
-        inm = request.headers.get("If-None-Match")
-        if inm is not None and inm == etag:
-            return Response(status_code=304, headers={"ETag": etag})
-        return JSONResponse(content=jsonable_encoder(resp), headers={"ETag": etag})
+        resp = orch.run(GetRequest(user_id=_user_id(request), profile_id=profile_id, fields=fields))
+        return _conditional_get(request, resp)
     except NotFoundError:
         raise HTTPException(status_code=404, detail="not_found")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_parameters")
 
 
 @router.get("/")
@@ -124,15 +427,26 @@ def list_profiles(
     device_type: str | None = None,
     country: str | None = None,
     q: str | None = None,
+    match: str = "prefix",
+    ua: str | None = None,
+    min_width: int | None = None,
+    max_width: int | None = None,
+    min_height: int | None = None,
+    max_height: int | None = None,
+    has_header: str | None = None,
+    header: str | None = None,
     limit: int = 20,
     cursor: str | None = None,
+    with_total: bool = False,
+    sort: str = "created_at",
+    fields: str | None = None,
     session: Session = Depends(fastapi_session),
 ):
     repo = _repo(session)
     orch = PipelineOrchestrator[ListRequest, ListResponse](
         validators=[ListValidator()],
         request_transformers=[ListRequestTransformer()],
-        executors=[ListExecutor(repo)],
+        executors=[ListExecutor(repo, get_session)],
         response_transformers=[IdentityResponse[ListResponse]()],
     )
     try:
@@ -143,12 +457,71 @@ def list_profiles(
                 device_type=device_type,
                 country=country,
                 q=q,
+                match=match,
+                ua=ua,
+                min_width=min_width,
+                max_width=max_width,
+                min_height=min_height,
+                max_height=max_height,
+                has_header=has_header,
+                header=header,
                 limit=limit,
                 cursor=cursor,
+                with_total=with_total,
+                sort=sort,
+                fields=fields,
+            )
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid_parameters")
+
+
+@router.get(":export")
+def export_profiles(
+    request: Request,
+    is_template: bool | None = None,
+    device_type: str | None = None,
+    country: str | None = None,
+    q: str | None = None,
+    match: str = "prefix",
+    ua: str | None = None,
+    min_width: int | None = None,
+    max_width: int | None = None,
+    min_height: int | None = None,
+    max_height: int | None = None,
+    has_header: str | None = None,
+    header: str | None = None,
+    fields: str | None = None,
+    gzip: bool = False,
+):
+    orch = PipelineOrchestrator[ListRequest, Iterator[bytes]](
+        validators=[ListValidator()],
+        request_transformers=[ListRequestTransformer()],
+        executors=[ExportExecutor(get_session, gzip=gzip)],
+    )
+    try:
+        body = orch.run(
+            ListRequest(
+                user_id=_user_id(request),
+                is_template=is_template,
+                device_type=device_type,
+                country=country,
+                q=q,
+                match=match,
+                ua=ua,
+                min_width=min_width,
+                max_width=max_width,
+                min_height=min_height,
+                max_height=max_height,
+                has_header=has_header,
+                header=header,
+                fields=fields,
             )
         )
     except ValueError:
         raise HTTPException(status_code=400, detail="invalid_parameters")
+    headers = {"Content-Encoding": "gzip"} if gzip else None
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
 
 
 @router.patch("/{profile_id}")
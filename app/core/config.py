@@ -6,6 +6,16 @@ class Settings(BaseSettings):
     env: str = Field(default="dev", alias="ENV")
     port: int = Field(default=8080, alias="PORT")
     log_level: str = Field(default="info", alias="LOG_LEVEL")
+    snapshot_checkpoint_interval: int = Field(default=20, alias="SNAPSHOT_CHECKPOINT_INTERVAL")
+    snapshot_codec: str = Field(default="json", alias="SNAPSHOT_CODEC")
+    snapshot_write_mode: str = Field(default="inline", alias="SNAPSHOT_WRITE_MODE")
+    snapshot_outbox_flush_ms: int = Field(default=200, alias="SNAPSHOT_OUTBOX_FLUSH_MS")
+    snapshot_outbox_batch_size: int = Field(default=1000, alias="SNAPSHOT_OUTBOX_BATCH_SIZE")
+    list_count_exact_limit: int = Field(default=10_000, alias="LIST_COUNT_EXACT_LIMIT")
+    bulk_max_items: int = Field(default=1000, alias="BULK_MAX_ITEMS")
+    export_batch_size: int = Field(default=2000, alias="EXPORT_BATCH_SIZE")
+    import_batch_size: int = Field(default=5000, alias="IMPORT_BATCH_SIZE")
+    import_max_errors: int = Field(default=1000, alias="IMPORT_MAX_ERRORS")
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore"
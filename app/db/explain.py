@@ -0,0 +1,31 @@
+from typing import Any, Dict, Iterator
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ClauseElement
+from sqlalchemy.sql.compiler import SQLCompiler
+
+
+def explain(session: Session, stmt: ClauseElement, analyze: bool = False) -> Dict[str, Any]:
+    # Runs EXPLAIN (FORMAT JSON) for a Core/ORM statement and returns the top-level plan node.
+    conn = session.connection()
+    dialect = conn.dialect
+    compiled = stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+    assert isinstance(compiled, SQLCompiler)
+    params = dict(compiled.construct_params() or {})
+    for name, bind in compiled.binds.items():
+        proc = bind.type.bind_processor(dialect)
+        if proc is not None and name in params:
+            params[name] = proc(params[name])
+    opts = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    row = conn.exec_driver_sql(f"EXPLAIN ({opts}) {compiled.string}", params).scalar_one()
+    return row[0]["Plan"]
+
+
+def iter_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+def uses_index(plan: Dict[str, Any], index_name: str) -> bool:
+    return any(n.get("Index Name") == index_name for n in iter_nodes(plan))
@@ -3,17 +3,21 @@ from datetime import datetime
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     TIMESTAMP,
     Boolean,
     CheckConstraint,
     Enum,
     ForeignKey,
+    Identity,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy import func
 
@@ -30,6 +34,11 @@ class Visibility(enum.Enum):
     global_ = "global"
 
 
+# Mirrors the constant conditions in scope_global_templates so the planner can prove the
+# partial indexes below apply to that branch.
+GLOBAL_TEMPLATE_PREDICATE = "deleted_at IS NULL AND is_template IS true AND visibility = 'global_'"
+
+
 class User(Base):
     __tablename__ = "users"
     id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -58,7 +67,9 @@ class DeviceProfile(Base):
     height: Mapped[int] = mapped_column(Integer, nullable=False)
     user_agent: Mapped[str] = mapped_column(Text, nullable=False)
     country: Mapped[str] = mapped_column(String, nullable=False)
-    custom_headers: Mapped[dict | None] = mapped_column(JSON)
+    custom_headers: Mapped[dict | None] = mapped_column(JSONB)
+    # sha256 of the content columns (app.profiles.fingerprint), for deduplicated creates.
+    content_hash: Mapped[str | None] = mapped_column(String(64))
     is_template: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
     visibility: Mapped[Visibility] = mapped_column(Enum(Visibility, name="visibility"), nullable=False, server_default=text("'private'"))
     version: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("1"))
@@ -69,9 +80,23 @@ class DeviceProfile(Base):
     __table_args__ = (
         CheckConstraint("width BETWEEN 1 AND 10000 AND height BETWEEN 1 AND 10000", name="chk_window"),
         CheckConstraint("country ~ '^[a-z]{2}$'", name="chk_country"),
-        Index("idx_profiles_owner", "owner_id", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_owner_created", "owner_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_global_tmpl_created", "created_at", "id", postgresql_where=text(GLOBAL_TEMPLATE_PREDICATE)),
+        Index("idx_profiles_owner_id", "owner_id", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_global_tmpl_id", "id", postgresql_where=text(GLOBAL_TEMPLATE_PREDICATE)),
+        Index("idx_profiles_owner_updated", "owner_id", "updated_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_global_tmpl_updated", "updated_at", "id", postgresql_where=text(GLOBAL_TEMPLATE_PREDICATE)),
+        Index("idx_profiles_owner_name", "owner_id", text("lower(name)"), "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_global_tmpl_name", text("lower(name)"), "id", postgresql_where=text(GLOBAL_TEMPLATE_PREDICATE)),
         Index("idx_profiles_type", "device_type", postgresql_where=text("deleted_at IS NULL")),
         Index("idx_profiles_tmpl", "is_template", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_name_prefix", "owner_id", text("lower(name) text_pattern_ops"), postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_name_trgm", "owner_id", text("lower(name) gin_trgm_ops"), postgresql_using="gin", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_ua_trgm", "owner_id", text("user_agent gin_trgm_ops"), postgresql_using="gin", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_owner_viewport", "owner_id", text("point(width, height)"), postgresql_using="gist", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_global_tmpl_viewport", text("point(width, height)"), postgresql_using="gist", postgresql_where=text(GLOBAL_TEMPLATE_PREDICATE)),
+        Index("idx_profiles_headers", "custom_headers", postgresql_using="gin", postgresql_where=text("deleted_at IS NULL")),
+        Index("idx_profiles_owner_content_hash", "owner_id", "content_hash", postgresql_where=text("deleted_at IS NULL")),
     Index("uniq_owner_name_not_deleted", "owner_id", text("lower(name)"), unique=True, postgresql_where=text("deleted_at IS NULL")),
     )
 
@@ -80,10 +105,47 @@ class DeviceProfileVersion(Base):
     __tablename__ = "device_profile_versions"
     profile_id: Mapped[str] = mapped_column(String, ForeignKey("device_profiles.id"), primary_key=True)
     version: Mapped[int] = mapped_column(Integer, primary_key=True)
-    snapshot: Mapped[dict] = mapped_column(JSON, nullable=False)
+    snapshot: Mapped[dict | None] = mapped_column(JSONB)
+    snapshot_z: Mapped[bytes | None] = mapped_column(LargeBinary)
+    codec: Mapped[str | None] = mapped_column(String)
+    is_checkpoint: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("true"))
+    changed_by: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
+    changed_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("snapshot IS NOT NULL OR snapshot_z IS NOT NULL", name="chk_snapshot_present"),
+    )
+
+
+class DeviceProfileVersionOutbox(Base):
+    # Snapshots queued in the writing transaction when SNAPSHOT_WRITE_MODE=outbox; a background
+    # writer moves them into device_profile_versions in seq order.
+    __tablename__ = "device_profile_version_outbox"
+    seq: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    profile_id: Mapped[str] = mapped_column(String, ForeignKey("device_profiles.id"), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    snapshot: Mapped[dict | None] = mapped_column(JSONB)
+    snapshot_z: Mapped[bytes | None] = mapped_column(LargeBinary)
+    codec: Mapped[str | None] = mapped_column(String)
+    is_checkpoint: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("true"))
     changed_by: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
     changed_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), server_default=text("now()"), nullable=False)
 
+    __table_args__ = (
+        Index("uniq_outbox_profile_version", "profile_id", "version", unique=True),
+    )
+
+
+class DeviceProfileFacet(Base):
+    # Live (non-deleted) profile counts per owner and facet combination, maintained in the same
+    # transaction as every profile write; app.profiles.facets.reconcile rebuilds them from source.
+    __tablename__ = "device_profile_facets"
+    owner_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), primary_key=True)
+    device_type: Mapped[DeviceType] = mapped_column(Enum(DeviceType, name="device_type"), primary_key=True)
+    country: Mapped[str] = mapped_column(String, primary_key=True)
+    is_template: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default=text("0"))
+
 
 class IdempotencyKey(Base):
     __tablename__ = "idempotency_keys"
@@ -1,4 +1,4 @@
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, literal, or_
 from sqlalchemy.sql import Select
 
 from app.db.models import DeviceProfile, Visibility
@@ -13,3 +13,21 @@ def scope_profiles(query: Select, user_id: str, include_templates: bool = True)
     else:
         cond = and_(base, own)
     return query.where(cond)
+
+
+def scope_owned(query: Select, user_id: str) -> Select:
+    return query.where(and_(DeviceProfile.deleted_at.is_(None), DeviceProfile.owner_id == user_id))
+
+
+def scope_global_templates(query: Select, user_id: str) -> Select:
+    # The second half of scope_profiles' OR as its own branch. Rows owned by `user_id` are left to
+    # scope_owned so a UNION ALL of the two never repeats a profile. The constants are rendered
+    # inline so the planner can match the partial indexes on this predicate.
+    return query.where(
+        and_(
+            DeviceProfile.deleted_at.is_(None),
+            DeviceProfile.is_template.is_(True),
+            DeviceProfile.visibility == literal(Visibility.global_, DeviceProfile.visibility.type, literal_execute=True),
+            DeviceProfile.owner_id != user_id,
+        )
+    )
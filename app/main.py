@@ -1,13 +1,34 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from dotenv import load_dotenv
+from app.api.routes.batch import router as batch_router
 from app.api.routes.health import router as health_router
 from app.api.routes.device_profiles import router as profiles_router
 from app.auth.middleware import ApiKeyAuthMiddleware
+from app.core.config import settings
+from app.db.session import get_session
+from app.profiles.outbox import OutboxWriter
+from app.profiles.repository import WRITE_MODE_OUTBOX
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    writer = None
+    if settings.snapshot_write_mode == WRITE_MODE_OUTBOX:
+        writer = OutboxWriter(get_session, settings.snapshot_outbox_flush_ms, settings.snapshot_outbox_batch_size)
+        writer.start()
+    try:
+        yield
+    finally:
+        if writer is not None:
+            writer.stop()
 
 
 def create_app() -> FastAPI:
     load_dotenv()
     app = FastAPI(
+        lifespan=lifespan,
         title="ZenRows Device Profiles API",
         version="0.0.1",
         servers=[{"url": "/", "description": "Container default"}],
@@ -16,6 +37,7 @@ def create_app() -> FastAPI:
     app.add_middleware(ApiKeyAuthMiddleware)
     app.include_router(health_router)
     app.include_router(profiles_router)
+    app.include_router(batch_router)
     # Add API Key auth to OpenAPI so Swagger 'Authorize' can send X-API-Key
     # Note: Middleware still enforces it server-side.
     if app.openapi_schema is None:
@@ -0,0 +1,40 @@
+import zlib
+from typing import Callable, ContextManager, Iterator
+
+from pydantic_core import to_json
+from sqlalchemy.orm import Session
+
+from app.profiles.dto import ProfileResponse, sparse_profile
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+def iter_ndjson(
+    session_factory: Callable[[], ContextManager[Session]],
+    user_id: str,
+    filters: ListFilters,
+    batch_size: int,
+    gzip: bool = False,
+) -> Iterator[bytes]:
+    # Runs on its own session because the response is streamed after the request handler has
+    # returned. One REPEATABLE READ READ ONLY transaction gives every row from a single snapshot;
+    # output is emitted one chunk per fetched batch, so memory stays flat for any catalog size.
+    z = zlib.compressobj(wbits=31) if gzip else None
+    with session_factory() as s:
+        s.connection(execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True})
+        repo = DeviceProfileRepository(s)
+        buf = []
+        for r in repo.iter_export(user_id, filters, batch_size):
+            if filters.fields is not None:
+                buf.append(to_json(sparse_profile(r, filters.fields)))
+            else:
+                buf.append(ProfileResponse.from_row(r).model_dump_json().encode())
+            if len(buf) >= batch_size:
+                chunk = b"\n".join(buf) + b"\n"
+                buf = []
+                yield z.compress(chunk) if z is not None else chunk
+        s.rollback()
+    if buf:
+        chunk = b"\n".join(buf) + b"\n"
+        yield z.compress(chunk) if z is not None else chunk
+    if z is not None:
+        yield z.flush()
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.db.models import DeviceProfile, DeviceProfileFacet, DeviceType
+from app.profiles.dto import FacetCounts
+
+
+# (owner_id, device_type, country, is_template)
+FacetKey = Tuple[str, DeviceType, str, bool]
+
+_KEY_COLUMNS = ("owner_id", "device_type", "country", "is_template")
+
+
+def facet_key(dp: Union[DeviceProfile, Row]) -> FacetKey:
+    return (dp.owner_id, DeviceType(dp.device_type), dp.country, bool(dp.is_template))
+
+
+def snapshot_key(snap: Dict[str, Any]) -> FacetKey:
+    # The same key from a stored version snapshot (see build_snapshot).
+    return (snap["owner_id"], DeviceType(snap["device_type"]), snap["country"], bool(snap["is_template"]))
+
+
+def change(old: Optional[FacetKey], new: Optional[FacetKey]) -> Dict[FacetKey, int]:
+    deltas: Dict[FacetKey, int] = {}
+    if old is not None:
+        deltas[old] = deltas.get(old, 0) - 1
+    if new is not None:
+        deltas[new] = deltas.get(new, 0) + 1
+    return deltas
+
+
+def combine(changes: Iterable[Dict[FacetKey, int]]) -> Dict[FacetKey, int]:
+    deltas: Dict[FacetKey, int] = {}
+    for c in changes:
+        for k, d in c.items():
+            deltas[k] = deltas.get(k, 0) + d
+    return deltas
+
+
+def created(rows: Iterable[Union[DeviceProfile, Row]]) -> Dict[FacetKey, int]:
+    return combine(change(None, facet_key(r)) for r in rows)
+
+
+def bump(session: Session, deltas: Dict[FacetKey, int]) -> None:
+    # One multi-row upsert per write. Rows are sent in key order so two transactions touching
+    # the same counters lock them in the same order and cannot deadlock.
+    rows = [
+        dict(zip(_KEY_COLUMNS, k), count=n)
+        for k, n in sorted(deltas.items(), key=lambda kv: (kv[0][0], kv[0][1].value, kv[0][2], kv[0][3]))
+        if n != 0
+    ]
+    if not rows:
+        return
+    stmt = pg_insert(DeviceProfileFacet).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_KEY_COLUMNS),
+        set_={"count": DeviceProfileFacet.count + stmt.excluded.count},
+    )
+    session.execute(stmt)
+
+
+def owner_facets(session: Session, owner_id: str) -> FacetCounts:
+    f = DeviceProfileFacet
+    rows = session.execute(
+        select(f.device_type, f.country, f.is_template, f.count).where(f.owner_id == owner_id, f.count > 0)
+    ).all()
+    out = FacetCounts()
+    for device_type, country, is_template, n in rows:
+        out.total += n
+        dt = DeviceType(device_type).value
+        out.device_type[dt] = out.device_type.get(dt, 0) + n
+        out.country[country] = out.country.get(country, 0) + n
+        tk = "true" if is_template else "false"
+        out.is_template[tk] = out.is_template.get(tk, 0) + n
+    return out
+
+
+def reconcile(session: Session, owner_id: Optional[str] = None) -> int:
+    # Recomputes counters from device_profiles and returns how many keys had drifted. The
+    # SHARE ROW EXCLUSIVE lock waits for in-flight writers (their upserts hold ROW EXCLUSIVE)
+    # and blocks new ones until the caller commits, so the recount cannot race a write.
+    session.execute(text("LOCK TABLE device_profile_facets IN SHARE ROW EXCLUSIVE MODE"))
+    f = DeviceProfileFacet
+    dp = DeviceProfile
+    cur_q = select(f.owner_id, f.device_type, f.country, f.is_template, f.count).where(f.count != 0)
+    src_q = (
+        select(dp.owner_id, dp.device_type, dp.country, dp.is_template, func.count())
+        .where(dp.deleted_at.is_(None))
+        .group_by(dp.owner_id, dp.device_type, dp.country, dp.is_template)
+    )
+    clear = delete(f)
+    if owner_id is not None:
+        cur_q = cur_q.where(f.owner_id == owner_id)
+        src_q = src_q.where(dp.owner_id == owner_id)
+        clear = clear.where(f.owner_id == owner_id)
+    current = {tuple(r[:4]): r[4] for r in session.execute(cur_q).all()}
+    source = {tuple(r[:4]): r[4] for r in session.execute(src_q).all()}
+    drifted = sum(1 for k in current.keys() | source.keys() if current.get(k) != source.get(k))
+    if drifted:
+        session.execute(clear)
+        session.execute(insert(f).from_select([*_KEY_COLUMNS, "count"], src_q))
+    return drifted
@@ -0,0 +1,29 @@
+import hashlib
+import json
+from typing import Any, Dict, Mapping
+
+from app.db.models import DeviceType
+
+
+# Columns that make up a profile's content; name, template flag and visibility are labels on it.
+CONTENT_COLUMNS = ("device_type", "width", "height", "user_agent", "country", "custom_headers")
+
+
+def content_hash(vals: Mapping[str, Any]) -> str:
+    # sha256 over a canonical JSON array of the content columns. Header keys are already
+    # lowercased by HeaderKV and sorted here; no headers and an empty header map hash the same.
+    device_type = vals["device_type"]
+    canonical = [
+        device_type.value if isinstance(device_type, DeviceType) else str(device_type),
+        int(vals["width"]),
+        int(vals["height"]),
+        vals["user_agent"],
+        vals["country"],
+        vals["custom_headers"] or {},
+    ]
+    raw = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def with_content_hash(vals: Dict[str, Any]) -> Dict[str, Any]:
+    return {**vals, "content_hash": content_hash(vals)}
@@ -0,0 +1,46 @@
+import os
+import threading
+import time
+
+
+PROFILE_ID_PREFIX = "prof_"
+
+# Crockford base32, lower-cased: the ASCII order of the digits matches their numeric order, so
+# encoded ids sort as the integers they encode.
+_ALPHABET = "0123456789abcdefghjkmnpqrstvwxyz"
+_RANDOM_BITS = 80
+
+_lock = threading.Lock()
+_last_ms = -1
+_last_rand = 0
+
+
+def _encode(value: int, length: int) -> str:
+    out = []
+    for _ in range(length):
+        out.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(out))
+
+
+def new_ulid() -> str:
+    # 48-bit millisecond timestamp followed by 80 random bits (ULID layout, 26 chars). Within the
+    # same millisecond the random part is incremented, so ids from one process are strictly
+    # increasing even when generated faster than the clock ticks.
+    global _last_ms, _last_rand
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _last_ms:
+            ms = _last_ms
+            rand = _last_rand + 1
+            if rand >> _RANDOM_BITS:
+                ms += 1
+                rand = int.from_bytes(os.urandom(10), "big")
+        else:
+            rand = int.from_bytes(os.urandom(10), "big")
+        _last_ms, _last_rand = ms, rand
+    return _encode(ms, 10) + _encode(rand, 16)
+
+
+def new_profile_id() -> str:
+    return PROFILE_ID_PREFIX + new_ulid()
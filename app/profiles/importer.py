@@ -0,0 +1,92 @@
+import json
+from typing import List, Optional, Tuple
+
+import psycopg
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.profiles.dto import CreateProfile, ImportLineError, ImportResult
+from app.profiles.ids import new_profile_id
+from app.profiles.repository import DeviceProfileRepository, create_values
+
+
+class LineSplitter:
+    # Re-cuts arbitrary body chunks into complete NDJSON lines.
+    def __init__(self) -> None:
+        self._tail = b""
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        lines = (self._tail + chunk).split(b"\n")
+        self._tail = lines.pop()
+        return lines
+
+    def close(self) -> List[bytes]:
+        tail, self._tail = self._tail, b""
+        return [tail]
+
+
+class NdjsonImporter:
+    # Validates NDJSON lines as CreateProfile and loads each batch with COPY into staging plus one
+    # set-based merge, committing per batch. Line numbers are 1-based; blank lines are skipped.
+    # A batch the database rejects is rolled back and reported against its lines; later batches
+    # still load.
+    def __init__(self, repo: DeviceProfileRepository, owner_id: str, max_errors: Optional[int] = None) -> None:
+        self.repo = repo
+        self.owner_id = owner_id
+        self.max_errors = settings.import_max_errors if max_errors is None else max_errors
+        self.result = ImportResult()
+
+    def _error(self, line: int, error: str) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < self.max_errors:
+            self.result.errors.append(ImportLineError(line=line, error=error))
+        else:
+            self.result.errors_omitted += 1
+
+    def load(self, lines: List[Tuple[int, bytes]]) -> None:
+        staged = []
+        for n, raw in lines:
+            if not raw.strip():
+                continue
+            self.result.received += 1
+            try:
+                d = CreateProfile.model_validate_json(raw)
+            except ValidationError as e:
+                err = e.errors()[0]
+                loc = ".".join(str(p) for p in err["loc"])
+                self._error(n, f"{loc}: {err['msg']}" if loc else err["msg"])
+                continue
+            vals = create_values(d)
+            staged.append(
+                (
+                    n,
+                    new_profile_id(),
+                    vals["name"],
+                    vals["device_type"].name,
+                    vals["width"],
+                    vals["height"],
+                    vals["user_agent"],
+                    vals["country"],
+                    json.dumps(vals["custom_headers"]) if vals["custom_headers"] is not None else None,
+                    vals["is_template"],
+                    vals["visibility"].name,
+                    vals["content_hash"],
+                )
+            )
+        if not staged:
+            return
+        try:
+            self.repo.stage_import(staged)
+            created = {r.id for r in self.repo.merge_staged(self.owner_id)}
+            self.repo.session.commit()
+        except (SQLAlchemyError, psycopg.Error):
+            # The staging COPY runs on the raw psycopg connection, so its errors arrive unwrapped.
+            self.repo.session.rollback()
+            for row in staged:
+                self._error(row[0], "batch_failed")
+            return
+        self.result.created += len(created)
+        for row in staged:
+            if row[1] not in created:
+                self._error(row[0], "name already exists")
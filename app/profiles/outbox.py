@@ -0,0 +1,93 @@
+import logging
+import threading
+from typing import Callable, ContextManager
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.models import DeviceProfileVersion, DeviceProfileVersionOutbox
+
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant shared by all writers; only the holder drains, which keeps moves in seq order.
+OUTBOX_LOCK_KEY = 0x5A52_0001
+
+_COLUMNS = (
+    "profile_id",
+    "version",
+    "snapshot",
+    "snapshot_z",
+    "codec",
+    "is_checkpoint",
+    "changed_by",
+    "changed_at",
+)
+
+
+def drain_once(session: Session, batch_size: int) -> int:
+    # Moves the oldest `batch_size` entries with a single DELETE ... RETURNING feeding a
+    # multi-row INSERT, so an entry is visible in exactly one of the two tables at any time.
+    locked = session.execute(select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_KEY))).scalar()
+    if not locked:
+        session.rollback()
+        return 0
+    ob = DeviceProfileVersionOutbox
+    oldest = select(ob.seq).order_by(ob.seq).limit(batch_size)
+    moved = (
+        delete(ob)
+        .where(ob.seq.in_(oldest.scalar_subquery()))
+        .returning(ob.seq, *(getattr(ob, c) for c in _COLUMNS))
+        .cte("moved")
+    )
+    stmt = (
+        insert(DeviceProfileVersion)
+        .from_select(list(_COLUMNS), select(*(moved.c[c] for c in _COLUMNS)).order_by(moved.c.seq))
+        .add_cte(moved)
+        .returning(DeviceProfileVersion.profile_id)
+    )
+    n = len(session.execute(stmt).all())
+    session.commit()
+    return n
+
+
+def drain_all(session: Session, batch_size: int) -> int:
+    total = 0
+    while True:
+        n = drain_once(session, batch_size)
+        total += n
+        if n < batch_size:
+            return total
+
+
+class OutboxWriter:
+    # Background thread that drains the outbox every `flush_ms`. Each tick empties the whole
+    # queue, so a committed snapshot waits at most one interval plus the drain time.
+    def __init__(self, session_factory: Callable[[], ContextManager[Session]], flush_ms: int, batch_size: int) -> None:
+        self.session_factory = session_factory
+        self.flush_ms = flush_ms
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="version-outbox-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        # Final drain so a graceful shutdown leaves nothing behind.
+        self._tick()
+
+    def _tick(self) -> None:
+        try:
+            with self.session_factory() as s:
+                drain_all(s, self.batch_size)
+        except Exception:  # pragma: no cover - logged and retried on the next tick
+            logger.exception("version outbox drain failed")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_ms / 1000):
+            self._tick()
@@ -1,7 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, replace
-from typing import List, Optional, Tuple, TypeVar, Generic
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple, Type, TypeVar, Generic, Union
 from datetime import datetime
 import base64
+import json
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
 
 from app.orchestrator.base import (
     BaseExecutor,
@@ -9,9 +15,27 @@ from app.orchestrator.base import (
     BaseResponseTransformer,
     BaseValidator,
 )
-from app.profiles.dto import CreateProfile, UpdateProfile, ProfileResponse, CloneFromTemplate
-from app.profiles.repository import DeviceProfileRepository, ListFilters
+from app.profiles.dto import CreateProfile, UpdateProfile, ProfileResponse, CloneFromTemplate, FacetCounts, NearestMatch
+from app.profiles.dto import CloneOverrides, UpsertResult
+from app.profiles.export import iter_ndjson
+from app.profiles.dto import BatchGetItem, BatchGetResult, BulkDeleteResult, BulkItemResult, BulkResult, DeleteFilter
+from app.profiles.dto import sparse_profile
+from app.profiles.repository import (
+    Cursor,
+    DeviceProfileRepository,
+    ListFilters,
+    MATCH_FUZZY,
+    MATCH_MODES,
+    MATCH_PREFIX,
+    SORT_CREATED,
+    SORT_ID,
+    SORT_MODES,
+    SORT_NAME,
+    WINDOW_MAX,
+    WINDOW_MIN,
+)
 from app.profiles.dto import ALLOWED_COUNTRIES
+from app.core.config import settings
 from app.db.models import DeviceType
 from app.profiles.dto import VersionMeta, VersionSnapshotResponse
 
@@ -36,6 +60,210 @@ class CreateExecutor(BaseExecutor[CreateRequest, ProfileResponse]):
         return ProfileResponse.from_model(dp)
 
 
+class DedupeCreateExecutor(BaseExecutor[CreateRequest, Tuple[ProfileResponse, bool]]):
+    # Returns the owner's existing profile with the same content and kind instead of inserting a
+    # new one; the flag tells whether that happened.
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: CreateRequest) -> Tuple[ProfileResponse, bool]:
+        existing = self.repo.find_by_content(request.owner_id, request.payload)
+        if existing is not None:
+            return ProfileResponse.from_row(existing), True
+        return CreateExecutor(self.repo).execute(request), False
+
+
+BULK_CREATED = "created"
+BULK_CONFLICT = "conflict"
+BULK_INVALID = "invalid"
+BULK_ABORTED = "aborted"
+BULK_UPDATED = "updated"
+BULK_NOT_FOUND = "not_found"
+BULK_VERSION_MISMATCH = "version_mismatch"
+
+
+@dataclass
+class BulkCreateRequest:
+    owner_id: str
+    items: List[Dict[str, Any]]
+    atomic: bool = False
+
+
+class BulkCreateValidator(BaseValidator[BulkCreateRequest]):
+    def validate(self, request: BulkCreateRequest) -> None:
+        if not request.items:
+            raise ValueError("empty_batch")
+        if len(request.items) > settings.bulk_max_items:
+            raise ValueError("too_many_items")
+
+
+def _validation_message(e: ValidationError) -> str:
+    err = e.errors()[0]
+    loc = ".".join(str(p) for p in err["loc"])
+    return f"{loc}: {err['msg']}" if loc else err["msg"]
+
+
+class BulkCreateExecutor(BaseExecutor[BulkCreateRequest, BulkResult]):
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: BulkCreateRequest) -> BulkResult:
+        return _bulk_insert(
+            request.items, CreateProfile, lambda ds: self.repo.bulk_create(request.owner_id, ds), request.atomic
+        )
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _bulk_insert(
+    items: List[Dict[str, Any]],
+    model: Type[M],
+    insert: Callable[[List[M]], List[Optional[Row]]],
+    atomic: bool,
+) -> BulkResult:
+    # Validates each raw item as `model`, inserts the valid ones in one call and maps the
+    # returned rows (None for a name conflict) back to per-item results.
+    results: List[Optional[BulkItemResult]] = [None] * len(items)
+    valid: List[Tuple[int, M]] = []
+    for i, raw in enumerate(items):
+        try:
+            valid.append((i, model.model_validate(raw)))
+        except ValidationError as e:
+            results[i] = BulkItemResult(index=i, status=BULK_INVALID, error=_validation_message(e))
+    # An all-or-nothing batch with invalid items is rejected before anything is written.
+    if valid and not (atomic and len(valid) < len(items)):
+        rows = insert([d for _, d in valid])
+        for (i, _), row in zip(valid, rows):
+            if row is None:
+                results[i] = BulkItemResult(index=i, status=BULK_CONFLICT, error="name already exists")
+            else:
+                results[i] = BulkItemResult(index=i, status=BULK_CREATED, profile=ProfileResponse.from_row(row))
+    return _bulk_result(results, BULK_CREATED, atomic)
+
+
+@dataclass
+class BulkCloneRequest:
+    owner_id: str
+    template_id: str
+    items: List[Dict[str, Any]]
+    atomic: bool = False
+
+
+class BulkCloneValidator(BaseValidator[BulkCloneRequest]):
+    def validate(self, request: BulkCloneRequest) -> None:
+        if not request.template_id:
+            raise ValueError("missing_template_id")
+        if not request.items:
+            raise ValueError("empty_batch")
+        if len(request.items) > settings.bulk_max_items:
+            raise ValueError("too_many_items")
+
+
+class BulkCloneExecutor(BaseExecutor[BulkCloneRequest, BulkResult]):
+    # Items are CloneOverrides; the template is read once for the whole batch.
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: BulkCloneRequest) -> BulkResult:
+        return _bulk_insert(
+            request.items,
+            CloneOverrides,
+            lambda os: self.repo.bulk_clone(request.owner_id, request.template_id, os),
+            request.atomic,
+        )
+
+
+def _bulk_result(results: List[Optional[BulkItemResult]], ok: str, atomic: bool) -> BulkResult:
+    out = [r if r is not None else BulkItemResult(index=i, status=BULK_ABORTED) for i, r in enumerate(results)]
+    committed = not (atomic and any(r.status != ok for r in out))
+    if not committed:
+        # The caller rolls the transaction back, so nothing from this batch was written.
+        out = [BulkItemResult(index=r.index, status=BULK_ABORTED) if r.status == ok else r for r in out]
+    succeeded = sum(1 for r in out if r.status == ok)
+    return BulkResult(results=out, succeeded=succeeded, failed=len(out) - succeeded, committed=committed)
+
+
+@dataclass
+class BulkPatchRequest:
+    owner_id: str
+    items: List[Dict[str, Any]]
+    atomic: bool = False
+
+
+class BulkPatchValidator(BaseValidator[BulkPatchRequest]):
+    def validate(self, request: BulkPatchRequest) -> None:
+        if not request.items:
+            raise ValueError("empty_batch")
+        if len(request.items) > settings.bulk_max_items:
+            raise ValueError("too_many_items")
+        # Non-string ids are left to the executor, which reports them as invalid items.
+        ids = [i["id"] for i in request.items if isinstance(i.get("id"), str) and i["id"]]
+        if len(ids) != len(set(ids)):
+            raise ValueError("duplicate_id")
+
+
+class BulkPatchExecutor(BaseExecutor[BulkPatchRequest, BulkResult]):
+    # Items are UpdateProfile bodies (including the expected `version`) plus the profile `id`.
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: BulkPatchRequest) -> BulkResult:
+        results: List[Optional[BulkItemResult]] = [None] * len(request.items)
+        valid: List[Tuple[int, Tuple[str, UpdateProfile]]] = []
+        for i, raw in enumerate(request.items):
+            body = dict(raw)
+            pid = body.pop("id", None)
+            try:
+                data = UpdateProfile.model_validate(body)
+            except ValidationError as e:
+                results[i] = BulkItemResult(index=i, status=BULK_INVALID, error=_validation_message(e))
+                continue
+            if not isinstance(pid, str) or not pid:
+                results[i] = BulkItemResult(index=i, status=BULK_INVALID, error="id: Field required")
+            elif data.version is None:
+                results[i] = BulkItemResult(index=i, status=BULK_INVALID, error="version: Field required")
+            else:
+                valid.append((i, (pid, data)))
+        if valid and not (request.atomic and len(valid) < len(request.items)):
+            outcomes = self.repo.bulk_update(request.owner_id, [item for _, item in valid])
+            for (i, _), (row, reason) in zip(valid, outcomes):
+                if row is None:
+                    results[i] = BulkItemResult(index=i, status=reason or BULK_NOT_FOUND)
+                else:
+                    results[i] = BulkItemResult(index=i, status=BULK_UPDATED, profile=ProfileResponse.from_row(row))
+        return _bulk_result(results, BULK_UPDATED, request.atomic)
+
+
+UPSERT_CREATED = "created"
+UPSERT_UPDATED = "updated"
+UPSERT_UNCHANGED = "unchanged"
+
+
+@dataclass
+class UpsertRequest:
+    owner_id: str
+    name: str
+    payload: CreateProfile
+
+
+class UpsertValidator(BaseValidator[UpsertRequest]):
+    def validate(self, request: UpsertRequest) -> None:
+        if not request.name.strip():
+            raise ValueError("missing_name")
+        if request.payload.name.lower() != request.name.lower():
+            raise ValueError("name_mismatch")
+
+
+class UpsertExecutor(BaseExecutor[UpsertRequest, UpsertResult]):
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: UpsertRequest) -> UpsertResult:
+        result, row = self.repo.upsert_by_name(request.owner_id, request.payload)
+        return UpsertResult(result=result, profile=ProfileResponse.from_row(row))
+
+
 T = TypeVar("T")
 
 
@@ -48,21 +276,95 @@ class IdentityResponse(BaseResponseTransformer[T], Generic[T]):
 class GetRequest:
     user_id: str
     profile_id: str
+    fields: Optional[str] = None
+
+
+def parse_fields(raw: Optional[str]) -> Optional[Tuple[str, ...]]:
+    # "?fields=user_agent,window" -> ("user_agent", "window"); names must be ProfileResponse fields.
+    if raw is None:
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    if not fields or any(f not in ProfileResponse.model_fields for f in fields):
+        raise ValueError("invalid_fields")
+    return fields
 
 
 class GetValidator(BaseValidator[GetRequest]):
     def validate(self, request: GetRequest) -> None:
         if not request.profile_id:
             raise ValueError("missing_id")
+        parse_fields(request.fields)
 
 
-class GetExecutor(BaseExecutor[GetRequest, ProfileResponse]):
+class GetExecutor(BaseExecutor[GetRequest, Union[ProfileResponse, Dict[str, Any]]]):
     def __init__(self, repo: DeviceProfileRepository) -> None:
         self.repo = repo
 
-    def execute(self, request: GetRequest) -> ProfileResponse:
-        dp = self.repo.get_scoped(request.user_id, request.profile_id)
-        return ProfileResponse.from_model(dp)
+    def execute(self, request: GetRequest) -> Union[ProfileResponse, Dict[str, Any]]:
+        fields = parse_fields(request.fields)
+        row = self.repo.get_scoped_row(request.user_id, request.profile_id, fields)
+        if fields is not None:
+            return sparse_profile(row, fields)
+        return ProfileResponse.from_row(row)
+
+
+@dataclass
+class GetByNameRequest:
+    user_id: str
+    name: str
+    fields: Optional[str] = None
+
+
+class GetByNameValidator(BaseValidator[GetByNameRequest]):
+    def validate(self, request: GetByNameRequest) -> None:
+        if not request.name.strip():
+            raise ValueError("missing_name")
+        parse_fields(request.fields)
+
+
+class GetByNameExecutor(BaseExecutor[GetByNameRequest, Union[ProfileResponse, Dict[str, Any]]]):
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: GetByNameRequest) -> Union[ProfileResponse, Dict[str, Any]]:
+        fields = parse_fields(request.fields)
+        row = self.repo.get_scoped_row_by_name(request.user_id, request.name, fields)
+        if fields is not None:
+            return sparse_profile(row, fields)
+        return ProfileResponse.from_row(row)
+
+
+@dataclass
+class BatchGetRequest:
+    user_id: str
+    ids: List[str]
+    fields: Optional[str] = None
+
+
+class BatchGetValidator(BaseValidator[BatchGetRequest]):
+    def validate(self, request: BatchGetRequest) -> None:
+        if not request.ids or any(not i for i in request.ids):
+            raise ValueError("missing_id")
+        if len(request.ids) > settings.bulk_max_items:
+            raise ValueError("too_many_items")
+        parse_fields(request.fields)
+
+
+class BatchGetExecutor(BaseExecutor[BatchGetRequest, BatchGetResult]):
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: BatchGetRequest) -> BatchGetResult:
+        fields = parse_fields(request.fields)
+        ids = list(dict.fromkeys(request.ids))
+        by_id = {r.id: r for r in self.repo.get_scoped_rows(request.user_id, ids, fields)}
+        found = []
+        for pid in ids:
+            r = by_id.get(pid)
+            if r is not None:
+                profile = sparse_profile(r, fields) if fields is not None else ProfileResponse.from_row(r)
+                found.append(BatchGetItem(etag=str(r.version), profile=profile))
+        return BatchGetResult(found=found, missing=[pid for pid in ids if pid not in by_id])
 
 
 @dataclass
@@ -72,15 +374,37 @@ class ListRequest:
     device_type: Optional[str] = None
     country: Optional[str] = None
     q: Optional[str] = None
+    match: str = MATCH_PREFIX
+    ua: Optional[str] = None
+    min_width: Optional[int] = None
+    max_width: Optional[int] = None
+    min_height: Optional[int] = None
+    max_height: Optional[int] = None
+    has_header: Optional[str] = None
+    header: Optional[str] = None
     limit: int = 20
     cursor: Optional[str] = None
-    cursor_decoded: Optional[Tuple[datetime, str]] = None
+    with_total: bool = False
+    sort: str = SORT_CREATED
+    fields: Optional[str] = None
+    cursor_decoded: Optional[Cursor] = None
+    header_eq: Optional[Tuple[str, str]] = None
 
 
 @dataclass
 class ListResponse:
-    data: List[ProfileResponse]
+    data: List[Union[ProfileResponse, Dict[str, Any]]]
     next_cursor: Optional[str]
+    total: Optional[int] = None
+    total_exact: Optional[bool] = None
+
+def _validate_range(lo: Optional[int], hi: Optional[int]) -> None:
+    for v in (lo, hi):
+        if v is not None and not WINDOW_MIN <= v <= WINDOW_MAX:
+            raise ValueError("invalid_window_range")
+    if lo is not None and hi is not None and lo > hi:
+        raise ValueError("invalid_window_range")
+
 
 class ListValidator(BaseValidator[ListRequest]):
     def validate(self, request: ListRequest) -> None:
@@ -92,49 +416,205 @@ class ListValidator(BaseValidator[ListRequest]):
             c = request.country.strip().lower()
             if len(c) != 2 or c not in ALLOWED_COUNTRIES:
                 raise ValueError("invalid_country")
+        if request.ua is not None and not request.ua.strip():
+            raise ValueError("invalid_ua")
+        _validate_range(request.min_width, request.max_width)
+        _validate_range(request.min_height, request.max_height)
+        if request.has_header is not None and not request.has_header.strip():
+            raise ValueError("invalid_header_filter")
+        if request.header is not None:
+            key, sep, _ = request.header.partition(":")
+            if not sep or not key.strip():
+                raise ValueError("invalid_header_filter")
+        if request.sort.strip() not in SORT_MODES:
+            raise ValueError("invalid_sort")
+        parse_fields(request.fields)
+        match = request.match.strip().lower()
+        if match not in MATCH_MODES:
+            raise ValueError("invalid_match")
+        if match == MATCH_FUZZY and (request.q is None or not request.q.strip() or request.cursor):
+            raise ValueError("invalid_match")
+
+def _encode_cursor(sort: str, token: Cursor) -> str:
+    value = token[0].isoformat() if isinstance(token[0], datetime) else token[0]
+    raw = json.dumps({"s": sort, "k": [value, token[1]]}, separators=(",", ":"))
+    return base64.b64encode(raw.encode("utf-8")).decode("utf-8")
+
+
+def _decode_cursor(sort: str, cursor: str) -> Cursor:
+    # Cursors carry the sort they were issued for; the legacy "iso|id" form is the default
+    # created_at order.
+    raw = base64.b64decode(cursor).decode("utf-8")
+    if not raw.startswith("{"):
+        ts, sep, pid = raw.partition("|")
+        if not sep or sort != SORT_CREATED:
+            raise ValueError
+        return (datetime.fromisoformat(ts), pid)
+    body = json.loads(raw)
+    value, pid = body["k"]
+    if body["s"] != sort or not isinstance(value, str) or not isinstance(pid, str):
+        raise ValueError
+    return (value if sort in (SORT_NAME, SORT_ID) else datetime.fromisoformat(value), pid)
+
 
 class ListRequestTransformer(BaseRequestTransformer[ListRequest]):
     def transform(self, request: ListRequest) -> ListRequest:
         country = request.country.strip().lower() if request.country is not None else None
         device_type = request.device_type.strip().lower() if request.device_type is not None else None
         q = request.q.strip() if request.q is not None else None
-        decoded: Optional[Tuple[datetime, str]] = None
+        # Header keys are stored lower-cased (see HeaderKV), values verbatim.
+        has_header = request.has_header.strip().lower() if request.has_header is not None else None
+        header_eq: Optional[Tuple[str, str]] = None
+        if request.header is not None:
+            key, _, value = request.header.partition(":")
+            header_eq = (key.strip().lower(), value.strip())
+        sort = request.sort.strip()
+        decoded: Optional[Cursor] = None
         if request.cursor:
             try:
-                raw = base64.b64decode(request.cursor).decode("utf-8")
-                parts = raw.split("|", 1)
-                if len(parts) != 2:
-                    raise ValueError
-                ts = datetime.fromisoformat(parts[0])
-                decoded = (ts, parts[1])
+                decoded = _decode_cursor(sort, request.cursor)
             except Exception:
                 raise ValueError("invalid_cursor")
-        return replace(request, country=country, device_type=device_type, q=q, cursor_decoded=decoded)
+        return replace(
+            request,
+            country=country,
+            device_type=device_type,
+            q=q,
+            match=request.match.strip().lower(),
+            ua=request.ua.strip() if request.ua is not None else None,
+            has_header=has_header,
+            header_eq=header_eq,
+            sort=sort,
+            cursor_decoded=decoded,
+        )
+
+
+def list_filters(request: ListRequest) -> ListFilters:
+    # Repository filters for a validated, transformed ListRequest.
+    return ListFilters(
+        is_template=request.is_template,
+        device_type=request.device_type,
+        country=request.country,
+        q=request.q,
+        match=request.match,
+        ua=request.ua,
+        min_width=request.min_width,
+        max_width=request.max_width,
+        min_height=request.min_height,
+        max_height=request.max_height,
+        header_key=request.has_header,
+        header_eq=request.header_eq,
+        limit=request.limit,
+        sort=request.sort,
+        cursor=request.cursor_decoded,
+        fields=parse_fields(request.fields),
+    )
 
 
 class ListExecutor(BaseExecutor[ListRequest, ListResponse]):
-    def __init__(self, repo: DeviceProfileRepository) -> None:
+    def __init__(
+        self,
+        repo: DeviceProfileRepository,
+        session_factory: Optional[Callable[[], ContextManager[Session]]] = None,
+    ) -> None:
         self.repo = repo
+        self.session_factory = session_factory
+
+    def _count(self, user_id: str, filters: ListFilters) -> Tuple[int, bool]:
+        if self.session_factory is None:
+            return self.repo.count_scoped(user_id, filters, settings.list_count_exact_limit)
+        with self.session_factory() as s:
+            return DeviceProfileRepository(s).count_scoped(user_id, filters, settings.list_count_exact_limit)
 
     def execute(self, request: ListRequest) -> ListResponse:
-        filters = ListFilters(
-            is_template=request.is_template,
-            device_type=request.device_type,
-            country=request.country,
-            q=request.q,
-            limit=request.limit,
-            cursor=request.cursor_decoded,
-        )
-        rows, next_t = self.repo.list_scoped_page(request.user_id, filters)
-        next_cursor = None
-        if next_t is not None:
-            iso = next_t[0].isoformat()
-            token = base64.b64encode(f"{iso}|{next_t[1]}".encode("utf-8")).decode("utf-8")
-            next_cursor = token
+        filters = list_filters(request)
+        total: Optional[Tuple[int, bool]] = None
+        if request.with_total and self.session_factory is not None:
+            # The count runs on its own session in a worker thread while the page query runs here.
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                fut = pool.submit(self._count, request.user_id, filters)
+                rows, next_t = self.repo.list_scoped_page(request.user_id, filters)
+                total = fut.result()
+        else:
+            rows, next_t = self.repo.list_scoped_page(request.user_id, filters)
+            if request.with_total:
+                total = self._count(request.user_id, filters)
+        next_cursor = _encode_cursor(request.sort, next_t) if next_t is not None else None
         return ListResponse(
-            data=[ProfileResponse.from_model(r) for r in rows],
+            data=[
+                sparse_profile(r, filters.fields) if filters.fields is not None else ProfileResponse.from_row(r)
+                for r in rows
+            ],
             next_cursor=next_cursor,
+            total=total[0] if total is not None else None,
+            total_exact=total[1] if total is not None else None,
+        )
+
+
+class ExportExecutor(BaseExecutor[ListRequest, Iterator[bytes]]):
+    # Takes the list endpoint's request (after ListValidator/ListRequestTransformer); limit,
+    # cursor and sort are ignored and every matching row is streamed in id order.
+    def __init__(self, session_factory: Callable[[], ContextManager[Session]], gzip: bool = False) -> None:
+        self.session_factory = session_factory
+        self.gzip = gzip
+
+    def execute(self, request: ListRequest) -> Iterator[bytes]:
+        return iter_ndjson(self.session_factory, request.user_id, list_filters(request), settings.export_batch_size, self.gzip)
+
+
+@dataclass
+class BulkDeleteRequest:
+    owner_id: str
+    ids: Optional[List[str]] = None
+    filter: Optional[DeleteFilter] = None
+    dry_run: bool = False
+    max_rows: Optional[int] = None
+
+
+def _filter_list_request(owner_id: str, f: DeleteFilter) -> ListRequest:
+    return ListRequest(
+        user_id=owner_id, device_type=f.device_type, country=f.country, is_template=f.is_template, q=f.q, match=f.match
+    )
+
+
+class BulkDeleteValidator(BaseValidator[BulkDeleteRequest]):
+    def validate(self, request: BulkDeleteRequest) -> None:
+        if (request.ids is None) == (request.filter is None):
+            raise ValueError("ids_or_filter_required")
+        if request.ids is not None:
+            if not request.ids or any(not i for i in request.ids):
+                raise ValueError("missing_id")
+            if len(request.ids) > settings.bulk_max_items:
+                raise ValueError("too_many_items")
+        if request.filter is not None:
+            if not request.filter.model_dump(exclude_none=True, exclude={"match"}):
+                raise ValueError("empty_filter")
+            # Same checks as the list endpoint; fuzzy matches are ranked, not exact, so they are
+            # not a safe delete criterion.
+            ListValidator().validate(_filter_list_request(request.owner_id, request.filter))
+            if request.filter.match.strip().lower() == MATCH_FUZZY:
+                raise ValueError("invalid_match")
+        if request.max_rows is not None and not 1 <= request.max_rows <= settings.bulk_max_items:
+            raise ValueError("invalid_max_rows")
+
+
+class BulkDeleteExecutor(BaseExecutor[BulkDeleteRequest, BulkDeleteResult]):
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: BulkDeleteRequest) -> BulkDeleteResult:
+        filters: Optional[ListFilters] = None
+        if request.filter is not None:
+            lr = ListRequestTransformer().transform(_filter_list_request(request.owner_id, request.filter))
+            filters = ListFilters(is_template=lr.is_template, device_type=lr.device_type, country=lr.country, q=lr.q, match=lr.match)
+        ids = self.repo.bulk_soft_delete(
+            request.owner_id,
+            max_rows=request.max_rows or settings.bulk_max_items,
+            ids=list(dict.fromkeys(request.ids)) if request.ids is not None else None,
+            filters=filters,
+            dry_run=request.dry_run,
         )
+        return BulkDeleteResult(ids=ids, count=len(ids), dry_run=request.dry_run)
 
 
 @dataclass
@@ -273,3 +753,46 @@ class VersionsPageExecutor(BaseExecutor[VersionsPageRequest, VersionsPageRespons
     def execute(self, request: VersionsPageRequest) -> VersionsPageResponse:
         items, next_cur = self.repo.list_versions_page(request.user_id, request.profile_id, request.limit, request.cursor)
         return VersionsPageResponse(data=items, next_cursor=next_cur)
+
+
+@dataclass
+class FacetsRequest:
+    owner_id: str
+
+
+class FacetsExecutor(BaseExecutor[FacetsRequest, FacetCounts]):
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: FacetsRequest) -> FacetCounts:
+        return self.repo.facets(request.owner_id)
+
+
+@dataclass
+class NearestRequest:
+    user_id: str
+    width: int
+    height: int
+    k: int = 10
+    is_template: Optional[bool] = None
+    device_type: Optional[str] = None
+
+
+class NearestValidator(BaseValidator[NearestRequest]):
+    def validate(self, request: NearestRequest) -> None:
+        if not (WINDOW_MIN <= request.width <= WINDOW_MAX and WINDOW_MIN <= request.height <= WINDOW_MAX):
+            raise ValueError("invalid_window")
+        if request.k < 1 or request.k > 100:
+            raise ValueError("invalid_k")
+        if request.device_type is not None and request.device_type not in {e.value for e in DeviceType}:
+            raise ValueError("invalid_device_type")
+
+
+class NearestExecutor(BaseExecutor[NearestRequest, List[NearestMatch]]):
+    def __init__(self, repo: DeviceProfileRepository) -> None:
+        self.repo = repo
+
+    def execute(self, request: NearestRequest) -> List[NearestMatch]:
+        filters = ListFilters(is_template=request.is_template, device_type=request.device_type)
+        rows = self.repo.nearest(request.user_id, request.width, request.height, request.k, filters)
+        return [NearestMatch(distance=float(r.distance), profile=ProfileResponse.from_row(r)) for r in rows]
@@ -1,17 +1,202 @@
-import uuid
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
-from sqlalchemy import and_, select, update, or_
+from sqlalchemy import ARRAY, Boolean, Float, String, and_, any_, bindparam, cast, column, insert, literal, literal_column, or_, select, table, text, tuple_, union_all, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 from sqlalchemy import func
 
-from app.db.models import DeviceProfile, DeviceProfileVersion, Visibility, DeviceType as DT
-from app.db.scoping import scope_profiles
-from app.profiles.dto import CreateProfile, UpdateProfile, headers_list_to_json, CloneFromTemplate, VersionMeta
-from app.profiles.dto import VersionSnapshotResponse, Window, HeaderKV
+from app.db.models import DeviceProfile, DeviceProfileVersion, DeviceProfileVersionOutbox, Visibility, DeviceType as DT
+from app.core.config import settings
+from app.db.explain import explain
+from app.db.scoping import scope_global_templates, scope_owned, scope_profiles
+from app.profiles.dto import CreateProfile, UpdateProfile, headers_list_to_json, CloneFromTemplate, CloneOverrides, VersionMeta
+from app.profiles.dto import FacetCounts, VersionSnapshotResponse, Window, HeaderKV
+from app.profiles.facets import bump, change, combine, created, facet_key, owner_facets, snapshot_key
+from app.profiles.fingerprint import with_content_hash
+from app.profiles.ids import new_profile_id
+from app.profiles.snapshots import apply_deltas, build_snapshot, decode_payload, encode_payload, encode_version
+
+
+WRITE_MODE_OUTBOX = "outbox"
+
+MATCH_PREFIX = "prefix"
+MATCH_CONTAINS = "contains"
+MATCH_FUZZY = "fuzzy"
+MATCH_MODES = (MATCH_PREFIX, MATCH_CONTAINS, MATCH_FUZZY)
+
+SORT_CREATED = "created_at"
+SORT_CREATED_DESC = "-created_at"
+SORT_UPDATED_DESC = "-updated_at"
+SORT_NAME = "name"
+SORT_ID = "id"
+SORT_MODES = (SORT_CREATED, SORT_CREATED_DESC, SORT_UPDATED_DESC, SORT_NAME, SORT_ID)
+_DESC_SORTS = (SORT_CREATED_DESC, SORT_UPDATED_DESC)
+
+# A keyset position: (value of the sort key, id) of the last row on the previous page.
+Cursor = Tuple[Union[datetime, str], str]
+
+
+def _like_escape(value: str) -> str:
+    # Backslash is LIKE's default escape character, so user-supplied % and _ match literally.
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _name_predicate(q: str, match: str):
+    # All modes compare against lower(name): prefix LIKE is served by the text_pattern_ops btree
+    # (idx_profiles_name_prefix), contains LIKE and the pg_trgm % operator by the owner-scoped
+    # trigram GIN index (idx_profiles_name_trgm).
+    name = func.lower(DeviceProfile.name)
+    needle = q.lower()
+    if match == MATCH_FUZZY:
+        return name.op("%")(needle)
+    if match == MATCH_CONTAINS:
+        return name.like(f"%{_like_escape(needle)}%")
+    return name.like(f"{_like_escape(needle)}%")
+
+
+def _sort_key(entity, sort: str) -> Any:
+    # Each key has a composite partial index per UNION ALL branch, (owner_id, key, id) and
+    # (key, id) WHERE <global template>; descending sorts scan them backwards.
+    if sort == SORT_UPDATED_DESC:
+        return entity.updated_at
+    if sort == SORT_NAME:
+        return func.lower(entity.name)
+    if sort == SORT_ID:
+        return entity.id
+    return entity.created_at
+
+
+def _sort_order(key, ident, sort: str) -> tuple:
+    if sort == SORT_ID:
+        return (ident,)
+    if sort in _DESC_SORTS:
+        return (key.desc(), ident.desc())
+    return (key, ident)
+
+
+# Read endpoints select these as plain column tuples (no identity map or change tracking) and
+# build responses with ProfileResponse.from_row.
+PROFILE_COLUMNS = tuple(DeviceProfile.__table__.c.keys())
+
+# Response fields backed by more than one column (or a differently named one).
+_FIELD_COLUMNS = {"window": ("width", "height")}
+
+
+def columns_for_fields(fields: Optional[Sequence[str]]) -> Tuple[str, ...]:
+    # Columns needed for a sparse fieldset of ProfileResponse. id and version are always read:
+    # id for cursors and version for the ETag.
+    if fields is None:
+        return PROFILE_COLUMNS
+    wanted = {"id", "version"}
+    for f in fields:
+        wanted.update(_FIELD_COLUMNS.get(f, (f,)))
+    return tuple(c for c in PROFILE_COLUMNS if c in wanted)
+
+
+def _profile_cols(columns: Sequence[str] = PROFILE_COLUMNS) -> list:
+    return [getattr(DeviceProfile, c) for c in columns]
+
+
+# Columns a PATCH can change.
+PATCH_COLUMNS = ("name", "device_type", "width", "height", "user_agent", "country", "custom_headers", "is_template", "visibility")
+
+# Columns every write sets: the patchable ones plus content_hash, which is derived from them.
+WRITE_COLUMNS = PATCH_COLUMNS + ("content_hash",)
+
+
+def create_values(d: CreateProfile) -> Dict[str, Any]:
+    # Column values of a new profile, content_hash included. Every create path (API, bulk,
+    # upsert, NDJSON import) goes through this so their fingerprints agree.
+    return with_content_hash(
+        {
+            "name": d.name,
+            "device_type": d.device_type,
+            "width": d.window.width,
+            "height": d.window.height,
+            "user_agent": d.user_agent,
+            "country": d.country,
+            "custom_headers": headers_list_to_json(d.custom_headers),
+            "is_template": d.is_template,
+            "visibility": d.visibility,
+        }
+    )
+
+
+def _patch_values(current: Any, data: UpdateProfile) -> Dict[str, Any]:
+    # WRITE_COLUMNS of `current` (an ORM object or row) with the fields set in `data` applied.
+    vals = {c: getattr(current, c) for c in PATCH_COLUMNS}
+    if data.name is not None:
+        vals["name"] = data.name
+    if data.device_type is not None:
+        vals["device_type"] = data.device_type
+    if data.window is not None:
+        vals["width"] = data.window.width
+        vals["height"] = data.window.height
+    if data.user_agent is not None:
+        vals["user_agent"] = data.user_agent
+    if data.country is not None:
+        vals["country"] = data.country
+    if data.custom_headers is not None:
+        vals["custom_headers"] = headers_list_to_json(data.custom_headers)
+    if data.is_template is not None:
+        vals["is_template"] = data.is_template
+    if data.visibility is not None:
+        vals["visibility"] = data.visibility
+    return with_content_hash(vals)
+
+
+def _clone_values(tmpl: DeviceProfile, o: Optional[CloneOverrides]) -> Dict[str, Any]:
+    # Column values for a private copy of `tmpl` with the overrides applied.
+    return with_content_hash(
+        {
+            "name": o.name if o and o.name is not None else f"{tmpl.name} Copy",
+            "device_type": o.device_type if o and o.device_type is not None else tmpl.device_type,
+            "width": o.window.width if o and o.window is not None else tmpl.width,
+            "height": o.window.height if o and o.window is not None else tmpl.height,
+            "user_agent": o.user_agent if o and o.user_agent is not None else tmpl.user_agent,
+            "country": o.country if o and o.country is not None else tmpl.country,
+            "custom_headers": headers_list_to_json(o.custom_headers) if o and o.custom_headers is not None else tmpl.custom_headers,
+            "is_template": False,
+            "visibility": Visibility.private,
+        }
+    )
+
+
+# Rows per multi-row INSERT in bulk writes; keeps each statement well under the 65535 bind
+# parameter limit.
+BULK_CHUNK = 1000
+
+# Per-connection staging table for NDJSON imports. Enum columns are staged as their names.
+_STAGING_COLUMNS = (
+    "line", "id", "name", "device_type", "width", "height", "user_agent", "country", "custom_headers", "is_template", "visibility",
+    "content_hash",
+)
+_STAGING = table("profile_import_staging", *(column(c) for c in _STAGING_COLUMNS))
+_STAGING_DDL = """
+CREATE TEMP TABLE IF NOT EXISTS profile_import_staging (
+  line bigint, id text, name text, device_type text, width int, height int, user_agent text,
+  country text, custom_headers jsonb, is_template boolean, visibility text, content_hash text
+) ON COMMIT DELETE ROWS
+"""
+
+# Same bounds as chk_window; open ends of a range filter fall back to these.
+WINDOW_MIN = 1
+WINDOW_MAX = 10000
+
+
+def _viewport(entity) -> Any:
+    # Matches the expression of the GiST indexes idx_profiles_owner_viewport and
+    # idx_profiles_global_tmpl_viewport.
+    return func.point(entity.width, entity.height)
+
+
+def _similarity_order(entity, q: Optional[str]) -> tuple:
+    return (func.similarity(func.lower(entity.name), (q or "").lower()).desc(), entity.id)
 
 
 class ConflictError(Exception):
@@ -32,55 +217,231 @@ class ListFilters:
     device_type: Optional[str] = None
     country: Optional[str] = None
     q: Optional[str] = None
+    match: str = MATCH_PREFIX
+    ua: Optional[str] = None
+    min_width: Optional[int] = None
+    max_width: Optional[int] = None
+    min_height: Optional[int] = None
+    max_height: Optional[int] = None
+    header_key: Optional[str] = None
+    header_eq: Optional[Tuple[str, str]] = None
     limit: int = 20
-    cursor: Optional[Tuple[datetime, str]] = None
+    sort: str = SORT_CREATED
+    cursor: Optional[Cursor] = None
+    fields: Optional[Tuple[str, ...]] = None
 
 
 class DeviceProfileRepository:
-    def __init__(self, session: Session) -> None:
+    def __init__(
+        self,
+        session: Session,
+        checkpoint_interval: Optional[int] = None,
+        snapshot_codec: Optional[str] = None,
+        snapshot_write_mode: Optional[str] = None,
+    ) -> None:
         self.session = session
+        self.checkpoint_interval = (
+            checkpoint_interval if checkpoint_interval is not None else settings.snapshot_checkpoint_interval
+        )
+        self.snapshot_codec = snapshot_codec if snapshot_codec is not None else settings.snapshot_codec
+        self.snapshot_write_mode = snapshot_write_mode if snapshot_write_mode is not None else settings.snapshot_write_mode
 
-    def create(self, owner_id: str, data: CreateProfile) -> DeviceProfile:
-        pid = f"prof_{uuid.uuid4().hex[:12]}"
-        dp = DeviceProfile(
-            id=pid,
-            owner_id=owner_id,
-            name=data.name,
-            device_type=data.device_type,
-            width=data.window.width,
-            height=data.window.height,
-            user_agent=data.user_agent,
-            country=data.country,
-            custom_headers=headers_list_to_json(data.custom_headers),
-            is_template=data.is_template,
-            visibility=data.visibility,
+    def _add_version(self, profile_id: str, version: int, snap: dict, prev: Optional[dict], changed_by: str) -> None:
+        self._add_versions([(profile_id, version, snap, prev, changed_by)])
+
+    def _add_versions(self, entries: Sequence[Tuple[str, int, dict, Optional[dict], str]]) -> None:
+        # Every write path funnels its snapshots through here: one multi-row INSERT whether it is a
+        # single PATCH or a bulk request.
+        rows = []
+        for profile_id, version, snap, prev, changed_by in entries:
+            payload, checkpoint = encode_version(version, snap, prev, self.checkpoint_interval)
+            plain, blob, codec = encode_payload(payload, self.snapshot_codec)
+            rows.append(
+                {
+                    "profile_id": profile_id,
+                    "version": version,
+                    "snapshot": plain,
+                    "snapshot_z": blob,
+                    "codec": codec,
+                    "is_checkpoint": checkpoint,
+                    "changed_by": changed_by,
+                }
+            )
+        if not rows:
+            return
+        model = DeviceProfileVersionOutbox if self.snapshot_write_mode == WRITE_MODE_OUTBOX else DeviceProfileVersion
+        self.session.execute(insert(model), rows)
+
+    @staticmethod
+    def _versions_source():
+        # Committed versions plus snapshots still queued in the outbox; the background writer
+        # moves rows atomically, so each version is in exactly one branch.
+        def cols(t):
+            return [
+                t.c.profile_id,
+                t.c.version,
+                t.c.snapshot,
+                t.c.snapshot_z,
+                t.c.codec,
+                t.c.is_checkpoint,
+                t.c.changed_by,
+                t.c.changed_at,
+            ]
+
+        return union_all(
+            select(*cols(DeviceProfileVersion.__table__)),
+            select(*cols(DeviceProfileVersionOutbox.__table__)),
+        ).subquery("v")
+
+    def _load_snapshot(self, profile_id: str, version: int) -> Optional[tuple[dict, Row]]:
+        # Read the nearest checkpoint at or below `version` plus the deltas after it;
+        # at most checkpoint_interval rows are touched.
+        v = self._versions_source()
+        cp = (
+            select(func.max(v.c.version))
+            .where(and_(v.c.profile_id == profile_id, v.c.is_checkpoint.is_(True), v.c.version <= version))
+            .scalar_subquery()
+        )
+        vq = (
+            select(v)
+            .where(and_(v.c.profile_id == profile_id, v.c.version <= version, v.c.version >= cp))
+            .order_by(v.c.version)
         )
+        rows = list(self.session.execute(vq).all())
+        if not rows or rows[-1].version != version or len(rows) != version - rows[0].version + 1:
+            return None
+        payloads = [decode_payload(r.snapshot, r.snapshot_z, r.codec) for r in rows]
+        snap = apply_deltas(payloads[0], payloads[1:])
+        return snap, rows[-1]
+
+    def create(self, owner_id: str, data: CreateProfile) -> DeviceProfile:
+        dp = DeviceProfile(id=new_profile_id(), owner_id=owner_id, **create_values(data))
         self.session.add(dp)
         try:
             self.session.flush()
         except IntegrityError as e:
             raise ConflictError(str(e))
-        snap = {
-            "id": dp.id,
-            "owner_id": dp.owner_id,
-            "name": dp.name,
-            "device_type": dp.device_type.value,
-            "window": {"width": dp.width, "height": dp.height},
-            "user_agent": dp.user_agent,
-            "country": dp.country,
-            "custom_headers": dp.custom_headers,
-            "is_template": dp.is_template,
-            "visibility": dp.visibility.value,
-            "version": dp.version,
-        }
-        self.session.add(
-            DeviceProfileVersion(
-                profile_id=dp.id, version=1, snapshot=snap, changed_by=owner_id
-            )
-        )
+        self._add_version(dp.id, 1, build_snapshot(dp), None, owner_id)
+        bump(self.session, change(None, facet_key(dp)))
         self.session.flush()
         return dp
 
+    def bulk_create(self, owner_id: str, items: Sequence[CreateProfile]) -> List[Optional[Row]]:
+        return self._insert_profiles(owner_id, [create_values(d) for d in items])
+
+    def bulk_clone(self, owner_id: str, template_id: str, overrides: Sequence[Optional[CloneOverrides]]) -> List[Optional[Row]]:
+        tmpl = self.get_template_readable(owner_id, template_id)
+        return self._insert_profiles(owner_id, [_clone_values(tmpl, o) for o in overrides])
+
+    def _insert_profiles(self, owner_id: str, items: Sequence[Dict[str, Any]]) -> List[Optional[Row]]:
+        # Multi-row INSERT ... ON CONFLICT DO NOTHING against the partial unique index on
+        # (owner_id, lower(name)). Items whose row is not returned collided with an existing name
+        # or an earlier item of the same batch and come back as None, in input order.
+        ids = [new_profile_id() for _ in items]
+        values = [{"id": pid, "owner_id": owner_id, **v} for pid, v in zip(ids, items)]
+        inserted: Dict[str, Row] = {}
+        for start in range(0, len(values), BULK_CHUNK):
+            stmt = (
+                pg_insert(DeviceProfile)
+                .values(values[start : start + BULK_CHUNK])
+                .on_conflict_do_nothing(
+                    index_elements=[DeviceProfile.owner_id, func.lower(DeviceProfile.name)],
+                    index_where=DeviceProfile.deleted_at.is_(None),
+                )
+                .returning(*_profile_cols())
+            )
+            inserted.update((r.id, r) for r in self.session.execute(stmt))
+        rows = list(inserted.values())
+        self._add_versions([(r.id, 1, build_snapshot(r), None, owner_id) for r in rows])
+        bump(self.session, created(rows))
+        return [inserted.get(pid) for pid in ids]
+
+    def stage_import(self, rows: Sequence[Tuple[Any, ...]]) -> None:
+        # COPY rows (in _STAGING_COLUMNS order) into this connection's temp staging table, which
+        # empties itself on commit.
+        self.session.execute(text(_STAGING_DDL))
+        dbapi = self.session.connection().connection.driver_connection
+        assert dbapi is not None
+        with dbapi.cursor() as cur:
+            with cur.copy(f"COPY {_STAGING.name} ({', '.join(_STAGING_COLUMNS)}) FROM STDIN") as cp:
+                for r in rows:
+                    cp.write_row(r)
+
+    def merge_staged(self, owner_id: str) -> List[Row]:
+        # One INSERT ... SELECT from staging with the same conflict handling as bulk_create; staged
+        # rows whose id is not returned collided on name. Snapshots and facets follow set-based.
+        s = _STAGING.c
+        cols = DeviceProfile.__table__.c
+        sel = select(
+            s.id,
+            literal(owner_id),
+            s.name,
+            cast(s.device_type, cols.device_type.type),
+            s.width,
+            s.height,
+            s.user_agent,
+            s.country,
+            s.custom_headers,
+            s.is_template,
+            cast(s.visibility, cols.visibility.type),
+            s.content_hash,
+        ).order_by(s.line)
+        stmt = (
+            pg_insert(DeviceProfile)
+            .from_select(["id", "owner_id", *_STAGING_COLUMNS[2:]], sel)
+            .on_conflict_do_nothing(
+                index_elements=[DeviceProfile.owner_id, func.lower(DeviceProfile.name)],
+                index_where=DeviceProfile.deleted_at.is_(None),
+            )
+            .returning(*_profile_cols())
+        )
+        rows = list(self.session.execute(stmt))
+        self._add_versions([(r.id, 1, build_snapshot(r), None, owner_id) for r in rows])
+        bump(self.session, created(rows))
+        return rows
+
+    def upsert_by_name(self, owner_id: str, data: CreateProfile) -> Tuple[str, Row]:
+        # One statement: the live row of that name as of the statement snapshot (`old`), and an
+        # INSERT ... ON CONFLICT (owner_id, lower(name)) DO UPDATE that only fires when some
+        # content column IS DISTINCT FROM the incoming value. xmax = 0 tells an insert from an
+        # update; no returned row means the content was already identical.
+        cols = DeviceProfile.__table__.c
+        current = scope_owned(select(*_profile_cols()), owner_id).where(func.lower(DeviceProfile.name) == data.name.lower())
+        old = current.cte("old")
+        ins = pg_insert(DeviceProfile).values(id=new_profile_id(), owner_id=owner_id, **create_values(data))
+        ins = ins.on_conflict_do_update(
+            index_elements=[DeviceProfile.owner_id, func.lower(DeviceProfile.name)],
+            index_where=DeviceProfile.deleted_at.is_(None),
+            set_={**{c: ins.excluded[c] for c in WRITE_COLUMNS}, "version": cols.version + 1, "updated_at": func.now()},
+            where=or_(*(cols[c].is_distinct_from(ins.excluded[c]) for c in PATCH_COLUMNS)),
+        )
+        new = ins.returning(*_profile_cols(), literal_column("xmax = 0", Boolean).label("inserted")).cte("ins")
+        stmt = union_all(
+            select(literal("new").label("src"), *new.c),
+            select(literal("old"), *old.c, literal(False)),
+        )
+        by_src = {r.src: r for r in self.session.execute(stmt)}
+        cur, prev = by_src.get("new"), by_src.get("old")
+        if cur is None:
+            if prev is None:
+                # An identical row committed concurrently, after this statement's snapshot.
+                prev = self.session.execute(current).one()  # pragma: no cover - race
+            return "unchanged", prev
+        if cur.inserted:
+            self._add_versions([(cur.id, 1, build_snapshot(cur), None, owner_id)])
+            bump(self.session, change(None, facet_key(cur)))
+            return "created", cur
+        if prev is not None and prev.version == cur.version - 1:
+            prev_snap: Optional[dict] = build_snapshot(prev)
+        else:  # pragma: no cover - race
+            # A concurrent write landed between the snapshot and the conflict check, so `old` is
+            # not the version this update replaced; read that one from the history instead.
+            loaded = self._load_snapshot(cur.id, cur.version - 1)
+            prev_snap = loaded[0] if loaded else None
+        self._add_versions([(cur.id, cur.version, build_snapshot(cur), prev_snap, owner_id)])
+        bump(self.session, change(snapshot_key(prev_snap) if prev_snap is not None else None, facet_key(cur)))
+        return "updated", cur
+
     def get_scoped(self, user_id: str, profile_id: str) -> DeviceProfile:
         q = select(DeviceProfile)
         q = scope_profiles(q, user_id=user_id, include_templates=True)
@@ -90,6 +451,45 @@ class DeviceProfileRepository:
             raise NotFoundError("profile_not_found")
         return row
 
+    def get_scoped_row(self, user_id: str, profile_id: str, fields: Optional[Sequence[str]] = None) -> Row:
+        q = scope_profiles(select(*_profile_cols(columns_for_fields(fields))), user_id=user_id, include_templates=True)
+        row = self.session.execute(q.where(DeviceProfile.id == profile_id)).first()
+        if row is None:
+            raise NotFoundError("profile_not_found")
+        return row
+
+    def get_scoped_rows(self, user_id: str, profile_ids: Sequence[str], fields: Optional[Sequence[str]] = None) -> List[Row]:
+        # One `id = ANY(:ids)` lookup with the array bound as a single parameter, so the statement
+        # text (and its cached plan) is the same for any batch size.
+        ids = bindparam("ids", list(profile_ids), type_=ARRAY(String))
+        q = scope_profiles(select(*_profile_cols(columns_for_fields(fields))), user_id=user_id, include_templates=True)
+        return list(self.session.execute(q.where(DeviceProfile.id == any_(ids))))
+
+    def get_scoped_row_by_name(self, user_id: str, name: str, fields: Optional[Sequence[str]] = None) -> Row:
+        # Exact lower(name) match: the owner's branch is a point lookup on
+        # uniq_owner_name_not_deleted, the template branch a range on idx_profiles_global_tmpl_name
+        # (several owners may publish the same name; the lowest id wins). Both branches stop at one
+        # row and the owner's profile is preferred over a template.
+        base = select(*_profile_cols(columns_for_fields(fields))).where(func.lower(DeviceProfile.name) == name.lower())
+        owned = scope_owned(base.add_columns(literal_column("0").label("rank")), user_id).limit(1)
+        tmpl = scope_global_templates(base.add_columns(literal_column("1").label("rank")), user_id).order_by(DeviceProfile.id).limit(1)
+        sq = union_all(owned, tmpl).subquery("by_name")
+        row = self.session.execute(select(*[c for c in sq.c if c.name != "rank"]).order_by(sq.c.rank).limit(1)).first()
+        if row is None:
+            raise NotFoundError("profile_not_found")
+        return row
+
+    def find_by_content(self, owner_id: str, data: CreateProfile) -> Optional[Row]:
+        # The owner's oldest-id live profile with the same content as `data`, whatever its name, and
+        # of the same kind (template flag and visibility): an equality lookup on
+        # idx_profiles_owner_content_hash.
+        q = scope_owned(select(*_profile_cols()), owner_id).where(
+            DeviceProfile.content_hash == create_values(data)["content_hash"],
+            DeviceProfile.is_template.is_(data.is_template),
+            DeviceProfile.visibility == data.visibility,
+        )
+        return self.session.execute(q.order_by(DeviceProfile.id).limit(1)).first()
+
     def list_scoped(self, user_id: str, filters: ListFilters) -> List[DeviceProfile]:
         q = select(DeviceProfile)
         q = scope_profiles(q, user_id=user_id, include_templates=True)
@@ -100,15 +500,14 @@ class DeviceProfileRepository:
         if filters.country is not None:
             q = q.where(DeviceProfile.country == filters.country)  # pragma: no cover
         if filters.q is not None:
-            q = q.where(DeviceProfile.name.ilike(f"{filters.q}%"))  # pragma: no cover
+            q = q.where(_name_predicate(filters.q, filters.match))  # pragma: no cover
         q = q.order_by(DeviceProfile.created_at, DeviceProfile.id)
         q = q.limit(filters.limit)
         rows = list(self.session.execute(q).scalars().all())
         return rows
 
-    def list_scoped_page(self, user_id: str, filters: ListFilters) -> tuple[List[DeviceProfile], Optional[tuple[datetime, str]]]:
-        q = select(DeviceProfile)
-        q = scope_profiles(q, user_id=user_id, include_templates=True)
+    @staticmethod
+    def _apply_filters(q: Select, filters: ListFilters) -> Select:
         if filters.is_template is not None:
             q = q.where(DeviceProfile.is_template.is_(filters.is_template))
         if filters.device_type is not None:
@@ -116,24 +515,134 @@ class DeviceProfileRepository:
         if filters.country is not None:
             q = q.where(DeviceProfile.country == filters.country)
         if filters.q is not None:
-            q = q.where(DeviceProfile.name.ilike(f"{filters.q}%"))
-        if filters.cursor is not None:
-            last_created_at, last_id = filters.cursor
-            q = q.where(
-                or_(
-                    DeviceProfile.created_at > last_created_at,
-                    and_(DeviceProfile.created_at == last_created_at, DeviceProfile.id > last_id),
-                )
+            q = q.where(_name_predicate(filters.q, filters.match))
+        if filters.ua is not None:
+            # The owner-scoped pg_trgm GIN index answers ILIKE directly (idx_profiles_ua_trgm).
+            q = q.where(DeviceProfile.user_agent.ilike(f"%{_like_escape(filters.ua)}%"))
+        if any(v is not None for v in (filters.min_width, filters.max_width, filters.min_height, filters.max_height)):
+            # Both ranges at once as point <@ box, which the viewport GiST indexes answer.
+            lo = func.point(
+                filters.min_width if filters.min_width is not None else WINDOW_MIN,
+                filters.min_height if filters.min_height is not None else WINDOW_MIN,
             )
-        q = q.order_by(DeviceProfile.created_at, DeviceProfile.id)
-        q = q.limit(filters.limit + 1)
-        items = list(self.session.execute(q).scalars().all())
-        next_token: Optional[tuple[datetime, str]] = None
-        if len(items) > filters.limit:
-            last = items[filters.limit]
-            next_token = (last.created_at, last.id)
-            items = items[: filters.limit]
-        return items, next_token
+            hi = func.point(
+                filters.max_width if filters.max_width is not None else WINDOW_MAX,
+                filters.max_height if filters.max_height is not None else WINDOW_MAX,
+            )
+            q = q.where(_viewport(DeviceProfile).op("<@")(func.box(lo, hi)))
+        # Both header predicates are JSONB operators (? and @>) served by idx_profiles_headers.
+        if filters.header_key is not None:
+            q = q.where(DeviceProfile.custom_headers.has_key(filters.header_key))
+        if filters.header_eq is not None:
+            key, value = filters.header_eq
+            q = q.where(DeviceProfile.custom_headers.contains({key: value}))
+        return q
+
+    @staticmethod
+    def _after_cursor(q: Select, cursor: Optional[Cursor], sort: str = SORT_CREATED) -> Select:
+        if cursor is None:
+            return q
+        if sort == SORT_ID:
+            # Profile ids are time-ordered (see app.profiles.ids), so the id alone is the keyset.
+            return q.where(DeviceProfile.id > cursor[1])
+        # Row comparison so both columns become index conditions on the (…, key, id) indexes.
+        cols = (_sort_key(DeviceProfile, sort), DeviceProfile.id)
+        after = tuple_(*(literal(v, c.type) for c, v in zip(cols, cursor)))
+        if sort in _DESC_SORTS:
+            return q.where(tuple_(*cols) < after)
+        return q.where(tuple_(*cols) > after)
+
+    def _branches(self, user_id: str, filters: ListFilters, base: Select) -> List[Select]:
+        branches = [scope_owned(base, user_id)]
+        if filters.is_template is not False:
+            branches.append(scope_global_templates(base, user_id))
+        return [self._apply_filters(b, filters) for b in branches]
+
+    def _page_query(self, user_id: str, filters: ListFilters) -> Select:
+        # UNION ALL of the owner's rows and other owners' global templates instead of one scoped
+        # OR. Each branch is a keyset range scan on its own composite partial index
+        # (idx_profiles_owner_created, idx_profiles_global_tmpl_created) stopped at LIMIT, and the
+        # outer query merges two already-ordered inputs.
+        # Rows carry their sort key as an extra column so the next cursor holds exactly the value
+        # the database compared (e.g. lower(name)).
+        n = filters.limit + 1
+        fuzzy = filters.q is not None and filters.match == MATCH_FUZZY
+        key = _sort_key(DeviceProfile, filters.sort)
+        # Fuzzy ranking re-computes similarity over the merged rows, so it needs the name column.
+        columns = columns_for_fields(filters.fields + ("name",) if fuzzy and filters.fields else filters.fields)
+        parts = []
+        for b in self._branches(user_id, filters, select(*_profile_cols(columns), key.label("sort_key"))):
+            if fuzzy:
+                parts.append(b.order_by(*_similarity_order(DeviceProfile, filters.q)).limit(n))
+                continue
+            b = self._after_cursor(b, filters.cursor, filters.sort)
+            parts.append(b.order_by(*_sort_order(key, DeviceProfile.id, filters.sort)).limit(n))
+        if len(parts) == 1:
+            return parts[0]
+        sq = union_all(*parts).subquery("page")
+        outer = select(*sq.c)
+        if fuzzy:
+            return outer.order_by(*_similarity_order(sq.c, filters.q)).limit(n)
+        return outer.order_by(*_sort_order(sq.c.sort_key, sq.c.id, filters.sort)).limit(n)
+
+    def list_scoped_page(self, user_id: str, filters: ListFilters) -> tuple[List[Row], Optional[Cursor]]:
+        q = self._page_query(user_id, filters)
+        rows = list(self.session.execute(q).all())
+        next_token: Optional[Cursor] = None
+        if len(rows) > filters.limit:
+            rows = rows[: filters.limit]
+            # Fuzzy results are ranked by similarity, which has no stable keyset: single page only.
+            if filters.q is None or filters.match != MATCH_FUZZY:
+                next_token = (rows[-1].sort_key, rows[-1].id)
+        return rows, next_token
+
+    def _export_query(self, user_id: str, filters: ListFilters) -> Select:
+        # Every matching row in id order: each branch is an ordered scan of its (…, id) index
+        # (idx_profiles_owner_id, idx_profiles_global_tmpl_id) and the union is a merge, so rows
+        # stream out without a sort.
+        parts = [
+            b.order_by(DeviceProfile.id)
+            for b in self._branches(user_id, filters, select(*_profile_cols(columns_for_fields(filters.fields))))
+        ]
+        if len(parts) == 1:
+            return parts[0]
+        sq = union_all(*parts).subquery("export")
+        return select(*sq.c).order_by(sq.c.id)
+
+    def iter_export(self, user_id: str, filters: ListFilters, batch_size: int) -> Iterator[Row]:
+        # yield_per runs the query on a server-side cursor and fetches batch_size rows at a time.
+        result = self.session.execute(self._export_query(user_id, filters).execution_options(yield_per=batch_size))
+        yield from result
+
+    def _nearest_query(self, user_id: str, width: int, height: int, k: int, filters: ListFilters) -> Select:
+        # K nearest viewports by Euclidean distance. Each branch is a KNN scan (ORDER BY <->) on its
+        # GiST index, stopped after k rows; the outer query merges at most 2k candidates.
+        target = func.point(width, height)
+        dist = _viewport(DeviceProfile).op("<->", return_type=Float)(target)
+        parts = [
+            b.order_by(dist).limit(k)
+            for b in self._branches(user_id, filters, select(*_profile_cols(), dist.label("distance")))
+        ]
+        if len(parts) == 1:
+            return parts[0]
+        sq = union_all(*parts).subquery("near")
+        return select(*sq.c).order_by(sq.c.distance, sq.c.id).limit(k)
+
+    def nearest(self, user_id: str, width: int, height: int, k: int, filters: ListFilters) -> List[Row]:
+        q = self._nearest_query(user_id, width, height, k, filters)
+        return list(self.session.execute(q).all())
+
+    def count_scoped(self, user_id: str, filters: ListFilters, exact_limit: int) -> Tuple[int, bool]:
+        # Exact count of the filtered list (cursor ignored) while it stays at or below
+        # `exact_limit`: each branch stops after exact_limit + 1 ids, so the work is bounded.
+        # Above that, the planner's row estimate for the uncapped query is returned instead.
+        branches = self._branches(user_id, filters, select(DeviceProfile.id))
+        capped = union_all(*(b.limit(exact_limit + 1) for b in branches)).subquery("c")
+        n = self.session.execute(select(func.count()).select_from(capped)).scalar_one()
+        if n <= exact_limit:
+            return n, True
+        plan = explain(self.session, union_all(*branches) if len(branches) > 1 else branches[0])
+        return max(int(plan["Plan Rows"]), exact_limit + 1), False
 
     def get_template_readable(self, user_id: str, template_id: str) -> DeviceProfile:
         q = select(DeviceProfile)
@@ -150,124 +659,163 @@ class DeviceProfileRepository:
             raise NotFoundError("profile_not_found")
         if data.version is None or data.version != current.version:
             raise PreconditionFailed("version_mismatch")
-        if data.name is not None:
-            current.name = data.name
-        if data.device_type is not None:
-            current.device_type = data.device_type
-        if data.window is not None:
-            current.width = data.window.width
-            current.height = data.window.height
-        if data.user_agent is not None:
-            current.user_agent = data.user_agent
-        if data.country is not None:
-            current.country = data.country
-        if data.custom_headers is not None:
-            current.custom_headers = headers_list_to_json(data.custom_headers)
-        if data.is_template is not None:
-            current.is_template = data.is_template
-        if data.visibility is not None:
-            current.visibility = data.visibility
+        prev_snap = build_snapshot(current)
+        prev_key = facet_key(current)
+        vals = _patch_values(current, data)
+        for k, v in vals.items():
+            setattr(current, k, v)
         stmt = (
             update(DeviceProfile)
             .where(and_(DeviceProfile.id == profile_id, DeviceProfile.owner_id == owner_id, DeviceProfile.version == data.version))
-            .values(version=DeviceProfile.version + 1,
-                    name=current.name,
-                    device_type=current.device_type,
-                    width=current.width,
-                    height=current.height,
-                    user_agent=current.user_agent,
-                    country=current.country,
-                    custom_headers=current.custom_headers,
-                    is_template=current.is_template,
-                    visibility=current.visibility)
+            .values(version=DeviceProfile.version + 1, **vals)
             .returning(DeviceProfile)
         )
         try:
             row = self.session.execute(stmt).scalars().one()
         except Exception:  # pragma: no cover - relies on race conditions to hit
             raise PreconditionFailed("version_mismatch")
-        snap = {
-            "id": row.id,
-            "owner_id": row.owner_id,
-            "name": row.name,
-            "device_type": row.device_type.value,
-            "window": {"width": row.width, "height": row.height},
-            "user_agent": row.user_agent,
-            "country": row.country,
-            "custom_headers": row.custom_headers,
-            "is_template": row.is_template,
-            "visibility": row.visibility.value,
-            "version": row.version,
-        }
-        self.session.add(
-            DeviceProfileVersion(
-                profile_id=row.id, version=row.version, snapshot=snap, changed_by=owner_id
-            )
-        )
+        self._add_version(row.id, row.version, build_snapshot(row), prev_snap, owner_id)
+        bump(self.session, change(prev_key, facet_key(row)))
         self.session.flush()
         return row
 
+    def bulk_update(self, owner_id: str, items: Sequence[Tuple[str, UpdateProfile]]) -> List[Tuple[Optional[Row], Optional[str]]]:
+        # Set-based PATCH: one pre-select of the current rows, then per chunk a single
+        # UPDATE ... FROM (VALUES ...) that keeps update_optimistic's guard (owner, expected
+        # version, not deleted) per row. Returns (row, None) for updated items and
+        # (None, "not_found" | "version_mismatch" | "conflict") otherwise, in input order. Ids must
+        # be unique.
+        current = {r.id: r for r in self.get_owned_rows(owner_id, [pid for pid, _ in items])}
+        out: List[Tuple[Optional[Row], Optional[str]]] = [(None, "not_found")] * len(items)
+        pending = []
+        for i, (pid, data) in enumerate(items):
+            cur = current.get(pid)
+            if cur is None:
+                continue
+            if data.version != cur.version:
+                out[i] = (None, "version_mismatch")
+                continue
+            pending.append((i, {"id": pid, "expected": data.version, **_patch_values(cur, data)}))
+        updated: Dict[str, Row] = {}
+        conflicts: set[str] = set()
+        for start in range(0, len(pending), BULK_CHUNK):
+            chunk = [v for _, v in pending[start : start + BULK_CHUNK]]
+            try:
+                updated.update((r.id, r) for r in self._update_from_values(chunk, owner_id))
+            except ConflictError:
+                # Some rename hit the unique name index and the chunk's savepoint was rolled
+                # back; redo it item by item so only the colliding items fail.
+                for v in chunk:
+                    try:
+                        updated.update((r.id, r) for r in self._update_from_values([v], owner_id))
+                    except ConflictError:
+                        conflicts.add(v["id"])
+        for i, v in pending:
+            row = updated.get(v["id"])
+            if v["id"] in conflicts:
+                out[i] = (None, "conflict")
+            else:
+                # Lost a race with a concurrent write between the pre-select and the UPDATE.
+                out[i] = (row, None) if row is not None else (None, "version_mismatch")
+        rows = list(updated.values())
+        self._add_versions([(r.id, r.version, build_snapshot(r), build_snapshot(current[r.id]), owner_id) for r in rows])
+        bump(self.session, combine(change(facet_key(current[r.id]), facet_key(r)) for r in rows))
+        return out
+
+    def _update_from_values(self, vals: List[Dict[str, Any]], owner_id: str) -> List[Row]:
+        cols = DeviceProfile.__table__.c
+        v = values(
+            column("id", String),
+            column("expected", cols.version.type),
+            *(column(c, cols[c].type) for c in WRITE_COLUMNS),
+            name="v",
+        ).data([tuple(x[k] for k in ("id", "expected", *WRITE_COLUMNS)) for x in vals])
+        stmt = (
+            update(DeviceProfile)
+            .where(
+                DeviceProfile.id == v.c.id,
+                DeviceProfile.owner_id == owner_id,
+                DeviceProfile.version == v.c.expected,
+                DeviceProfile.deleted_at.is_(None),
+            )
+            # VALUES parameters arrive untyped, so enum and jsonb columns need an explicit cast.
+            .values(version=DeviceProfile.version + 1, **{c: cast(v.c[c], cols[c].type) for c in WRITE_COLUMNS})
+            .returning(*_profile_cols())
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            with self.session.begin_nested():
+                return list(self.session.execute(stmt))
+        except IntegrityError as e:
+            raise ConflictError(str(e))
+
+    def get_owned_rows(self, owner_id: str, profile_ids: Sequence[str]) -> List[Row]:
+        ids = bindparam("ids", list(profile_ids), type_=ARRAY(String))
+        return list(self.session.execute(scope_owned(select(*_profile_cols()), owner_id).where(DeviceProfile.id == any_(ids))))
+
     def soft_delete(self, owner_id: str, profile_id: str) -> None:
         current = self.get_scoped(owner_id, profile_id)
         if current.owner_id != owner_id:  # pragma: no cover - unreachable due to scoping
             raise NotFoundError("profile_not_found")
-        self.session.execute(
+        res = self.session.execute(
             update(DeviceProfile)
             .where(and_(DeviceProfile.id == profile_id, DeviceProfile.owner_id == owner_id, DeviceProfile.deleted_at.is_(None)))
             .values(deleted_at=func.now())
         )
+        if res.rowcount:
+            bump(self.session, change(facet_key(current), None))
         self.session.flush()
 
+    def bulk_soft_delete(
+        self,
+        owner_id: str,
+        max_rows: int,
+        ids: Optional[Sequence[str]] = None,
+        filters: Optional[ListFilters] = None,
+        dry_run: bool = False,
+    ) -> List[str]:
+        # Owned, live profiles matching the ids and/or list filters. The target select is capped
+        # at max_rows + 1 and an over-broad match is refused before anything is written; the
+        # matched ids are then soft-deleted by a single UPDATE ... RETURNING.
+        q = scope_owned(select(DeviceProfile.id), owner_id)
+        if ids is not None:
+            q = q.where(DeviceProfile.id == any_(bindparam("ids", list(ids), type_=ARRAY(String))))
+        if filters is not None:
+            q = self._apply_filters(q, filters)
+        matched = sorted(self.session.execute(q.limit(max_rows + 1)).scalars())
+        if len(matched) > max_rows:
+            raise PreconditionFailed("too_many_rows")
+        if dry_run or not matched:
+            return matched
+        stmt = (
+            update(DeviceProfile)
+            .where(
+                DeviceProfile.id == any_(bindparam("matched", matched, type_=ARRAY(String))),
+                DeviceProfile.owner_id == owner_id,
+                DeviceProfile.deleted_at.is_(None),
+            )
+            .values(deleted_at=func.now())
+            .returning(DeviceProfile.id, DeviceProfile.owner_id, DeviceProfile.device_type, DeviceProfile.country, DeviceProfile.is_template)
+            .execution_options(synchronize_session=False)
+        )
+        # Rows deleted concurrently since the select are not returned and not counted.
+        rows = list(self.session.execute(stmt))
+        bump(self.session, combine(change(facet_key(r), None) for r in rows))
+        return sorted(r.id for r in rows)
+
+    def facets(self, owner_id: str) -> FacetCounts:
+        return owner_facets(self.session, owner_id)
+
     def clone_from_template(self, owner_id: str, req: CloneFromTemplate) -> DeviceProfile:
         tmpl = self.get_template_readable(owner_id, req.template_id)
-        pid = f"prof_{uuid.uuid4().hex[:12]}"
-        name = (req.overrides.name if req.overrides and req.overrides.name is not None else f"{tmpl.name} Copy")
-        device_type = (req.overrides.device_type if req.overrides and req.overrides.device_type is not None else tmpl.device_type)
-        width = (req.overrides.window.width if req.overrides and req.overrides.window is not None else tmpl.width)
-        height = (req.overrides.window.height if req.overrides and req.overrides.window is not None else tmpl.height)
-        user_agent = (req.overrides.user_agent if req.overrides and req.overrides.user_agent is not None else tmpl.user_agent)
-        country = (req.overrides.country if req.overrides and req.overrides.country is not None else tmpl.country)
-        custom_headers = (
-            headers_list_to_json(req.overrides.custom_headers)
-            if req.overrides and req.overrides.custom_headers is not None
-            else tmpl.custom_headers
-        )
-        dp = DeviceProfile(
-            id=pid,
-            owner_id=owner_id,
-            name=name,
-            device_type=device_type,
-            width=width,
-            height=height,
-            user_agent=user_agent,
-            country=country,
-            custom_headers=custom_headers,
-            is_template=False,
-            visibility=Visibility.private,
-        )
+        dp = DeviceProfile(id=new_profile_id(), owner_id=owner_id, **_clone_values(tmpl, req.overrides))
         self.session.add(dp)
         try:
             self.session.flush()
         except IntegrityError as e:  # pragma: no cover - requires DB constraint violation
             raise ConflictError(str(e))
-        snap = {
-            "id": dp.id,
-            "owner_id": dp.owner_id,
-            "name": dp.name,
-            "device_type": dp.device_type.value,
-            "window": {"width": dp.width, "height": dp.height},
-            "user_agent": dp.user_agent,
-            "country": dp.country,
-            "custom_headers": dp.custom_headers,
-            "is_template": dp.is_template,
-            "visibility": dp.visibility.value,
-            "version": dp.version,
-        }
-        self.session.add(
-            DeviceProfileVersion(
-                profile_id=dp.id, version=1, snapshot=snap, changed_by=owner_id
-            )
-        )
+        self._add_version(dp.id, 1, build_snapshot(dp), None, owner_id)
+        bump(self.session, change(None, facet_key(dp)))
         self.session.flush()
         return dp
 
@@ -278,9 +826,8 @@ class DeviceProfileRepository:
         row = self.session.execute(q).scalars().first()
         if not row:
             raise NotFoundError("profile_not_found")
-        vq = select(DeviceProfileVersion.version, DeviceProfileVersion.changed_by, DeviceProfileVersion.changed_at).where(
-            DeviceProfileVersion.profile_id == profile_id
-        ).order_by(DeviceProfileVersion.version)
+        v = self._versions_source()
+        vq = select(v.c.version, v.c.changed_by, v.c.changed_at).where(v.c.profile_id == profile_id).order_by(v.c.version)
         results = self.session.execute(vq).all()
         return [VersionMeta(version=r[0], changed_by=r[1], changed_at=r[2]) for r in results]
 
@@ -291,13 +838,10 @@ class DeviceProfileRepository:
         parent = self.session.execute(q).scalars().first()
         if not parent:
             raise NotFoundError("profile_not_found")  # pragma: no cover - covered via route tests
-        vq = select(DeviceProfileVersion).where(
-            and_(DeviceProfileVersion.profile_id == profile_id, DeviceProfileVersion.version == version)
-        )
-        row = self.session.execute(vq).scalars().first()
-        if not row:
+        loaded = self._load_snapshot(profile_id, version)
+        if not loaded:
             raise NotFoundError("version_not_found")  # pragma: no cover - covered via route tests
-        snap = row.snapshot
+        snap, row = loaded
         headers = None
         if snap.get("custom_headers"):
             headers = [HeaderKV(key=k, value=str(v)) for k, v in snap["custom_headers"].items()]
@@ -324,12 +868,11 @@ class DeviceProfileRepository:
         parent = self.session.execute(q).scalars().first()
         if not parent:
             raise NotFoundError("profile_not_found")
-        vq = select(DeviceProfileVersion.version, DeviceProfileVersion.changed_by, DeviceProfileVersion.changed_at).where(
-            DeviceProfileVersion.profile_id == profile_id
-        )
+        v = self._versions_source()
+        vq = select(v.c.version, v.c.changed_by, v.c.changed_at).where(v.c.profile_id == profile_id)
         if cursor_version is not None:
-            vq = vq.where(DeviceProfileVersion.version > cursor_version)
-        vq = vq.order_by(DeviceProfileVersion.version).limit(limit + 1)
+            vq = vq.where(v.c.version > cursor_version)
+        vq = vq.order_by(v.c.version).limit(limit + 1)
         rows = self.session.execute(vq).all()
         next_cursor: Optional[int] = None
         if len(rows) > limit:
@@ -0,0 +1,98 @@
+import json
+import zlib
+from typing import Any, Dict, Iterable, Optional, Union
+
+from sqlalchemy.engine import Row
+
+from app.db.models import DeviceProfile
+
+
+CODEC_JSON = "json"
+CODEC_ZLIB = "zlib"
+
+# Preset dictionary shared by every zlib-encoded snapshot. zlib favours matches near the end
+# of the dictionary, so the most common fragments (keys, UA boilerplate) come last. Never edit
+# a published dictionary: add a new one under a new id so older rows stay decodable.
+_ZDICTS: Dict[str, bytes] = {
+    "zlib:1": (
+        b'"accept-language": "en-US,en;q=0.9", "accept": "text/html,application/xhtml+xml,'
+        b'application/xml;q=0.9,*/*;q=0.8", "referer": "https://www.google.com/", '
+        b'"sec-ch-ua-platform": "Windows", "sec-ch-ua-mobile": "?0", "cookie": "'
+        b"Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+        b"(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+        b"Mozilla/5.0 (Linux; Android 13; Pixel) AppleWebKit/537.36 (KHTML, like Gecko) "
+        b"Chrome/120.0.0.0 Mobile Safari/537.36"
+        b"Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+        b"Chrome/120.0.0.0 Safari/537.36"
+        b"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        b"Chrome/120.0.0.0 Safari/537.36"
+        b'{"id": "prof_", "owner_id": "usr_", "name": "", "device_type": "desktop", '
+        b'"device_type": "mobile", "window": {"width": 1920, "height": 1080}, '
+        b'"user_agent": "Mozilla/5.0 ", "country": "us", "custom_headers": null, '
+        b'"custom_headers": {"", "is_template": false, "visibility": "private", "version": '
+    ),
+}
+CURRENT_ZLIB_CODEC = "zlib:1"
+
+
+def build_snapshot(dp: Union[DeviceProfile, Row]) -> Dict[str, Any]:
+    return {
+        "id": dp.id,
+        "owner_id": dp.owner_id,
+        "name": dp.name,
+        "device_type": dp.device_type.value,
+        "window": {"width": dp.width, "height": dp.height},
+        "user_agent": dp.user_agent,
+        "country": dp.country,
+        "custom_headers": dp.custom_headers,
+        "is_template": dp.is_template,
+        "visibility": dp.visibility.value,
+        "version": dp.version,
+    }
+
+
+def is_checkpoint(version: int, interval: int) -> bool:
+    # Version 1 is always a checkpoint; after that every `interval`-th version is one.
+    if interval <= 1:
+        return True
+    return (version - 1) % interval == 0
+
+
+def diff_snapshot(prev: Dict[str, Any], cur: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in cur.items() if k not in prev or prev[k] != v}
+
+
+def apply_deltas(checkpoint: Dict[str, Any], deltas: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    out = dict(checkpoint)
+    for d in deltas:
+        out.update(d)
+    return out
+
+
+def encode_version(
+    version: int, snap: Dict[str, Any], prev: Optional[Dict[str, Any]], interval: int
+) -> tuple[Dict[str, Any], bool]:
+    if prev is None or is_checkpoint(version, interval):
+        return snap, True
+    return diff_snapshot(prev, snap), False
+
+
+def encode_payload(payload: Dict[str, Any], codec: str) -> tuple[Optional[Dict[str, Any]], Optional[bytes], Optional[str]]:
+    # Returns (snapshot, snapshot_z, codec) column values for a version row.
+    if codec != CODEC_ZLIB:
+        return payload, None, None
+    raw = json.dumps(payload, separators=(", ", ": ")).encode("utf-8")
+    c = zlib.compressobj(level=6, zdict=_ZDICTS[CURRENT_ZLIB_CODEC])
+    return None, c.compress(raw) + c.flush(), CURRENT_ZLIB_CODEC
+
+
+def decode_payload(snapshot: Optional[Dict[str, Any]], blob: Optional[bytes], codec: Optional[str]) -> Dict[str, Any]:
+    if codec is None:
+        if snapshot is None:
+            raise ValueError("snapshot_missing")
+        return snapshot
+    zdict = _ZDICTS.get(codec)
+    if zdict is None or blob is None:
+        raise ValueError("unknown_snapshot_codec")
+    d = zlib.decompressobj(zdict=zdict)
+    return json.loads(d.decompress(blob) + d.flush())
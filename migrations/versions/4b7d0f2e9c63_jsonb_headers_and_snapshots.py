@@ -0,0 +1,36 @@
+"""jsonb headers and snapshots
+
+Revision ID: 4b7d0f2e9c63
+Revises: e1f93b6c4a08
+Create Date: 2026-10-19 15:21:48.530904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7d0f2e9c63'
+down_revision = 'e1f93b6c4a08'
+branch_labels = None
+depends_on = None
+
+_COLUMNS = [
+    ('device_profiles', 'custom_headers'),
+    ('device_profile_versions', 'snapshot'),
+    ('device_profile_version_outbox', 'snapshot'),
+]
+
+
+def upgrade() -> None:
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, type_=postgresql.JSONB(), existing_type=sa.JSON(), postgresql_using=f'{column}::jsonb')
+    op.create_index('idx_profiles_headers', 'device_profiles', ['custom_headers'], unique=False, postgresql_using='gin', postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_headers', table_name='device_profiles', postgresql_using='gin', postgresql_where=sa.text('deleted_at IS NULL'))
+    for table, column in _COLUMNS:
+        op.alter_column(table, column, type_=sa.JSON(), existing_type=postgresql.JSONB(), postgresql_using=f'{column}::json')
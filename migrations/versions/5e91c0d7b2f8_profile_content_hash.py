@@ -0,0 +1,60 @@
+"""profile content hash
+
+Revision ID: 5e91c0d7b2f8
+Revises: e8b30f6d4a71
+Create Date: 2026-10-19 23:12:41.508337
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e91c0d7b2f8'
+down_revision = 'e8b30f6d4a71'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 5000
+
+# Frozen copy of app.profiles.fingerprint as of this revision, so the backfill does not change
+# with later app code. device_type arrives as the enum label (names equal values for it).
+CONTENT_COLUMNS = ("device_type", "width", "height", "user_agent", "country", "custom_headers")
+
+
+def content_hash(vals) -> str:
+    canonical = [
+        str(vals["device_type"]),
+        int(vals["width"]),
+        int(vals["height"]),
+        vals["user_agent"],
+        vals["country"],
+        vals["custom_headers"] or {},
+    ]
+    raw = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('device_profiles', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    # The hash is computed in Python (the frozen copy above), in id-keyset batches so memory
+    # stays flat on large tables.
+    bind = op.get_bind()
+    select = sa.text(f"SELECT id, {', '.join(CONTENT_COLUMNS)} FROM device_profiles WHERE id > :after ORDER BY id LIMIT :n")
+    update = sa.text("UPDATE device_profiles SET content_hash = :h WHERE id = :id")
+    after = ''
+    while True:
+        rows = bind.execute(select, {"after": after, "n": BACKFILL_BATCH}).mappings().all()
+        if not rows:
+            break
+        bind.execute(update, [{"id": r["id"], "h": content_hash(r)} for r in rows])
+        after = rows[-1]["id"]
+    op.create_index('idx_profiles_owner_content_hash', 'device_profiles', ['owner_id', 'content_hash'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_owner_content_hash', table_name='device_profiles', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_column('device_profiles', 'content_hash')
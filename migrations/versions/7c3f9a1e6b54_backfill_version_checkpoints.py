@@ -0,0 +1,52 @@
+"""backfill version checkpoints
+
+Revision ID: 7c3f9a1e6b54
+Revises: 5e91c0d7b2f8
+Create Date: 2026-10-19 23:41:05.227913
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3f9a1e6b54'
+down_revision = '5e91c0d7b2f8'
+branch_labels = None
+depends_on = None
+
+# Live profiles created before version history was kept (or seeded straight into the table) have
+# no version rows, so the first delta written for them would have no checkpoint below it. Give
+# each one a full checkpoint of its current state at its current version. The snapshot has the
+# same shape as app.profiles.snapshots.build_snapshot as of this revision; enums are stored by
+# name and snapshots carry their values.
+BACKFILL_SQL = """
+INSERT INTO device_profile_versions (profile_id, version, snapshot, is_checkpoint, changed_by)
+SELECT p.id, p.version,
+       jsonb_build_object(
+         'id', p.id,
+         'owner_id', p.owner_id,
+         'name', p.name,
+         'device_type', p.device_type::text,
+         'window', jsonb_build_object('width', p.width, 'height', p.height),
+         'user_agent', p.user_agent,
+         'country', p.country,
+         'custom_headers', p.custom_headers,
+         'is_template', p.is_template,
+         'visibility', CASE p.visibility::text WHEN 'global_' THEN 'global' ELSE p.visibility::text END,
+         'version', p.version
+       ),
+       true, p.owner_id
+FROM device_profiles p
+WHERE p.deleted_at IS NULL
+  AND NOT EXISTS (SELECT 1 FROM device_profile_versions v WHERE v.profile_id = p.id)
+  AND NOT EXISTS (SELECT 1 FROM device_profile_version_outbox o WHERE o.profile_id = p.id)
+"""
+
+
+def upgrade() -> None:
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    # The backfilled checkpoints are indistinguishable from written ones and remain valid history.
+    pass
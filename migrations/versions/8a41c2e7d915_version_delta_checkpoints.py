@@ -0,0 +1,47 @@
+"""version delta checkpoints
+
+Revision ID: 8a41c2e7d915
+Revises: 3d5cd6910978
+Create Date: 2026-10-19 09:12:41.220318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = '8a41c2e7d915'
+down_revision = '3d5cd6910978'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows hold full snapshots, so they are all valid checkpoints.
+    # Run scripts/compact_versions.py afterwards to rewrite them as deltas.
+    op.add_column('device_profile_versions', sa.Column('is_checkpoint', sa.Boolean(), server_default=sa.text('true'), nullable=False))
+
+
+def downgrade() -> None:
+    # Deltas cannot be read without the flag; expand them back before dropping it.
+    op.execute(
+        """
+        UPDATE device_profile_versions v
+        SET snapshot = (
+            SELECT jsonb_object_agg(e.key, e.value)::json FROM (
+                SELECT DISTINCT ON (kv.key) kv.key, kv.value
+                FROM device_profile_versions p, jsonb_each(p.snapshot::jsonb) kv
+                WHERE p.profile_id = v.profile_id
+                  AND p.version <= v.version
+                  AND p.version >= (
+                      SELECT max(c.version) FROM device_profile_versions c
+                      WHERE c.profile_id = v.profile_id AND c.is_checkpoint AND c.version <= v.version
+                  )
+                ORDER BY kv.key, p.version DESC
+            ) e
+        )
+        WHERE NOT v.is_checkpoint
+        """
+    )
+    op.drop_column('device_profile_versions', 'is_checkpoint')
@@ -0,0 +1,32 @@
+"""keyset composite indexes
+
+Revision ID: 9f2c51d8e7a4
+Revises: 4b7d0f2e9c63
+Create Date: 2026-10-19 17:05:33.184620
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = '9f2c51d8e7a4'
+down_revision = '4b7d0f2e9c63'
+branch_labels = None
+depends_on = None
+
+GLOBAL_TEMPLATE_PREDICATE = "deleted_at IS NULL AND is_template IS true AND visibility = 'global_'"
+
+
+def upgrade() -> None:
+    op.create_index('idx_profiles_owner_created', 'device_profiles', ['owner_id', 'created_at', 'id'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_global_tmpl_created', 'device_profiles', ['created_at', 'id'], unique=False, postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+    # idx_profiles_owner is a prefix of idx_profiles_owner_created with the same predicate.
+    op.drop_index('idx_profiles_owner', table_name='device_profiles', postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.create_index('idx_profiles_owner', 'device_profiles', ['owner_id'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index('idx_profiles_global_tmpl_created', table_name='device_profiles', postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+    op.drop_index('idx_profiles_owner_created', table_name='device_profiles', postgresql_where=sa.text('deleted_at IS NULL'))
@@ -0,0 +1,34 @@
+"""sort keyset indexes
+
+Revision ID: a7c1e5f28b94
+Revises: f0b7d3a19e52
+Create Date: 2026-10-19 20:22:41.390175
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c1e5f28b94'
+down_revision = 'f0b7d3a19e52'
+branch_labels = None
+depends_on = None
+
+GLOBAL_TEMPLATE_PREDICATE = "deleted_at IS NULL AND is_template IS true AND visibility = 'global_'"
+
+
+def upgrade() -> None:
+    # sort=-created_at scans the existing *_created indexes backwards.
+    op.create_index('idx_profiles_owner_updated', 'device_profiles', ['owner_id', 'updated_at', 'id'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_global_tmpl_updated', 'device_profiles', ['updated_at', 'id'], unique=False, postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+    op.create_index('idx_profiles_owner_name', 'device_profiles', ['owner_id', sa.text('lower(name)'), 'id'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_global_tmpl_name', 'device_profiles', [sa.text('lower(name)'), 'id'], unique=False, postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_global_tmpl_name', table_name='device_profiles', postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+    op.drop_index('idx_profiles_owner_name', table_name='device_profiles', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index('idx_profiles_global_tmpl_updated', table_name='device_profiles', postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+    op.drop_index('idx_profiles_owner_updated', table_name='device_profiles', postgresql_where=sa.text('deleted_at IS NULL'))
@@ -0,0 +1,32 @@
+"""name search indexes
+
+Revision ID: b3e8f41a6c20
+Revises: 9f2c51d8e7a4
+Create Date: 2026-10-19 18:12:07.441903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e8f41a6c20'
+down_revision = '9f2c51d8e7a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # btree_gin lets owner_id sit in the same GIN index as the trigrams, so a search is scoped to
+    # one owner's rows inside the index instead of matching every owner and filtering afterwards.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    op.create_index('idx_profiles_name_prefix', 'device_profiles', ['owner_id', sa.text('lower(name) text_pattern_ops')], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_name_trgm', 'device_profiles', ['owner_id', sa.text('lower(name) gin_trgm_ops')], unique=False, postgresql_using='gin', postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_name_trgm', table_name='device_profiles', postgresql_using='gin', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.drop_index('idx_profiles_name_prefix', table_name='device_profiles', postgresql_where=sa.text('deleted_at IS NULL'))
+    # pg_trgm and btree_gin are left installed; other objects may depend on them.
@@ -0,0 +1,31 @@
+"""viewport gist indexes
+
+Revision ID: c2d94b7e1f36
+Revises: a7c1e5f28b94
+Create Date: 2026-10-19 21:04:55.613028
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d94b7e1f36'
+down_revision = 'a7c1e5f28b94'
+branch_labels = None
+depends_on = None
+
+GLOBAL_TEMPLATE_PREDICATE = "deleted_at IS NULL AND is_template IS true AND visibility = 'global_'"
+
+
+def upgrade() -> None:
+    # btree_gist lets owner_id share a GiST index with the viewport point.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.create_index('idx_profiles_owner_viewport', 'device_profiles', ['owner_id', sa.text('point(width, height)')], unique=False, postgresql_using='gist', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_global_tmpl_viewport', 'device_profiles', [sa.text('point(width, height)')], unique=False, postgresql_using='gist', postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_global_tmpl_viewport', table_name='device_profiles', postgresql_using='gist', postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+    op.drop_index('idx_profiles_owner_viewport', table_name='device_profiles', postgresql_using='gist', postgresql_where=sa.text('deleted_at IS NULL'))
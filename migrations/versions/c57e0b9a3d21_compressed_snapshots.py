@@ -0,0 +1,73 @@
+"""compressed snapshots
+
+Revision ID: c57e0b9a3d21
+Revises: 8a41c2e7d915
+Create Date: 2026-10-19 11:03:17.604412
+
+"""
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c57e0b9a3d21'
+down_revision = '8a41c2e7d915'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the preset dictionaries and decoder from app.profiles.snapshots as of this
+# revision, so the downgrade does not depend on later app code.
+ZDICTS = {
+    "zlib:1": (
+        b'"accept-language": "en-US,en;q=0.9", "accept": "text/html,application/xhtml+xml,'
+        b'application/xml;q=0.9,*/*;q=0.8", "referer": "https://www.google.com/", '
+        b'"sec-ch-ua-platform": "Windows", "sec-ch-ua-mobile": "?0", "cookie": "'
+        b"Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+        b"(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+        b"Mozilla/5.0 (Linux; Android 13; Pixel) AppleWebKit/537.36 (KHTML, like Gecko) "
+        b"Chrome/120.0.0.0 Mobile Safari/537.36"
+        b"Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+        b"Chrome/120.0.0.0 Safari/537.36"
+        b"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+        b"Chrome/120.0.0.0 Safari/537.36"
+        b'{"id": "prof_", "owner_id": "usr_", "name": "", "device_type": "desktop", '
+        b'"device_type": "mobile", "window": {"width": 1920, "height": 1080}, '
+        b'"user_agent": "Mozilla/5.0 ", "country": "us", "custom_headers": null, '
+        b'"custom_headers": {"", "is_template": false, "visibility": "private", "version": '
+    ),
+}
+
+
+def decode_payload(blob, codec):
+    zdict = ZDICTS.get(codec)
+    if zdict is None or blob is None:
+        raise ValueError("unknown_snapshot_codec")
+    d = zlib.decompressobj(zdict=zdict)
+    return json.loads(d.decompress(blob) + d.flush())
+
+
+def upgrade() -> None:
+    op.add_column('device_profile_versions', sa.Column('snapshot_z', sa.LargeBinary(), nullable=True))
+    op.add_column('device_profile_versions', sa.Column('codec', sa.String(), nullable=True))
+    op.alter_column('device_profile_versions', 'snapshot', existing_type=sa.JSON(), nullable=True)
+    op.create_check_constraint('chk_snapshot_present', 'device_profile_versions', 'snapshot IS NOT NULL OR snapshot_z IS NOT NULL')
+
+
+def downgrade() -> None:
+    # Inflate compressed rows back into the JSON column before dropping the codec columns.
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text("SELECT profile_id, version, snapshot_z, codec FROM device_profile_versions WHERE codec IS NOT NULL")
+    ).all()
+    for pid, version, blob, codec in rows:
+        bind.execute(
+            sa.text("UPDATE device_profile_versions SET snapshot = CAST(:s AS json) WHERE profile_id = :p AND version = :v"),
+            {"s": json.dumps(decode_payload(blob, codec)), "p": pid, "v": version},
+        )
+    op.drop_constraint('chk_snapshot_present', 'device_profile_versions', type_='check')
+    op.alter_column('device_profile_versions', 'snapshot', existing_type=sa.JSON(), nullable=False)
+    op.drop_column('device_profile_versions', 'codec')
+    op.drop_column('device_profile_versions', 'snapshot_z')
@@ -0,0 +1,25 @@
+"""user agent trgm index
+
+Revision ID: d6a2c9e05f17
+Revises: b3e8f41a6c20
+Create Date: 2026-10-19 18:47:52.106338
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6a2c9e05f17'
+down_revision = 'b3e8f41a6c20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_profiles_ua_trgm', 'device_profiles', ['owner_id', sa.text('user_agent gin_trgm_ops')], unique=False, postgresql_using='gin', postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_ua_trgm', table_name='device_profiles', postgresql_using='gin', postgresql_where=sa.text('deleted_at IS NULL'))
@@ -0,0 +1,49 @@
+"""version outbox
+
+Revision ID: e1f93b6c4a08
+Revises: c57e0b9a3d21
+Create Date: 2026-10-19 13:40:05.918227
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f93b6c4a08'
+down_revision = 'c57e0b9a3d21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('device_profile_version_outbox',
+    sa.Column('seq', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('profile_id', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('snapshot', sa.JSON(), nullable=True),
+    sa.Column('snapshot_z', sa.LargeBinary(), nullable=True),
+    sa.Column('codec', sa.String(), nullable=True),
+    sa.Column('is_checkpoint', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+    sa.Column('changed_by', sa.String(), nullable=False),
+    sa.Column('changed_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['changed_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['profile_id'], ['device_profiles.id'], ),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    op.create_index('uniq_outbox_profile_version', 'device_profile_version_outbox', ['profile_id', 'version'], unique=True)
+
+
+def downgrade() -> None:
+    # Flush anything still queued so no snapshot is lost.
+    op.execute(
+        """
+        INSERT INTO device_profile_versions
+            (profile_id, version, snapshot, snapshot_z, codec, is_checkpoint, changed_by, changed_at)
+        SELECT profile_id, version, snapshot, snapshot_z, codec, is_checkpoint, changed_by, changed_at
+        FROM device_profile_version_outbox ORDER BY seq
+        """
+    )
+    op.drop_index('uniq_outbox_profile_version', table_name='device_profile_version_outbox')
+    op.drop_table('device_profile_version_outbox')
@@ -0,0 +1,29 @@
+"""id keyset indexes
+
+Revision ID: e8b30f6d4a71
+Revises: c2d94b7e1f36
+Create Date: 2026-10-19 21:48:30.275114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b30f6d4a71'
+down_revision = 'c2d94b7e1f36'
+branch_labels = None
+depends_on = None
+
+GLOBAL_TEMPLATE_PREDICATE = "deleted_at IS NULL AND is_template IS true AND visibility = 'global_'"
+
+
+def upgrade() -> None:
+    op.create_index('idx_profiles_owner_id', 'device_profiles', ['owner_id', 'id'], unique=False, postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_global_tmpl_id', 'device_profiles', ['id'], unique=False, postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+
+
+def downgrade() -> None:
+    op.drop_index('idx_profiles_global_tmpl_id', table_name='device_profiles', postgresql_where=sa.text(GLOBAL_TEMPLATE_PREDICATE))
+    op.drop_index('idx_profiles_owner_id', table_name='device_profiles', postgresql_where=sa.text('deleted_at IS NULL'))
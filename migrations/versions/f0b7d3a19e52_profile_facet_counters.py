@@ -0,0 +1,43 @@
+"""profile facet counters
+
+Revision ID: f0b7d3a19e52
+Revises: d6a2c9e05f17
+Create Date: 2026-10-19 19:30:14.872216
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+
+# revision identifiers, used by Alembic.
+revision = 'f0b7d3a19e52'
+down_revision = 'd6a2c9e05f17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('device_profile_facets',
+    sa.Column('owner_id', sa.String(), nullable=False),
+    sa.Column('device_type', postgresql.ENUM('desktop', 'mobile', name='device_type', create_type=False), nullable=False),
+    sa.Column('country', sa.String(), nullable=False),
+    sa.Column('is_template', sa.Boolean(), nullable=False),
+    sa.Column('count', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id', 'device_type', 'country', 'is_template')
+    )
+    op.execute(
+        """
+        INSERT INTO device_profile_facets(owner_id, device_type, country, is_template, count)
+        SELECT owner_id, device_type, country, is_template, count(*)
+        FROM device_profiles
+        WHERE deleted_at IS NULL
+        GROUP BY owner_id, device_type, country, is_template
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('device_profile_facets')
@@ -0,0 +1,40 @@
+import argparse
+import time
+import tracemalloc
+
+from explain_list_queries import BENCH_OWNER_PREFIX, seed
+
+from app.core.config import settings
+from app.db.session import get_session
+from app.profiles.export import iter_ndjson
+from app.profiles.repository import ListFilters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream an owner's catalog as NDJSON and report throughput and memory")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--owners", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=settings.export_batch_size)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+    user_id = f"{BENCH_OWNER_PREFIX}0"
+    if not args.skip_seed:
+        with get_session() as s:
+            seed(s, args.rows, args.owners)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    rows = size = 0
+    for chunk in iter_ndjson(get_session, user_id, ListFilters(is_template=False), args.batch_size, args.gzip):
+        size += len(chunk)
+        if not args.gzip:
+            rows += chunk.count(b"\n")
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rate = f" {rows / elapsed:,.0f} rows/s" if rows else ""
+    print(f"{size / 1e6:.1f} MB in {elapsed:.2f}s{rate} peak={peak / 1024:.0f}KiB")
+
+
+if __name__ == "__main__":
+    main()
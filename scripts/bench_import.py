@@ -0,0 +1,55 @@
+import argparse
+import json
+import time
+import uuid
+
+from sqlalchemy import text
+
+from explain_list_queries import BENCH_OWNER_PREFIX
+
+from app.core.config import settings
+from app.db.session import get_session
+from app.profiles.importer import NdjsonImporter
+from app.profiles.repository import DeviceProfileRepository
+
+
+def lines(n: int, run: str):
+    for i in range(n):
+        yield json.dumps(
+            {
+                "name": f"Import {run} {i}",
+                "device_type": "mobile" if i % 3 == 0 else "desktop",
+                "window": {"width": 320 + i % 1600, "height": 480 + i % 1000},
+                "user_agent": f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/{90 + i % 40}.0.0.0 Safari/537.36",
+                "country": ("us", "gb", "de", "fr")[i % 4],
+                "custom_headers": [{"key": "accept-language", "value": "en-US"}],
+            }
+        ).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load synthetic NDJSON through the importer and report rows/s")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    args = parser.parse_args()
+    owner = f"{BENCH_OWNER_PREFIX}import"
+    run = uuid.uuid4().hex[:8]
+    with get_session() as s:
+        s.execute(text("INSERT INTO users(id, email) VALUES (:i, :i || '@example.com') ON CONFLICT (id) DO NOTHING"), {"i": owner})
+        s.commit()
+        importer = NdjsonImporter(DeviceProfileRepository(s), owner)
+        t0 = time.perf_counter()
+        batch = []
+        for n, line in enumerate(lines(args.rows, run), start=1):
+            batch.append((n, line))
+            if len(batch) >= args.batch_size:
+                importer.load(batch)
+                batch = []
+        importer.load(batch)
+        elapsed = time.perf_counter() - t0
+    r = importer.result
+    print(f"created={r.created} failed={r.failed} in {elapsed:.2f}s -> {r.created / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import statistics
+import time
+
+from explain_list_queries import BENCH_OWNER_PREFIX, seed
+
+from app.db.explain import explain, iter_nodes
+from app.db.session import get_session
+from app.profiles.repository import MATCH_CONTAINS, MATCH_FUZZY, MATCH_PREFIX, DeviceProfileRepository, ListFilters
+
+
+# Seeded names are 'Bench ' || md5(g), so these terms hit a realistic slice of the catalog.
+CASES = {
+    "prefix": ListFilters(q="bench 3f", match=MATCH_PREFIX),
+    "contains": ListFilters(q="a1b", match=MATCH_CONTAINS),
+    "fuzzy": ListFilters(q="bench 3fa1", match=MATCH_FUZZY),
+}
+
+
+def run(repo: DeviceProfileRepository, user_id: str, filters: ListFilters, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        repo.list_scoped_page(user_id, filters)
+        samples.append((time.perf_counter() - t0) * 1000)
+        repo.session.rollback()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark q= name search modes at growing catalog sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument("--owners", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    user_id = f"{BENCH_OWNER_PREFIX}0"
+    with get_session() as s:
+        repo = DeviceProfileRepository(s)
+        for rows in args.sizes:
+            # Seeding is idempotent, so each size only inserts the rows beyond the previous one.
+            seed(s, rows, args.owners)
+            for name, filters in CASES.items():
+                samples = sorted(run(repo, user_id, filters, args.iterations))
+                p50 = statistics.median(samples)
+                p95 = samples[int(len(samples) * 0.95) - 1]
+                indexes = {n["Index Name"] for n in iter_nodes(explain(s, repo._page_query(user_id, filters))) if "Index Name" in n}
+                print(f"{rows:>11,} {name:<9} p50={p50:7.2f}ms p95={p95:7.2f}ms indexes={sorted(indexes)}")
+                s.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import statistics
+import time
+
+from explain_list_queries import BENCH_OWNER_PREFIX, seed
+
+from app.db.explain import explain, iter_nodes
+from app.db.session import get_session
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+# Common breakpoints a scheduler would match against.
+TARGETS = [(1440, 900), (1920, 1080), (390, 844), (768, 1024)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the nearest-viewport lookup")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--owners", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+    user_id = f"{BENCH_OWNER_PREFIX}0"
+    with get_session() as s:
+        if not args.skip_seed:
+            seed(s, args.rows, args.owners)
+        repo = DeviceProfileRepository(s)
+        for w, h in TARGETS:
+            samples = []
+            for _ in range(args.iterations):
+                t0 = time.perf_counter()
+                repo.nearest(user_id, w, h, args.k, ListFilters())
+                samples.append((time.perf_counter() - t0) * 1000)
+                s.rollback()
+            samples.sort()
+            plan = explain(s, repo._nearest_query(user_id, w, h, args.k, ListFilters()), analyze=True)
+            indexes = sorted({n["Index Name"] for n in iter_nodes(plan) if "Index Name" in n})
+            print(
+                f"{w}x{h} k={args.k} p50={statistics.median(samples):.2f}ms "
+                f"p95={samples[int(len(samples) * 0.95) - 1]:.2f}ms indexes={indexes}"
+            )
+            s.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import argparse
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.db.session import get_session
+from app.profiles.ids import new_profile_id
+
+
+SCHEMES = {
+    "uuid4_hex12": lambda: f"prof_{uuid.uuid4().hex[:12]}",
+    "ulid": new_profile_id,
+}
+
+
+def run(sess, name: str, make_id, rows: int, batch: int) -> None:
+    # Each scheme fills its own unlogged table with a text primary key, the shape of
+    # device_profiles.id, so the difference is the B-tree insert pattern.
+    table = f"bench_ids_{name}"
+    sess.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    sess.execute(text(f"CREATE UNLOGGED TABLE {table} (id text PRIMARY KEY, payload text NOT NULL)"))
+    sess.commit()
+    stmt = text(f"INSERT INTO {table}(id, payload) VALUES (:id, :payload)")
+    t0 = time.perf_counter()
+    done = 0
+    while done < rows:
+        n = min(batch, rows - done)
+        sess.execute(stmt, [{"id": make_id(), "payload": "x" * 64} for _ in range(n)])
+        sess.commit()
+        done += n
+    elapsed = time.perf_counter() - t0
+    size = sess.execute(text(f"SELECT pg_relation_size('{table}_pkey')")).scalar_one()
+    print(f"{name:<12} {rows / elapsed:>10,.0f} rows/s  pkey={size / 1_048_576:8.1f}MB")
+    sess.execute(text(f"DROP TABLE {table}"))
+    sess.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare insert throughput of random vs time-ordered profile ids")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    args = parser.parse_args()
+    with get_session() as s:
+        for name, make_id in SCHEMES.items():
+            run(s, name, make_id, args.rows, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import time
+import tracemalloc
+
+from sqlalchemy import select
+
+from explain_list_queries import BENCH_OWNER_PREFIX, seed
+
+from app.db.models import DeviceProfile
+from app.db.scoping import scope_owned
+from app.db.session import get_session
+from app.profiles.dto import ProfileResponse
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+def orm_page(sess, user_id: str, limit: int) -> list:
+    # The previous read path: ORM entities through the identity map, validated responses.
+    q = scope_owned(select(DeviceProfile), user_id).order_by(DeviceProfile.created_at, DeviceProfile.id).limit(limit + 1)
+    rows = sess.execute(q).scalars().all()[:limit]
+    return [ProfileResponse.from_model(r) for r in rows]
+
+
+def row_page(sess, user_id: str, limit: int) -> list:
+    rows, _ = DeviceProfileRepository(sess).list_scoped_page(user_id, ListFilters(limit=limit, is_template=False))
+    return [ProfileResponse.from_row(r) for r in rows]
+
+
+def measure(fn, sess, user_id: str, limit: int, iterations: int) -> tuple[float, float, float]:
+    fn(sess, user_id, limit)
+    sess.rollback()
+    cpu = 0.0
+    for _ in range(iterations):
+        t0 = time.process_time()
+        fn(sess, user_id, limit)
+        cpu += time.process_time() - t0
+        # A fresh transaction per request, like the API's per-request session.
+        sess.rollback()
+    tracemalloc.start()
+    fn(sess, user_id, limit)
+    snap = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    sess.rollback()
+    blocks = sum(s.count for s in snap.statistics("filename"))
+    return cpu / iterations * 1000, peak / 1024, blocks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare ORM and row-based list page reads")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+    user_id = f"{BENCH_OWNER_PREFIX}0"
+    with get_session() as s:
+        if not args.skip_seed:
+            seed(s, args.rows, 100)
+        for name, fn in (("orm", orm_page), ("rows", row_page)):
+            cpu_ms, peak_kb, blocks = measure(fn, s, user_id, args.limit, args.iterations)
+            print(f"{name:<5} cpu={cpu_ms:6.2f}ms/request peak={peak_kb:8.1f}KiB live_blocks={blocks:,}")
+
+
+if __name__ == "__main__":
+    main()
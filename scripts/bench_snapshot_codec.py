@@ -0,0 +1,109 @@
+import argparse
+import json
+import random
+import time
+import zlib
+
+from app.profiles.snapshots import (
+    CODEC_JSON,
+    CODEC_ZLIB,
+    decode_payload,
+    diff_snapshot,
+    encode_payload,
+    encode_version,
+)
+
+
+_UAS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{v}.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{v}.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_{v} like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android 13; Pixel) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{v}.0.0.0 Mobile Safari/537.36",
+]
+_HEADERS = [
+    None,
+    {"accept-language": "en-US,en;q=0.9"},
+    {"accept-language": "en-GB,en;q=0.8", "referer": "https://www.google.com/"},
+    {"accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8", "sec-ch-ua-mobile": "?0"},
+]
+
+
+def synthetic_history(n: int, versions_per_profile: int, seed: int):
+    # Yields (version, full_snapshot, previous_full_snapshot) like the write path sees them.
+    rnd = random.Random(seed)
+    produced = 0
+    p = 0
+    while produced < n:
+        p += 1
+        snap = {
+            "id": f"prof_{p:012x}",
+            "owner_id": f"usr_{rnd.randrange(1000):06d}",
+            "name": f"Profile {p}",
+            "device_type": rnd.choice(["desktop", "mobile"]),
+            "window": {"width": rnd.choice([1366, 1440, 1920, 390, 412]), "height": rnd.choice([768, 900, 1080, 844, 915])},
+            "user_agent": rnd.choice(_UAS).format(v=rnd.randrange(100, 130)),
+            "country": rnd.choice(["us", "gb", "de", "fr"]),
+            "custom_headers": rnd.choice(_HEADERS),
+            "is_template": False,
+            "visibility": "private",
+            "version": 1,
+        }
+        prev = None
+        for v in range(1, versions_per_profile + 1):
+            if produced >= n:
+                return
+            if v > 1:
+                snap = dict(snap, version=v)
+                r = rnd.random()
+                if r < 0.6:
+                    snap["name"] = f"Profile {p} r{v}"
+                elif r < 0.85:
+                    snap["user_agent"] = rnd.choice(_UAS).format(v=rnd.randrange(100, 130))
+                else:
+                    snap["custom_headers"] = rnd.choice(_HEADERS)
+            yield v, snap, prev
+            prev = snap
+            produced += 1
+
+
+def run(n: int, versions_per_profile: int, interval: int) -> None:
+    payloads = [encode_version(v, s, p, interval)[0] for v, s, p in synthetic_history(n, versions_per_profile, 7)]
+    full = [s for _, s, _ in synthetic_history(n, versions_per_profile, 7)]
+    print(f"versions={n} versions_per_profile={versions_per_profile} checkpoint_interval={interval}")
+    raw_full = sum(len(json.dumps(s)) for s in full)
+    print(f"{'full json (pre-delta)':<28} bytes={raw_full:>14,}")
+    for label, codec in (("delta json", CODEC_JSON), ("delta zlib+dict", CODEC_ZLIB)):
+        t0 = time.perf_counter()
+        encoded = [encode_payload(p, codec) for p in payloads]
+        t1 = time.perf_counter()
+        for plain, blob, c in encoded:
+            decode_payload(plain, blob, c)
+        t2 = time.perf_counter()
+        size = sum(len(blob) if blob is not None else len(json.dumps(plain)) for plain, blob, _ in encoded)
+        print(
+            f"{label:<28} bytes={size:>14,} ratio={size / raw_full:6.3f} "
+            f"encode_us={(t1 - t0) / n * 1e6:6.2f} decode_us={(t2 - t1) / n * 1e6:6.2f}"
+        )
+    no_dict = sum(len(zlib.compress(json.dumps(p).encode("utf-8"), 6)) for p in payloads)
+    print(f"{'delta zlib (no dict)':<28} bytes={no_dict:>14,} ratio={no_dict / raw_full:6.3f}")
+    print(f"{'delta diff-only cost':<28} diff_us={_time_diff(full) / n * 1e6:6.2f}")
+
+
+def _time_diff(full) -> float:
+    t0 = time.perf_counter()
+    for a, b in zip(full, full[1:]):
+        diff_snapshot(a, b)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark snapshot encodings on a synthetic version history")
+    parser.add_argument("--versions", type=int, default=1_000_000)
+    parser.add_argument("--versions-per-profile", type=int, default=50)
+    parser.add_argument("--interval", type=int, default=20)
+    args = parser.parse_args()
+    run(args.versions, args.versions_per_profile, args.interval)
+
+
+if __name__ == "__main__":
+    main()
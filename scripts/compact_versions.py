@@ -0,0 +1,103 @@
+import argparse
+
+from sqlalchemy import select, text, update
+
+from app.core.config import settings
+from app.db.models import DeviceProfileVersion
+from app.db.session import get_session
+from app.profiles.snapshots import CODEC_JSON, CODEC_ZLIB, decode_payload, diff_snapshot, encode_payload, is_checkpoint
+
+
+def storage_report(sess) -> dict:
+    row = sess.execute(
+        text(
+            """
+            SELECT count(*) AS rows,
+                   count(*) FILTER (WHERE is_checkpoint) AS checkpoints,
+                   coalesce(sum(coalesce(pg_column_size(snapshot), 0) + coalesce(pg_column_size(snapshot_z), 0)), 0)
+                       AS snapshot_bytes,
+                   pg_total_relation_size('device_profile_versions') AS table_bytes
+            FROM device_profile_versions
+            """
+        )
+    ).one()
+    return dict(row._mapping)
+
+
+def compact(sess, interval: int, batch_size: int, codec_name: str) -> int:
+    # Rewrites full snapshots written before delta encoding existed. Each profile's chain is
+    # walked in version order; only rows that are not on a checkpoint position and whose
+    # predecessor is present become deltas.
+    rewritten = 0
+    last_pid = ""
+    while True:
+        pids = sess.execute(
+            select(DeviceProfileVersion.profile_id)
+            .where(DeviceProfileVersion.profile_id > last_pid)
+            .group_by(DeviceProfileVersion.profile_id)
+            .order_by(DeviceProfileVersion.profile_id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not pids:
+            return rewritten
+        for pid in pids:
+            rows = sess.execute(
+                select(
+                    DeviceProfileVersion.version,
+                    DeviceProfileVersion.snapshot,
+                    DeviceProfileVersion.snapshot_z,
+                    DeviceProfileVersion.codec,
+                    DeviceProfileVersion.is_checkpoint,
+                )
+                .where(DeviceProfileVersion.profile_id == pid)
+                .order_by(DeviceProfileVersion.version)
+            ).all()
+            prev_full = None
+            prev_version = None
+            for version, plain, blob, codec, checkpoint in rows:
+                snap = decode_payload(plain, blob, codec)
+                if not checkpoint:
+                    # Already a delta: keep the running full snapshot in sync and move on.
+                    prev_full = dict(prev_full or {}, **snap)
+                    prev_version = version
+                    continue
+                if prev_full is not None and prev_version == version - 1 and not is_checkpoint(version, interval):
+                    new_plain, new_blob, new_codec = encode_payload(diff_snapshot(prev_full, snap), codec_name)
+                    sess.execute(
+                        update(DeviceProfileVersion)
+                        .where(DeviceProfileVersion.profile_id == pid, DeviceProfileVersion.version == version)
+                        .values(snapshot=new_plain, snapshot_z=new_blob, codec=new_codec, is_checkpoint=False)
+                    )
+                    rewritten += 1
+                prev_full = snap
+                prev_version = version
+        sess.commit()
+        last_pid = pids[-1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rewrite full version snapshots as deltas")
+    parser.add_argument("--interval", type=int, default=settings.snapshot_checkpoint_interval)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--codec", choices=[CODEC_JSON, CODEC_ZLIB], default=settings.snapshot_codec)
+    parser.add_argument("--report-only", action="store_true")
+    args = parser.parse_args()
+    with get_session() as s:
+        before = storage_report(s)
+        print("BEFORE:", before)
+        if args.report_only:
+            return
+        n = compact(s, args.interval, args.batch_size, args.codec)
+        s.execute(text("ANALYZE device_profile_versions"))
+        s.commit()
+        after = storage_report(s)
+        print("REWRITTEN:", n)
+        print("AFTER:", after)
+        if before["snapshot_bytes"]:
+            saved = 1 - after["snapshot_bytes"] / before["snapshot_bytes"]
+            print(f"SNAPSHOT BYTES SAVED: {saved:.1%}")
+        print("NOTE: run VACUUM FULL device_profile_versions to return freed pages to the OS.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.db.explain import explain, iter_nodes
+from app.db.session import get_session
+from app.profiles.repository import (
+    MATCH_CONTAINS,
+    MATCH_FUZZY,
+    SORT_CREATED_DESC,
+    SORT_NAME,
+    SORT_UPDATED_DESC,
+    DeviceProfileRepository,
+    ListFilters,
+)
+
+
+BENCH_OWNER_PREFIX = "usr_bench_"
+
+
+def seed(sess, rows: int, owners: int) -> None:
+    # Synthetic catalog spread over `owners` users; ids are prefixed so reruns are no-ops.
+    sess.execute(
+        text(
+            """
+            INSERT INTO users(id, email)
+            SELECT :p || o, :p || o || '@example.com' FROM generate_series(0, :owners - 1) o
+            ON CONFLICT (id) DO NOTHING
+            """
+        ),
+        {"p": BENCH_OWNER_PREFIX, "owners": owners},
+    )
+    sess.execute(
+        text(
+            """
+            INSERT INTO device_profiles(
+              id, owner_id, name, device_type, width, height, user_agent, country,
+              custom_headers, created_at, updated_at
+            )
+            SELECT 'bench_' || g,
+                   :p || (g % :owners),
+                   'Bench ' || md5(g::text),
+                   (CASE WHEN g % 3 = 0 THEN 'mobile' ELSE 'desktop' END)::device_type,
+                   320 + g % 1600,
+                   480 + g % 1000,
+                   'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/'
+                     || (90 + g % 40) || '.0.0.0 Safari/537.36',
+                   (ARRAY['us','gb','de','fr','es','it','ca','au'])[1 + g % 8],
+                   CASE WHEN g % 5 = 0 THEN NULL
+                        ELSE jsonb_build_object('accept-language', 'en-US', 'x-shard', (g % 1000)::text) END,
+                   now() - make_interval(secs => g),
+                   now() - make_interval(secs => g % 86400)
+            FROM generate_series(1, :rows) g
+            ON CONFLICT (id) DO NOTHING
+            """
+        ),
+        {"p": BENCH_OWNER_PREFIX, "owners": owners, "rows": rows},
+    )
+    sess.commit()
+    sess.execute(text("ANALYZE device_profiles"))
+    sess.commit()
+
+
+def cases() -> dict[str, ListFilters]:
+    return {
+        "first_page": ListFilters(),
+        "deep_page": ListFilters(cursor=(datetime.now(timezone.utc) - timedelta(days=30), "")),
+        "sort_created_desc": ListFilters(sort=SORT_CREATED_DESC),
+        "sort_updated_desc": ListFilters(sort=SORT_UPDATED_DESC),
+        "sort_name": ListFilters(sort=SORT_NAME),
+        "viewport_range": ListFilters(min_width=1280, max_width=1600, max_height=1000),
+        "name_prefix": ListFilters(q="bench 3f"),
+        "name_contains": ListFilters(q="a1b", match=MATCH_CONTAINS),
+        "name_fuzzy": ListFilters(q="bench 3fa1", match=MATCH_FUZZY),
+        "ua_contains": ListFilters(ua="Chrome/120"),
+        "has_header": ListFilters(header_key="x-shard"),
+        "header_equals": ListFilters(header_eq=("x-shard", "42")),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a synthetic catalog and EXPLAIN the list queries")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--owners", type=int, default=100)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--case", action="append", help="only run the named case(s)")
+    parser.add_argument("--json", action="store_true", help="print the full JSON plans")
+    args = parser.parse_args()
+    user_id = f"{BENCH_OWNER_PREFIX}0"
+    with get_session() as s:
+        if not args.skip_seed:
+            seed(s, args.rows, args.owners)
+        repo = DeviceProfileRepository(s)
+        for name, filters in cases().items():
+            if args.case and name not in args.case:
+                continue
+            plan = explain(s, repo._page_query(user_id, filters), analyze=True)
+            print(f"== {name}: {plan.get('Actual Total Time')} ms")
+            if args.json:
+                print(json.dumps(plan, indent=2))
+                continue
+            for node in iter_nodes(plan):
+                idx = f" using {node['Index Name']}" if "Index Name" in node else ""
+                print(f"   {node['Node Type']}{idx} rows={node.get('Actual Rows')}")
+            s.rollback()
+
+
+if __name__ == "__main__":
+    main()
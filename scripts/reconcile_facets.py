@@ -0,0 +1,18 @@
+import argparse
+
+from app.db.session import get_session
+from app.profiles.facets import reconcile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild device_profile_facets from device_profiles")
+    parser.add_argument("--owner", help="only reconcile this owner's counters")
+    args = parser.parse_args()
+    with get_session() as s:
+        drifted = reconcile(s, args.owner)
+        s.commit()
+    print(f"reconciled facet counters: {drifted} key(s) had drifted")
+
+
+if __name__ == "__main__":
+    main()
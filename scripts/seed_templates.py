@@ -3,27 +3,40 @@
 from sqlalchemy import text, select
 
 from app.db.session import get_session
-from app.db.models import DeviceType, Visibility, DeviceProfile
+from app.db.models import DeviceType, Visibility, DeviceProfile, DeviceProfileVersion
+from app.profiles.facets import bump, change, facet_key
+from app.profiles.fingerprint import with_content_hash
+from app.profiles.snapshots import build_snapshot
 
 
 def _ensure_profile(sess, profile_id, owner_id, name, device_type, width, height, user_agent, country, headers, is_template, visibility):
     exists = sess.execute(select(DeviceProfile.id).where(DeviceProfile.id == profile_id)).scalar()
     if exists:
         return
+    content = with_content_hash(
+        {
+            "device_type": device_type,
+            "width": width,
+            "height": height,
+            "user_agent": user_agent,
+            "country": country,
+            "custom_headers": headers or {},
+        }
+    )
     dp = DeviceProfile(
         id=profile_id,
         owner_id=owner_id,
         name=name,
-        device_type=device_type,
-        width=width,
-        height=height,
-        user_agent=user_agent,
-        country=country,
-        custom_headers=headers or {},
         is_template=is_template,
         visibility=visibility,
+        version=1,
+        **content,
     )
     sess.add(dp)
+    sess.flush()
+    # Later deltas are encoded against this checkpoint.
+    sess.add(DeviceProfileVersion(profile_id=profile_id, version=1, snapshot=build_snapshot(dp), changed_by=owner_id))
+    bump(sess, change(None, facet_key(dp)))
 
 
 def main() -> None:
@@ -17,6 +17,24 @@ def _make_url(db_name: str) -> str:
     return f"postgresql+psycopg://{user}:{pwd}@{host}:{port}/{db_name}"
 
 
+def _create_user() -> tuple[str, str]:
+    # Inserts a user with one API key into the current DATABASE_URL; returns (raw key, user id).
+    raw, prefix = generate_api_key()
+    uid = f"usr_{uuid.uuid4().hex[:8]}"
+    kid = f"key_{uuid.uuid4().hex[:8]}"
+    eng = create_engine(os.environ["DATABASE_URL"], isolation_level="AUTOCOMMIT")
+    with eng.connect() as conn:
+        conn.execute(text("INSERT INTO users(id,email) VALUES (:i,:e)"), {"i": uid, "e": f"{uid}@x.z"})
+        conn.execute(
+            text(
+                "INSERT INTO api_keys(id,user_id,key_hash,key_prefix,name) VALUES (:id,:uid,:hash,:prefix,'t')"
+            ),
+            {"id": kid, "uid": uid, "hash": hash_key(raw), "prefix": prefix},
+        )
+    eng.dispose()
+    return raw, uid
+
+
 @pytest.fixture(scope="module")
 def seed_env():
     try:
@@ -28,19 +46,7 @@ def seed_env():
         cfg = Config("alembic.ini")
         command.upgrade(cfg, "head")
 
-        raw, prefix = generate_api_key()
-        uid = f"usr_{uuid.uuid4().hex[:8]}"
-        kid = f"key_{uuid.uuid4().hex[:8]}"
-        eng = create_engine(os.environ["DATABASE_URL"], isolation_level="AUTOCOMMIT")
-        with eng.connect() as conn:
-            conn.execute(text("INSERT INTO users(id,email) VALUES (:i,:e)"), {"i": uid, "e": f"{uid}@x.z"})
-            conn.execute(
-                text(
-                    "INSERT INTO api_keys(id,user_id,key_hash,key_prefix,name) VALUES (:id,:uid,:hash,:prefix,'t')"
-                ),
-                {"id": kid, "uid": uid, "hash": hash_key(raw), "prefix": prefix},
-            )
-        yield raw, uid
+        yield _create_user()
     except Exception as exc:  # pragma: no cover
         pytest.skip(f"Postgres not available: {exc}")
     finally:
@@ -54,3 +60,15 @@ def seed_env():
                 admin.dispose()
         except Exception:
             pass
+
+
+@pytest.fixture
+def make_user(seed_env):
+    # Factory for further users in the seed_env database, e.g. to check cross-owner visibility.
+    return _create_user
+
+
+@pytest.fixture
+def profile_payload():
+    # Minimal valid CreateProfile body without a name; tests add the name and any overrides.
+    return {"device_type": "desktop", "window": {"width": 10, "height": 10}, "user_agent": "UA", "country": "us"}
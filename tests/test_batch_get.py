@@ -0,0 +1,44 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.profiles.pipeline import BatchGetRequest, BatchGetValidator
+
+
+def test_given_bad_batch_when_validate_then_raises(monkeypatch):
+    monkeypatch.setattr("app.profiles.pipeline.settings.bulk_max_items", 2)
+    for req in (
+        BatchGetRequest(user_id="u", ids=[]),
+        BatchGetRequest(user_id="u", ids=["a", ""]),
+        BatchGetRequest(user_id="u", ids=["a", "b", "c"]),
+        BatchGetRequest(user_id="u", ids=["a"], fields="nope"),
+    ):
+        with pytest.raises(ValueError):
+            BatchGetValidator().validate(req)
+
+
+def test_given_ids_when_batch_get_then_found_in_order_and_missing_listed(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    base = {"device_type": "desktop", "window": {"width": 10, "height": 10}, "user_agent": "UA", "country": "us"}
+    ids = [
+        client.post("/v1/device-profiles/", json={**base, "name": f"BG{i}"}, headers={"X-API-Key": raw}).json()["id"]
+        for i in range(3)
+    ]
+    client.delete(f"/v1/device-profiles/{ids[1]}", headers={"X-API-Key": raw})
+
+    body = {"ids": [ids[2], "prof_missing", ids[0], ids[1], ids[2]]}
+    r = client.post("/v1/device-profiles:batch-get", json=body, headers={"X-API-Key": raw})
+    assert r.status_code == 200
+    out = r.json()
+    assert [x["profile"]["id"] for x in out["found"]] == [ids[2], ids[0]]
+    assert [x["etag"] for x in out["found"]] == ["1", "1"]
+    assert out["missing"] == ["prof_missing", ids[1]]
+
+    sparse = client.post(
+        "/v1/device-profiles:batch-get", json={"ids": [ids[0]], "fields": "name"}, headers={"X-API-Key": raw}
+    ).json()
+    assert sparse["found"][0]["profile"] == {"id": ids[0], "version": 1, "name": "BG0"}
+
+    bad = client.post("/v1/device-profiles:batch-get", json={"ids": []}, headers={"X-API-Key": raw})
+    assert bad.status_code == 400
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+def test_given_ops_when_batch_then_independent_results(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    b = client.post("/v1/device-profiles/", json={**profile_payload, "name": "BTB"}, headers=h).json()
+    c = client.post("/v1/device-profiles/", json={**profile_payload, "name": "BTC"}, headers=h).json()
+
+    ops = [
+        {"op": "create", "body": {**profile_payload, "name": "BTA"}},
+        {"op": "patch", "id": b["id"], "body": {"user_agent": "UA2", "version": 1}},
+        {"op": "create", "body": {**profile_payload, "name": "BTC"}},
+        {"op": "delete", "id": c["id"]},
+        {"op": "get", "id": b["id"], "fields": "user_agent"},
+        {"op": "patch", "id": b["id"], "body": {"user_agent": "UA3", "version": 1}},
+    ]
+    r = client.post("/v1/batch", json={"operations": ops}, headers=h)
+    assert r.status_code == 200
+    out = r.json()
+    assert [x["status"] for x in out["results"]] == [200, 200, 409, 200, 200, 412]
+    assert out["results"][4]["body"] == {"id": b["id"], "version": 2, "user_agent": "UA2"}
+    assert client.get(f"/v1/device-profiles/{c['id']}", headers=h).status_code == 404
+    assert client.get(f"/v1/device-profiles/{out['results'][0]['body']['id']}", headers=h).status_code == 200
+
+
+def test_given_failure_when_atomic_batch_then_rolled_back(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    ops = [
+        {"op": "create", "body": {**profile_payload, "name": "BTX"}},
+        {"op": "delete", "id": "prof_missing"},
+        {"op": "create", "body": {**profile_payload, "name": "BTY"}},
+    ]
+    r = client.post("/v1/batch", json={"operations": ops, "atomic": True}, headers=h)
+    assert r.status_code == 404
+    out = r.json()
+    assert ([x["status"] for x in out["results"]], out["committed"]) == ([424, 404, 424], False)
+    assert [x["body"]["detail"] for x in out["results"]] == ["rolled_back", "not_found", "not_executed"]
+    listed = client.get("/v1/device-profiles?q=BTX", headers=h).json()["data"]
+    assert listed == []
+
+    assert client.post("/v1/batch", json={"operations": [{"op": "nope"}]}, headers=h).status_code == 400
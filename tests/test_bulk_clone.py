@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.profiles.pipeline import BULK_CONFLICT, BULK_CREATED, BULK_INVALID, BulkCloneExecutor, BulkCloneRequest
+
+
+class _Repo:
+    def __init__(self):
+        self.overrides = None
+
+    def bulk_clone(self, owner_id, template_id, overrides):
+        self.overrides = overrides
+        return [None for _ in overrides]
+
+
+def test_given_invalid_override_when_execute_then_reported_per_item():
+    repo = _Repo()
+    out = BulkCloneExecutor(repo).execute(
+        BulkCloneRequest(owner_id="u", template_id="t", items=[{"country": "fr"}, {"country": "zz"}])
+    )
+    assert [o.country for o in repo.overrides] == ["fr"]
+    assert [r.status for r in out.results] == [BULK_CONFLICT, BULK_INVALID]
+
+
+def test_given_template_when_bulk_clone_then_copies_created(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    tmpl = client.post(
+        "/v1/device-profiles/",
+        json={
+            "name": "BCT",
+            "device_type": "desktop",
+            "window": {"width": 1920, "height": 1080},
+            "user_agent": "UA",
+            "country": "us",
+            "custom_headers": [{"key": "X-A", "value": "1"}],
+            "is_template": True,
+        },
+        headers=h,
+    ).json()
+    items = [{"name": "BCT fr", "country": "fr"}, {"name": "BCT de", "country": "de"}, {}, {}, {"name": "bct FR"}]
+    r = client.post("/v1/device-profiles:bulk-clone", json={"template_id": tmpl["id"], "items": items}, headers=h)
+    assert r.status_code == 200
+    res = r.json()["results"]
+    assert [x["status"] for x in res] == [BULK_CREATED, BULK_CREATED, BULK_CREATED, BULK_CONFLICT, BULK_CONFLICT]
+    fr = res[0]["profile"]
+    assert (fr["country"], fr["window"], fr["is_template"], fr["custom_headers"]) == (
+        "fr",
+        {"width": 1920, "height": 1080},
+        False,
+        [{"key": "x-a", "value": "1"}],
+    )
+    assert res[2]["profile"]["name"] == "BCT Copy"
+    assert client.get(f"/v1/device-profiles/{fr['id']}/versions", headers=h).json()[0]["version"] == 1
+
+    missing = client.post("/v1/device-profiles:bulk-clone", json={"template_id": "prof_nope", "items": [{}]}, headers=h)
+    assert missing.status_code == 404
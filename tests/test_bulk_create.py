@@ -0,0 +1,103 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app.main import create_app
+from app.db.models import DeviceProfileVersion
+from app.db.session import get_session
+from app.profiles.pipeline import (
+    BULK_ABORTED,
+    BULK_CONFLICT,
+    BULK_CREATED,
+    BULK_INVALID,
+    BulkCreateExecutor,
+    BulkCreateRequest,
+    BulkCreateValidator,
+)
+
+
+class _ConflictRepo:
+    # Every inserted name collides, so bulk_create returns no rows.
+    def __init__(self):
+        self.calls = []
+
+    def bulk_create(self, owner_id, items):
+        self.calls.append([d.name for d in items])
+        return [None for _ in items]
+
+
+def test_given_oversized_or_empty_batch_when_validate_then_raises(monkeypatch, profile_payload):
+    monkeypatch.setattr("app.profiles.pipeline.settings.bulk_max_items", 2)
+    with pytest.raises(ValueError):
+        BulkCreateValidator().validate(BulkCreateRequest(owner_id="u", items=[]))
+    with pytest.raises(ValueError):
+        BulkCreateValidator().validate(BulkCreateRequest(owner_id="u", items=[profile_payload, profile_payload, profile_payload]))
+
+
+def test_given_invalid_item_when_atomic_then_nothing_written(profile_payload):
+    repo = _ConflictRepo()
+    out = BulkCreateExecutor(repo).execute(
+        BulkCreateRequest(owner_id="u", items=[{**profile_payload, "name": "A"}, {**profile_payload, "name": "B", "country": "zz"}], atomic=True)
+    )
+    assert repo.calls == []
+    assert [r.status for r in out.results] == [BULK_ABORTED, BULK_INVALID]
+    assert "country" in out.results[1].error
+    assert (out.succeeded, out.failed, out.committed) == (0, 2, False)
+
+
+def test_given_invalid_item_when_not_atomic_then_valid_items_attempted(profile_payload):
+    repo = _ConflictRepo()
+    out = BulkCreateExecutor(repo).execute(
+        BulkCreateRequest(owner_id="u", items=[{**profile_payload, "name": "A"}, {"name": "B"}])
+    )
+    assert repo.calls == [["A"]]
+    assert [r.status for r in out.results] == [BULK_CONFLICT, BULK_INVALID]
+    assert out.committed
+
+
+def test_given_batch_when_bulk_create_then_profiles_and_versions_written(seed_env, profile_payload):
+    raw, uid = seed_env
+    client = TestClient(create_app())
+    items = [{**profile_payload, "name": f"BLK{i}"} for i in range(5)] + [{**profile_payload, "name": "blk0"}, {"name": "BLKX"}]
+    r = client.post("/v1/device-profiles:bulk", json={"items": items}, headers={"X-API-Key": raw})
+    assert r.status_code == 200
+    body = r.json()
+    assert [x["status"] for x in body["results"]] == [BULK_CREATED] * 5 + [BULK_CONFLICT, BULK_INVALID]
+    assert (body["succeeded"], body["failed"], body["committed"]) == (5, 2, True)
+    ids = [x["profile"]["id"] for x in body["results"][:5]]
+    assert [x["profile"]["version"] for x in body["results"][:5]] == [1] * 5
+
+    with get_session() as s:
+        n = s.execute(
+            select(func.count()).select_from(DeviceProfileVersion).where(DeviceProfileVersion.profile_id.in_(ids))
+        ).scalar_one()
+        assert n == 5
+    got = client.get(f"/v1/device-profiles/{ids[2]}", headers={"X-API-Key": raw})
+    assert got.json()["name"] == "BLK2"
+
+    facets = client.get("/v1/device-profiles:facets", headers={"X-API-Key": raw}).json()
+    assert facets["device_type"].get("desktop", 0) >= 5
+
+
+def test_given_conflict_when_atomic_then_rolled_back(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    client.post("/v1/device-profiles/", json={**profile_payload, "name": "BLKA0"}, headers={"X-API-Key": raw})
+    items = [{**profile_payload, "name": "BLKA1"}, {**profile_payload, "name": "BLKA0"}]
+    r = client.post("/v1/device-profiles:bulk", json={"items": items, "atomic": True}, headers={"X-API-Key": raw})
+    assert r.status_code == 409
+    assert [x["status"] for x in r.json()["results"]] == [BULK_ABORTED, BULK_CONFLICT]
+    listed = client.get("/v1/device-profiles?q=BLKA&limit=100", headers={"X-API-Key": raw}).json()["data"]
+    assert [p["name"] for p in listed] == ["BLKA0"]
+
+
+def test_given_idempotency_key_when_bulk_retried_then_same_result(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    headers = {"X-API-Key": raw, "Idempotency-Key": "bulk-1"}
+    items = [{**profile_payload, "name": "BLKI0"}, {**profile_payload, "name": "BLKI1"}]
+    first = client.post("/v1/device-profiles:bulk", json={"items": items}, headers=headers)
+    again = client.post("/v1/device-profiles:bulk", json={"items": items}, headers=headers)
+    assert first.status_code == again.status_code == 200
+    assert again.json() == first.json()
+    assert again.json()["succeeded"] == 2
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.sql import Select
+
+from app.main import create_app
+from app.profiles.dto import DeleteFilter
+from app.profiles.pipeline import BulkDeleteRequest, BulkDeleteValidator
+from app.profiles.repository import DeviceProfileRepository, PreconditionFailed
+
+
+def test_given_bad_bulk_delete_when_validate_then_raises(monkeypatch):
+    monkeypatch.setattr("app.profiles.pipeline.settings.bulk_max_items", 5)
+    for req in (
+        BulkDeleteRequest(owner_id="u"),
+        BulkDeleteRequest(owner_id="u", ids=["a"], filter=DeleteFilter(country="us")),
+        BulkDeleteRequest(owner_id="u", ids=[]),
+        BulkDeleteRequest(owner_id="u", filter=DeleteFilter()),
+        BulkDeleteRequest(owner_id="u", filter=DeleteFilter(country="zz")),
+        BulkDeleteRequest(owner_id="u", filter=DeleteFilter(q="abc", match="fuzzy")),
+        BulkDeleteRequest(owner_id="u", filter=DeleteFilter(country="us"), max_rows=6),
+    ):
+        with pytest.raises(ValueError):
+            BulkDeleteValidator().validate(req)
+    BulkDeleteValidator().validate(BulkDeleteRequest(owner_id="u", filter=DeleteFilter(country="US"), max_rows=5))
+
+
+def test_given_too_many_matches_when_bulk_delete_then_refused_before_update():
+    stmts = []
+
+    def execute(stmt):
+        stmts.append(stmt)
+        return SimpleNamespace(scalars=lambda: iter(["a", "b", "c"]))
+
+    repo = DeviceProfileRepository(SimpleNamespace(execute=execute))
+    with pytest.raises(PreconditionFailed):
+        repo.bulk_soft_delete("u", max_rows=2, ids=["a", "b", "c"])
+    assert len(stmts) == 1 and isinstance(stmts[0], Select)
+
+
+def test_given_filter_when_bulk_delete_then_dry_run_guard_and_delete(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    base = {"device_type": "desktop", "window": {"width": 10, "height": 10}, "user_agent": "UA"}
+    fr = [client.post("/v1/device-profiles/", json={**base, "name": f"BD{i}", "country": "fr"}, headers=h).json()["id"] for i in range(3)]
+    keep = client.post("/v1/device-profiles/", json={**base, "name": "BDX", "country": "it"}, headers=h).json()["id"]
+    before = client.get("/v1/device-profiles:facets", headers=h).json()["country"].get("fr", 0)
+
+    flt = {"country": "fr", "q": "BD"}
+    dry = client.post("/v1/device-profiles:bulk-delete", json={"filter": flt, "dry_run": True}, headers=h).json()
+    assert (dry["ids"], dry["count"], dry["dry_run"]) == (sorted(fr), 3, True)
+
+    over = client.post("/v1/device-profiles:bulk-delete", json={"filter": flt, "max_rows": 2}, headers=h)
+    assert over.status_code == 412
+    assert client.get(f"/v1/device-profiles/{fr[0]}", headers=h).status_code == 200
+
+    done = client.post("/v1/device-profiles:bulk-delete", json={"filter": flt}, headers=h).json()
+    assert done["ids"] == sorted(fr)
+    assert client.get(f"/v1/device-profiles/{fr[0]}", headers=h).status_code == 404
+    assert client.get(f"/v1/device-profiles/{keep}", headers=h).status_code == 200
+    assert client.get("/v1/device-profiles:facets", headers=h).json()["country"].get("fr", 0) == before - 3
+
+    by_id = client.post("/v1/device-profiles:bulk-delete", json={"ids": [keep, fr[0], "prof_missing"]}, headers=h).json()
+    assert by_id["ids"] == [keep]
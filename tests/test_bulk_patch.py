@@ -0,0 +1,128 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.profiles.dto import UpdateProfile
+from app.profiles.pipeline import (
+    BULK_ABORTED,
+    BULK_CONFLICT,
+    BULK_INVALID,
+    BULK_NOT_FOUND,
+    BULK_UPDATED,
+    BULK_VERSION_MISMATCH,
+    BulkPatchExecutor,
+    BulkPatchRequest,
+    BulkPatchValidator,
+)
+from app.profiles.repository import ConflictError, DeviceProfileRepository
+
+
+class _MissingRepo:
+    def __init__(self):
+        self.calls = []
+
+    def bulk_update(self, owner_id, items):
+        self.calls.append([pid for pid, _ in items])
+        return [(None, BULK_NOT_FOUND) for _ in items]
+
+
+def test_given_duplicate_ids_when_validate_then_raises():
+    with pytest.raises(ValueError):
+        BulkPatchValidator().validate(BulkPatchRequest(owner_id="u", items=[{"id": "a"}, {"id": "a"}]))
+    with pytest.raises(ValueError):
+        BulkPatchValidator().validate(BulkPatchRequest(owner_id="u", items=[]))
+
+
+def test_given_items_without_id_or_version_when_execute_then_invalid():
+    repo = _MissingRepo()
+    out = BulkPatchExecutor(repo).execute(
+        BulkPatchRequest(
+            owner_id="u",
+            items=[{"id": "a", "version": 1, "user_agent": "x"}, {"id": "b", "user_agent": "x"}, {"version": 1, "name": "n"}],
+        )
+    )
+    assert repo.calls == [["a"]]
+    assert [r.status for r in out.results] == [BULK_NOT_FOUND, BULK_INVALID, BULK_INVALID]
+
+
+def test_given_non_string_ids_when_bulk_patch_then_invalid_items():
+    items = [{"id": ["a"], "version": 1}, {"id": ["a"], "version": 1}, {"id": {"x": 1}, "version": 1}]
+    req = BulkPatchRequest(owner_id="u", items=items)
+    BulkPatchValidator().validate(req)
+    repo = _MissingRepo()
+    out = BulkPatchExecutor(repo).execute(req)
+    assert repo.calls == []
+    assert [r.status for r in out.results] == [BULK_INVALID] * 3
+
+
+def test_given_rename_collision_when_bulk_update_then_only_that_item_conflicts(monkeypatch):
+    repo = DeviceProfileRepository(SimpleNamespace())
+    cols = dict(owner_id="u", version=1, device_type="desktop", width=1, height=1, user_agent="ua", country="us",
+                custom_headers=None, is_template=False, visibility="private")
+    rows = {pid: SimpleNamespace(id=pid, name=pid, **cols) for pid in "abc"}
+    chunks = []
+
+    def update_from_values(vals, owner_id):
+        chunks.append([v["id"] for v in vals])
+        if any(v["id"] == "b" for v in vals):
+            raise ConflictError("uniq_owner_name_not_deleted")
+        return [SimpleNamespace(**{**vars(rows[v["id"]]), "version": 2}) for v in vals]
+
+    monkeypatch.setattr(repo, "get_owned_rows", lambda owner_id, ids: list(rows.values()))
+    monkeypatch.setattr(repo, "_update_from_values", update_from_values)
+    monkeypatch.setattr(repo, "_add_versions", lambda entries: None)
+    monkeypatch.setattr("app.profiles.repository.build_snapshot", lambda r: {})
+    monkeypatch.setattr("app.profiles.repository.bump", lambda session, deltas: None)
+    out = repo.bulk_update("u", [(pid, UpdateProfile(version=1, user_agent="x")) for pid in "abc"])
+    assert chunks == [["a", "b", "c"], ["a"], ["b"], ["c"]]
+    assert [(r.id if r else None, reason) for r, reason in out] == [("a", None), (None, BULK_CONFLICT), ("c", None)]
+
+
+def test_given_items_when_bulk_patch_then_per_item_version_checks(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    ids = [client.post("/v1/device-profiles/", json={**profile_payload, "name": f"BP{i}"}, headers=h).json()["id"] for i in range(3)]
+
+    items = [
+        {"id": ids[0], "version": 1, "user_agent": "UA2", "device_type": "mobile"},
+        {"id": ids[1], "version": 7, "user_agent": "UA2"},
+        {"id": "prof_missing", "version": 1, "user_agent": "UA2"},
+        {"id": ids[2], "version": 1, "custom_headers": [{"key": "X-A", "value": "1"}]},
+    ]
+    r = client.patch("/v1/device-profiles:bulk", json={"items": items}, headers=h)
+    assert r.status_code == 200
+    body = r.json()
+    assert [x["status"] for x in body["results"]] == [BULK_UPDATED, BULK_VERSION_MISMATCH, BULK_NOT_FOUND, BULK_UPDATED]
+    assert body["results"][0]["profile"]["version"] == 2
+
+    got = client.get(f"/v1/device-profiles/{ids[0]}", headers=h).json()
+    assert (got["user_agent"], got["device_type"], got["version"], got["name"]) == ("UA2", "mobile", 2, "BP0")
+    versions = client.get(f"/v1/device-profiles/{ids[0]}/versions", headers=h).json()
+    assert [v["version"] for v in versions] == [1, 2]
+    assert client.get(f"/v1/device-profiles/{ids[0]}/versions/1", headers=h).json()["user_agent"] == "UA"
+    assert client.get(f"/v1/device-profiles/{ids[1]}", headers=h).json()["version"] == 1
+
+    atomic = client.patch(
+        "/v1/device-profiles:bulk",
+        json={"items": [{"id": ids[1], "version": 1, "user_agent": "UA3"}, {"id": ids[0], "version": 1, "user_agent": "UA3"}], "atomic": True},
+        headers=h,
+    )
+    assert atomic.status_code == 412
+    assert [x["status"] for x in atomic.json()["results"]] == [BULK_ABORTED, BULK_VERSION_MISMATCH]
+    assert client.get(f"/v1/device-profiles/{ids[1]}", headers=h).json()["user_agent"] == "UA"
+
+    clash = client.patch(
+        "/v1/device-profiles:bulk",
+        json={"items": [{"id": ids[1], "version": 1, "name": "BP2"}, {"id": ids[2], "version": 2, "user_agent": "UA4"}]},
+        headers=h,
+    )
+    assert clash.status_code == 200
+    assert [x["status"] for x in clash.json()["results"]] == [BULK_CONFLICT, BULK_UPDATED]
+    assert client.get(f"/v1/device-profiles/{ids[2]}", headers=h).json()["user_agent"] == "UA4"
+    assert client.get(f"/v1/device-profiles/{ids[1]}", headers=h).json()["name"] == "BP1"
+
+    clash = client.patch("/v1/device-profiles:bulk", json={"items": [{"id": ids[1], "version": 1, "name": "BP2"}], "atomic": True}, headers=h)
+    assert clash.status_code == 409
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from app.db.models import DeviceType
+from app.main import create_app
+from app.profiles.fingerprint import content_hash
+
+
+def _content(**kw):
+    vals = {"device_type": DeviceType.desktop, "width": 10, "height": 10, "user_agent": "UA", "country": "us", "custom_headers": None}
+    return {**vals, **kw}
+
+
+def test_given_equivalent_content_when_hash_then_equal():
+    h = content_hash(_content())
+    assert content_hash(_content(device_type="desktop", custom_headers={})) == h
+    assert content_hash(_content(name="other", is_template=True)) == h
+    assert content_hash(_content(custom_headers={"a": "1", "b": "2"})) == content_hash(_content(custom_headers={"b": "2", "a": "1"}))
+    assert content_hash(_content(width=11)) != h
+    assert content_hash(_content(custom_headers={"a": "1"})) != h
+
+
+def test_given_same_content_when_create_with_dedupe_then_existing_returned(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    body = {**profile_payload, "custom_headers": [{"key": "X-A", "value": "1"}, {"key": "X-B", "value": "2"}]}
+    first = client.post("/v1/device-profiles/", json={**body, "name": "DUP1"}, headers=h).json()
+
+    swapped = {**body, "name": "DUP2", "custom_headers": list(reversed(body["custom_headers"]))}
+    again = client.post("/v1/device-profiles/?dedupe=true", json=swapped, headers=h)
+    assert (again.status_code, again.json()["id"], again.json()["name"]) == (200, first["id"], "DUP1")
+    assert again.headers["X-Deduplicated"] == "true"
+
+    plain = client.post("/v1/device-profiles/", json=swapped, headers=h).json()
+    assert plain["id"] != first["id"]
+
+    new = client.post("/v1/device-profiles/?dedupe=true", json={**body, "name": "DUP3", "country": "de"}, headers=h)
+    assert new.headers["X-Deduplicated"] == "false"
+    other = new.json()
+    assert other["id"] not in (first["id"], plain["id"])
+
+    # A patch moves the profile's fingerprint along with its content.
+    client.patch(f"/v1/device-profiles/{other['id']}", json={"country": "fr", "version": 1}, headers=h)
+    fr = client.post("/v1/device-profiles/?dedupe=true", json={**body, "name": "DUP4", "country": "fr"}, headers=h).json()
+    assert fr["id"] == other["id"]
+    de = client.post("/v1/device-profiles/?dedupe=true", json={**body, "name": "DUP5", "country": "de"}, headers=h).json()
+    assert de["id"] != other["id"]
+
+
+def test_given_template_with_same_content_when_create_with_dedupe_then_not_matched(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    body = {**profile_payload, "user_agent": "UA-TMPL"}
+    tmpl = client.post("/v1/device-profiles/", json={**body, "name": "DUPT", "is_template": True}, headers=h).json()
+
+    plain = client.post("/v1/device-profiles/?dedupe=true", json={**body, "name": "DUPP"}, headers=h)
+    assert plain.headers["X-Deduplicated"] == "false"
+    assert plain.json()["id"] != tmpl["id"] and plain.json()["is_template"] is False
+
+    again = client.post("/v1/device-profiles/?dedupe=true", json={**body, "name": "DUPT2", "is_template": True}, headers=h)
+    assert (again.headers["X-Deduplicated"], again.json()["id"]) == ("true", tmpl["id"])
+    shared = client.post(
+        "/v1/device-profiles/?dedupe=true", json={**body, "name": "DUPG", "is_template": True, "visibility": "global"}, headers=h
+    )
+    assert shared.headers["X-Deduplicated"] == "false"
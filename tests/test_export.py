@@ -0,0 +1,62 @@
+import gzip
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.profiles.export import iter_ndjson
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+class _Session:
+    def __init__(self):
+        self.options = None
+
+    def connection(self, execution_options=None):
+        self.options = execution_options
+
+    def rollback(self):
+        pass
+
+
+def _rows(n):
+    return [SimpleNamespace(id=f"p{i}", version=1, name=f"N{i}") for i in range(n)]
+
+
+def test_given_rows_when_iter_ndjson_then_chunked_lines_from_one_snapshot(monkeypatch):
+    sess = _Session()
+
+    @contextmanager
+    def factory():
+        yield sess
+
+    monkeypatch.setattr(DeviceProfileRepository, "iter_export", lambda self, uid, f, n: iter(_rows(5)))
+    chunks = list(iter_ndjson(factory, "u", ListFilters(fields=("name",)), batch_size=2))
+    assert len(chunks) == 3
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(x) for x in lines][4] == {"id": "p4", "version": 1, "name": "N4"}
+    assert sess.options == {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+
+    zipped = b"".join(iter_ndjson(factory, "u", ListFilters(fields=("name",)), batch_size=2, gzip=True))
+    assert gzip.decompress(zipped).splitlines() == lines
+
+
+def test_given_catalog_when_export_then_all_rows_streamed(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    base = {"device_type": "desktop", "window": {"width": 10, "height": 10}, "user_agent": "UA", "country": "es"}
+    ids = [client.post("/v1/device-profiles/", json={**base, "name": f"EXP{i}"}, headers=h).json()["id"] for i in range(5)]
+
+    r = client.get("/v1/device-profiles:export?country=es&q=EXP", headers=h)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(x) for x in r.text.splitlines()]
+    assert [p["id"] for p in rows] == sorted(ids)
+
+    z = client.get("/v1/device-profiles:export?country=es&q=EXP&fields=name&gzip=true", headers=h)
+    assert [json.loads(x)["name"] for x in z.text.splitlines()] == [f"EXP{i}" for i in range(5)]
+
+    assert client.get("/v1/device-profiles:export?country=zz", headers=h).status_code == 400
@@ -0,0 +1,47 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import create_app
+from app.db.models import DeviceType
+from app.db.session import get_session
+from app.profiles.dto import CloneFromTemplate, CloneOverrides, CreateProfile, UpdateProfile, Window
+from app.profiles.facets import bump, change, reconcile
+from app.profiles.repository import DeviceProfileRepository
+
+
+def test_given_same_key_when_change_then_nets_to_zero():
+    k = ("u", DeviceType.desktop, "us", False)
+    k2 = ("u", DeviceType.mobile, "us", False)
+    assert change(k, k) == {k: 0}
+    assert change(k, k2) == {k: -1, k2: 1}
+    assert change(None, k) == {k: 1}
+    bump(None, {k: 0})  # nothing to write, session untouched
+
+
+def test_given_writes_when_facets_then_counters_follow(seed_env):
+    raw, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s)
+        base = dict(window=Window(width=10, height=10), user_agent="ua")
+        a = repo.create(uid, CreateProfile(name="FA", device_type=DeviceType.desktop, country="us", **base))
+        b = repo.create(uid, CreateProfile(name="FB", device_type=DeviceType.desktop, country="gb", is_template=True, **base))
+        repo.clone_from_template(uid, CloneFromTemplate(template_id=b.id, overrides=CloneOverrides(name="FC")))
+        repo.update_optimistic(uid, a.id, UpdateProfile(device_type=DeviceType.mobile, version=1))
+        repo.update_optimistic(uid, a.id, UpdateProfile(name="FA2", version=2))
+        repo.soft_delete(uid, b.id)
+        s.commit()
+        f = repo.facets(uid)
+        assert f.total == 2
+        assert f.device_type == {"mobile": 1, "desktop": 1}
+        assert f.country == {"us": 1, "gb": 1}
+        assert f.is_template == {"false": 2}
+
+        assert reconcile(s) == 0
+        s.execute(text("UPDATE device_profile_facets SET count = count + 5 WHERE owner_id = :u"), {"u": uid})
+        assert reconcile(s, uid) > 0
+        s.commit()
+        assert repo.facets(uid).total == 2
+
+    r = TestClient(create_app()).get("/v1/device-profiles:facets", headers={"X-API-Key": raw})
+    assert r.status_code == 200
+    assert r.json()["total"] == 2
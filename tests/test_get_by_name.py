@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+def test_given_name_when_get_by_name_then_own_profile_before_global_template(seed_env, make_user, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    tmpl = {**profile_payload, "name": "Shared Name", "is_template": True, "visibility": "global"}
+    tid = client.post("/v1/device-profiles/", json=tmpl, headers=h).json()["id"]
+
+    h2 = {"X-API-Key": make_user()[0]}
+    r = client.get("/v1/device-profiles/by-name/shared%20name", headers=h2)
+    assert (r.status_code, r.json()["id"], r.headers["ETag"]) == (200, tid, "1")
+
+    own = client.post("/v1/device-profiles/", json={**profile_payload, "name": "SHARED NAME"}, headers=h2).json()["id"]
+    r = client.get("/v1/device-profiles/by-name/Shared Name?fields=name", headers=h2)
+    assert r.json() == {"id": own, "version": 1, "name": "SHARED NAME"}
+
+    cached = client.get("/v1/device-profiles/by-name/Shared Name", headers={**h2, "If-None-Match": "1"})
+    assert cached.status_code == 304
+
+    assert client.get("/v1/device-profiles/by-name/Shared", headers=h2).status_code == 404
+    assert client.get("/v1/device-profiles/by-name/Shared Name?fields=nope", headers=h2).status_code == 400
@@ -0,0 +1,51 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+
+from app.main import create_app
+from app.db.explain import explain, uses_index
+from app.db.models import DeviceProfile
+from app.db.session import get_session
+from app.profiles.pipeline import ListRequest, ListRequestTransformer, ListValidator
+
+
+def test_given_header_filters_when_transform_then_normalized():
+    out = ListRequestTransformer().transform(ListRequest(user_id="u", has_header=" X-Shard ", header="Accept-Language: en-US"))
+    assert out.has_header == "x-shard"
+    assert out.header_eq == ("accept-language", "en-US")
+
+
+def test_given_malformed_header_filter_when_validate_then_raises():
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", header="no-separator"))
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", has_header="  "))
+
+
+def test_given_profiles_with_headers_when_list_by_header_then_filtered(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    base = {"device_type": "desktop", "window": {"width": 10, "height": 10}, "user_agent": "UA", "country": "us"}
+    client.post("/v1/device-profiles/", json={**base, "name": "HDR1", "custom_headers": [{"key": "X-Team", "value": "red"}]}, headers={"X-API-Key": raw})
+    client.post("/v1/device-profiles/", json={**base, "name": "HDR2", "custom_headers": [{"key": "x-team", "value": "blue"}]}, headers={"X-API-Key": raw})
+    client.post("/v1/device-profiles/", json={**base, "name": "HDR3"}, headers={"X-API-Key": raw})
+
+    r = client.get("/v1/device-profiles?has_header=X-Team&limit=100", headers={"X-API-Key": raw})
+    assert r.status_code == 200
+    assert {"HDR1", "HDR2"} <= {p["name"] for p in r.json()["data"]}
+    assert "HDR3" not in {p["name"] for p in r.json()["data"]}
+
+    r2 = client.get("/v1/device-profiles?header=x-team:red&limit=100", headers={"X-API-Key": raw})
+    assert [p["name"] for p in r2.json()["data"]] == ["HDR1"]
+
+    r3 = client.get("/v1/device-profiles?header=x-team", headers={"X-API-Key": raw})
+    assert r3.status_code == 400
+
+
+def test_given_gin_index_when_header_contains_then_index_usable(seed_env):
+    with get_session() as s:
+        s.execute(text("SET LOCAL enable_seqscan = off"))
+        stmt = select(DeviceProfile.id).where(
+            DeviceProfile.deleted_at.is_(None), DeviceProfile.custom_headers.contains({"x-team": "red"})
+        )
+        assert uses_index(explain(s, stmt), "idx_profiles_headers")
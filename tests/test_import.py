@@ -0,0 +1,124 @@
+import json
+from types import SimpleNamespace
+
+import psycopg
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.main import create_app
+from app.profiles.dto import CreateProfile
+from app.profiles.importer import LineSplitter, NdjsonImporter
+from app.profiles.repository import create_values
+
+
+class _Repo:
+    # Every staged row except the first one collides on name.
+    def __init__(self, fail_merges=0, fail_stages=0):
+        self.session = SimpleNamespace(commit=lambda: None, rollback=lambda: self.rollbacks.append(1))
+        self.staged = []
+        self.rollbacks = []
+        self.fail_merges = fail_merges
+        self.fail_stages = fail_stages
+
+    def stage_import(self, rows):
+        if self.fail_stages:
+            self.fail_stages -= 1
+            raise psycopg.DataError("PostgreSQL text fields cannot contain NUL (0x00) bytes")
+        self.staged = list(rows)
+
+    def merge_staged(self, owner_id):
+        if self.fail_merges:
+            self.fail_merges -= 1
+            raise OperationalError("INSERT", {}, Exception("connection reset"))
+        return [SimpleNamespace(id=self.staged[0][1])]
+
+
+def test_given_chunks_when_split_then_lines_rejoined():
+    sp = LineSplitter()
+    assert sp.feed(b'{"a":1}\n{"b"') == [b'{"a":1}']
+    assert sp.feed(b":2}\n\n{") == [b'{"b":2}', b""]
+    assert sp.close() == [b"{"]
+
+
+def test_given_lines_when_load_then_invalid_and_conflicts_reported(profile_payload):
+    repo = _Repo()
+    imp = NdjsonImporter(repo, "u")
+    imp.load(
+        [
+            (1, json.dumps({**profile_payload, "name": "A"}).encode()),
+            (2, b"not json"),
+            (3, b"  "),
+            (4, json.dumps({**profile_payload, "name": "B", "custom_headers": [{"key": "X-A", "value": "1"}]}).encode()),
+        ]
+    )
+    assert [r[0] for r in repo.staged] == [1, 4]
+    assert repo.staged[1][3] == "desktop" and repo.staged[1][8] == '{"x-a": "1"}'
+    assert repo.staged[0][11] == create_values(CreateProfile(**profile_payload, name="other"))["content_hash"]
+    assert repo.staged[0][11] != repo.staged[1][11]
+    r = imp.result
+    assert (r.received, r.created, r.failed) == (3, 1, 2)
+    assert [(e.line, e.error) for e in r.errors][1] == (4, "name already exists")
+    assert r.errors[0].line == 2
+
+
+def test_given_failing_batch_when_load_then_reported_and_later_batches_load(profile_payload):
+    repo = _Repo(fail_merges=1)
+    imp = NdjsonImporter(repo, "u")
+    imp.load([(1, json.dumps({**profile_payload, "name": "A"}).encode()), (2, json.dumps({**profile_payload, "name": "B"}).encode())])
+    imp.load([(3, json.dumps({**profile_payload, "name": "C"}).encode())])
+    r = imp.result
+    assert (r.received, r.created, r.failed, len(repo.rollbacks)) == (3, 1, 2, 1)
+    assert [(e.line, e.error) for e in r.errors] == [(1, "batch_failed"), (2, "batch_failed")]
+
+
+def test_given_failing_copy_when_load_then_reported_and_later_batches_load(profile_payload):
+    repo = _Repo(fail_stages=1)
+    imp = NdjsonImporter(repo, "u")
+    imp.load([(1, json.dumps({**profile_payload, "name": "A"}).encode())])
+    imp.load([(2, json.dumps({**profile_payload, "name": "B"}).encode())])
+    r = imp.result
+    assert (r.received, r.created, r.failed, len(repo.rollbacks)) == (2, 1, 1, 1)
+    assert [(e.line, e.error) for e in r.errors] == [(1, "batch_failed")]
+
+
+def test_given_many_bad_lines_when_load_then_errors_capped():
+    imp = NdjsonImporter(_Repo(), "u", max_errors=2)
+    imp.load([(i, b"not json") for i in range(1, 6)])
+    r = imp.result
+    assert (r.failed, [e.line for e in r.errors], r.errors_omitted) == (5, [1, 2], 3)
+
+
+def test_given_ndjson_body_when_import_then_profiles_created(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw, "Content-Type": "application/x-ndjson"}
+    lines = [json.dumps({**profile_payload, "name": f"IMP{i}", "country": "gb"}) for i in range(20)]
+    lines.insert(5, json.dumps({**profile_payload, "name": "IMP0"}))
+    lines.insert(7, '{"name": "broken"}')
+
+    r = client.post("/v1/device-profiles:import", content="\n".join(lines) + "\n", headers=h)
+    assert r.status_code == 200
+    out = r.json()
+    assert (out["received"], out["created"], out["failed"]) == (22, 20, 2)
+    assert sorted(e["line"] for e in out["errors"]) == [6, 8]
+
+    listed = client.get("/v1/device-profiles?q=IMP&limit=100", headers={"X-API-Key": raw}).json()["data"]
+    assert len(listed) == 20
+    pid = listed[0]["id"]
+    assert client.get(f"/v1/device-profiles/{pid}/versions", headers={"X-API-Key": raw}).json()[0]["version"] == 1
+
+
+def test_given_nul_byte_when_import_then_batch_failed_and_rest_loaded(seed_env, monkeypatch, profile_payload):
+    raw, _ = seed_env
+    monkeypatch.setattr(settings, "import_batch_size", 2)
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw, "Content-Type": "application/x-ndjson"}
+    lines = [json.dumps({**profile_payload, "name": f"NUL{i}"}) for i in range(4)]
+    lines[1] = json.dumps({**profile_payload, "name": "NUL\u0000bad"})
+
+    r = client.post("/v1/device-profiles:import", content="\n".join(lines) + "\n", headers=h)
+    assert r.status_code == 200
+    out = r.json()
+    assert (out["received"], out["created"], out["failed"]) == (4, 2, 2)
+    assert [(e["line"], e["error"]) for e in out["errors"]] == [(1, "batch_failed"), (2, "batch_failed")]
@@ -0,0 +1,79 @@
+import base64
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.db.explain import explain, uses_index
+from app.db.models import DeviceType
+from app.db.session import get_session
+from app.profiles.dto import CreateProfile, UpdateProfile, Window
+from app.profiles.pipeline import ListExecutor, ListRequest, ListRequestTransformer, ListValidator
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+def _legacy(iso, pid):
+    return base64.b64encode(f"{iso}|{pid}".encode()).decode()
+
+
+def test_given_sort_cursor_when_transform_then_decoded_per_sort():
+    t = ListRequestTransformer()
+    tok = base64.b64encode(json.dumps({"s": "name", "k": ["abc", "p1"]}).encode()).decode()
+    assert t.transform(ListRequest(user_id="u", sort="name", cursor=tok)).cursor_decoded == ("abc", "p1")
+    legacy = t.transform(ListRequest(user_id="u", cursor=_legacy("2024-01-01T00:00:00+00:00", "p1")))
+    assert legacy.cursor_decoded[1] == "p1"
+    with pytest.raises(ValueError):
+        t.transform(ListRequest(user_id="u", sort="-updated_at", cursor=tok))
+    with pytest.raises(ValueError):
+        t.transform(ListRequest(user_id="u", sort="name", cursor=_legacy("2024-01-01T00:00:00+00:00", "p1")))
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", sort="width"))
+
+
+def _walk(repo, uid, sort):
+    out, cursor = [], None
+    while True:
+        req = ListRequestTransformer().transform(ListRequest(user_id=uid, sort=sort, limit=2, is_template=False, cursor=cursor))
+        resp = ListExecutor(repo).execute(req)
+        out += [p.name for p in resp.data]
+        cursor = resp.next_cursor
+        if cursor is None:
+            return out
+
+
+def test_given_sorts_when_paging_then_ordered_without_gaps(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s)
+        made = []
+        for n in ("delta", "Alpha", "charlie", "Bravo", "echo"):
+            made.append(repo.create(uid, CreateProfile(name=n, device_type=DeviceType.desktop, window=Window(width=1, height=1), user_agent="ua", country="us")))
+            s.commit()
+        repo.update_optimistic(uid, made[2].id, UpdateProfile(user_agent="ua2", version=1))
+        s.commit()
+
+        assert _walk(repo, uid, "name") == ["Alpha", "Bravo", "charlie", "delta", "echo"]
+        assert _walk(repo, uid, "created_at") == ["delta", "Alpha", "charlie", "Bravo", "echo"]
+        assert _walk(repo, uid, "-created_at") == ["echo", "Bravo", "charlie", "Alpha", "delta"]
+        assert _walk(repo, uid, "-updated_at")[0] == "charlie"
+        assert _walk(repo, uid, "id") == ["delta", "Alpha", "charlie", "Bravo", "echo"]
+
+
+@pytest.mark.parametrize(
+    "sort,owner_idx,tmpl_idx",
+    [
+        ("created_at", "idx_profiles_owner_created", "idx_profiles_global_tmpl_created"),
+        ("-created_at", "idx_profiles_owner_created", "idx_profiles_global_tmpl_created"),
+        ("-updated_at", "idx_profiles_owner_updated", "idx_profiles_global_tmpl_updated"),
+        ("name", "idx_profiles_owner_name", "idx_profiles_global_tmpl_name"),
+        ("id", "idx_profiles_owner_id", "idx_profiles_global_tmpl_id"),
+    ],
+)
+def test_given_sort_when_explain_then_matching_indexes_used(seed_env, sort, owner_idx, tmpl_idx):
+    _, uid = seed_env
+    with get_session() as s:
+        s.execute(text("SET LOCAL enable_seqscan = off"))
+        s.execute(text("SET LOCAL enable_sort = off"))
+        plan = explain(s, DeviceProfileRepository(s)._page_query(uid, ListFilters(sort=sort)))
+        assert uses_index(plan, owner_idx)
+        assert uses_index(plan, tmpl_idx)
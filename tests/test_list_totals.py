@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.db.models import DeviceType
+from app.db.session import get_session
+from app.profiles.dto import CreateProfile, Window
+from app.profiles.pipeline import ListExecutor, ListRequest
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+class _FakeRepo:
+    def __init__(self):
+        self.counted = 0
+
+    def list_scoped_page(self, user_id, filters):
+        return [], None
+
+    def count_scoped(self, user_id, filters, exact_limit):
+        self.counted += 1
+        return 3, True
+
+
+def test_given_with_total_when_execute_then_count_attached():
+    repo = _FakeRepo()
+    out = ListExecutor(repo).execute(ListRequest(user_id="u", with_total=True))
+    assert (out.total, out.total_exact) == (3, True)
+    assert ListExecutor(repo).execute(ListRequest(user_id="u")).total is None
+    assert repo.counted == 1
+
+
+def test_given_session_factory_when_execute_then_count_uses_own_session(monkeypatch):
+    opened = []
+
+    @contextmanager
+    def factory():
+        opened.append(True)
+        yield None
+
+    monkeypatch.setattr("app.profiles.pipeline.DeviceProfileRepository", lambda session: _FakeRepo())
+    out = ListExecutor(_FakeRepo(), factory).execute(ListRequest(user_id="u", with_total=True))
+    assert opened == [True]
+    assert out.total == 3
+
+
+def test_given_profiles_when_count_scoped_then_exact_or_estimated(seed_env):
+    raw, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s)
+        for i in range(5):
+            repo.create(
+                uid,
+                CreateProfile(name=f"TOT{i}", device_type=DeviceType.desktop, window=Window(width=10, height=10), user_agent="ua", country="us"),
+            )
+        s.commit()
+        assert repo.count_scoped(uid, ListFilters(is_template=False), exact_limit=100) == (5, True)
+        n, exact = repo.count_scoped(uid, ListFilters(is_template=False), exact_limit=2)
+        assert exact is False and n > 2
+
+    r = TestClient(create_app()).get("/v1/device-profiles?with_total=true&is_template=false&limit=2", headers={"X-API-Key": raw})
+    assert r.status_code == 200
+    assert r.json()["total"] == 5 and r.json()["total_exact"] is True
+    assert len(r.json()["data"]) == 2
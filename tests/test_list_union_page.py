@@ -0,0 +1,49 @@
+from sqlalchemy import text
+
+from app.db.explain import explain, uses_index
+from app.db.models import DeviceType, Visibility
+from app.db.session import get_session
+from app.profiles.dto import CreateProfile, Window
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+def _mk(repo, uid, name, **kw):
+    return repo.create(
+        uid,
+        CreateProfile(name=name, device_type=DeviceType.desktop, window=Window(width=10, height=10), user_agent="ua", country="us", **kw),
+    )
+
+
+def test_given_owned_and_global_templates_when_paging_then_each_row_once(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        s.execute(text("INSERT INTO users(id,email) VALUES ('usr_other_u','other_u@x.z') ON CONFLICT DO NOTHING"))
+        repo = DeviceProfileRepository(s)
+        own = {_mk(repo, uid, f"UP{i}").id for i in range(5)}
+        own.add(_mk(repo, uid, "UPT", is_template=True, visibility=Visibility.global_).id)
+        other = _mk(repo, "usr_other_u", "UPG", is_template=True, visibility=Visibility.global_).id
+        hidden = _mk(repo, "usr_other_u", "UPH").id
+        s.commit()
+
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = repo.list_scoped_page(uid, ListFilters(limit=2, cursor=cursor))
+            seen.extend(r.id for r in rows)
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen))
+        assert own | {other} <= set(seen)
+        assert hidden not in seen
+
+        only_own, _ = repo.list_scoped_page(uid, ListFilters(limit=100, is_template=False))
+        assert other not in {r.id for r in only_own}
+
+
+def test_given_branches_when_explain_then_composite_indexes_used(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        s.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = explain(s, DeviceProfileRepository(s)._page_query(uid, ListFilters(limit=20)))
+        assert uses_index(plan, "idx_profiles_owner_created")
+        assert uses_index(plan, "idx_profiles_global_tmpl_created")
@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import select, text
+
+from app.db.explain import explain, iter_nodes, uses_index
+from app.db.models import DeviceProfile, DeviceType
+from app.db.session import get_session
+from app.profiles.dto import CreateProfile, Window
+from app.profiles.pipeline import ListRequest, ListRequestTransformer, ListValidator
+from app.profiles.repository import MATCH_CONTAINS, MATCH_FUZZY, DeviceProfileRepository, ListFilters
+
+
+def test_given_unknown_or_fuzzy_without_q_when_validate_then_raises():
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", q="x", match="regex"))
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", match="fuzzy"))
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", q="x", match="fuzzy", cursor="abc"))
+    ListValidator().validate(ListRequest(user_id="u", q="x", match=" Contains "))
+    assert ListRequestTransformer().transform(ListRequest(user_id="u", match=" Fuzzy ")).match == "fuzzy"
+
+
+def test_given_wildcards_in_q_when_compile_then_escaped():
+    stmt = DeviceProfileRepository._apply_filters(select(DeviceProfile.id), ListFilters(q="50%_Off", match=MATCH_CONTAINS))
+    assert stmt.compile().params["lower_1"] == "%50\\%\\_off%"
+
+
+def _mk(repo, uid, name):
+    return repo.create(
+        uid, CreateProfile(name=name, device_type=DeviceType.desktop, window=Window(width=10, height=10), user_agent="ua", country="us")
+    )
+
+
+def test_given_names_when_search_modes_then_matched(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s)
+        for n in ("Chrome Desktop", "Desktop Firefox", "50% Off Chrome", "500 Offers"):
+            _mk(repo, uid, n)
+        s.commit()
+
+        def names(**kw):
+            rows, _ = repo.list_scoped_page(uid, ListFilters(limit=100, **kw))
+            return [r.name for r in rows]
+
+        assert names(q="chrome") == ["Chrome Desktop"]
+        assert set(names(q="DESKTOP", match=MATCH_CONTAINS)) == {"Chrome Desktop", "Desktop Firefox"}
+        assert names(q="50%", match=MATCH_CONTAINS) == ["50% Off Chrome"]
+        assert names(q="desktop firefx", match=MATCH_FUZZY)[0] == "Desktop Firefox"
+
+
+def test_given_name_indexes_when_explain_then_used(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        s.execute(text("SET LOCAL enable_seqscan = off"))
+        s.execute(text("SET LOCAL enable_indexscan = off"))
+        repo = DeviceProfileRepository(s)
+        prefix = explain(s, repo._page_query(uid, ListFilters(q="chr", is_template=False)))
+        assert uses_index(prefix, "idx_profiles_name_prefix")
+        contains = explain(s, repo._page_query(uid, ListFilters(q="desk", match=MATCH_CONTAINS, is_template=False)))
+        assert uses_index(contains, "idx_profiles_name_trgm")
+        # The owner predicate is answered inside the trigram index, not filtered afterwards.
+        trgm = [n for n in iter_nodes(contains) if n.get("Index Name") == "idx_profiles_name_trgm"]
+        assert all("owner_id" in n["Index Cond"] for n in trgm)
@@ -0,0 +1,32 @@
+import re
+from unittest import mock
+
+from app.profiles import ids
+from app.profiles.ids import new_profile_id, new_ulid
+
+
+def test_given_ids_when_generated_then_prefixed_and_strictly_increasing():
+    out = [new_profile_id() for _ in range(5000)]
+    assert all(re.fullmatch(r"prof_[0-9a-hjkmnp-tv-z]{26}", i) for i in out)
+    assert out == sorted(out)
+    assert len(set(out)) == len(out)
+
+
+def test_given_clock_behind_when_generated_then_still_increasing():
+    first = new_ulid()
+    with mock.patch.object(ids.time, "time_ns", return_value=0):
+        second = new_ulid()
+    assert second > first
+
+
+def test_given_random_part_exhausted_when_generated_then_moves_to_next_ms():
+    # Both generator globals are patched so the bumped millisecond does not leak into later tests.
+    ms = 1_700_000_000_000
+    with (
+        mock.patch.object(ids, "_last_ms", ms),
+        mock.patch.object(ids, "_last_rand", (1 << 80) - 1),
+        mock.patch.object(ids.time, "time_ns", return_value=0),
+    ):
+        nxt = new_ulid()
+    assert nxt[:10] == ids._encode(ms + 1, 10)
+
@@ -0,0 +1,36 @@
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.models import DeviceProfile, DeviceType, Visibility
+from app.db.session import get_session
+from app.profiles.dto import CreateProfile, ProfileResponse, Window
+from app.profiles.repository import PROFILE_COLUMNS, DeviceProfileRepository, ListFilters, NotFoundError
+
+
+def test_given_row_when_from_row_then_same_as_from_model():
+    now = datetime.now(timezone.utc)
+    vals = dict(
+        id="prof_r", owner_id="u", name="N", device_type=DeviceType.mobile, width=3, height=4, user_agent="ua",
+        country="us", custom_headers={"x-a": "1"}, content_hash="h", is_template=True, visibility=Visibility.global_, version=2,
+        created_at=now, updated_at=now, deleted_at=None,
+    )
+    row = namedtuple("Row", PROFILE_COLUMNS)(**vals)
+    assert ProfileResponse.from_row(row) == ProfileResponse.from_model(DeviceProfile(**vals))
+    assert ProfileResponse.from_row(row._replace(custom_headers=None)).custom_headers is None
+
+
+def test_given_read_paths_when_called_then_identity_map_untouched(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s)
+        pid = repo.create(uid, CreateProfile(name="ROW1", device_type=DeviceType.desktop, window=Window(width=1, height=1), user_agent="ua", country="us")).id
+        s.commit()
+        s.expunge_all()
+        row = repo.get_scoped_row(uid, pid)
+        rows, _ = repo.list_scoped_page(uid, ListFilters(limit=10))
+        assert row.name == "ROW1" and pid in {r.id for r in rows}
+        assert len(s.identity_map) == 0
+        with pytest.raises(NotFoundError):
+            repo.get_scoped_row(uid, "prof_missing")
@@ -1,7 +1,7 @@
 from sqlalchemy import select
 
 from app.db.models import DeviceProfile
-from app.db.scoping import scope_profiles
+from app.db.scoping import scope_global_templates, scope_owned, scope_profiles
 
 
 def test_given_include_templates_when_scope_then_conditions_include_global_templates():
@@ -16,4 +16,15 @@ def test_given_exclude_templates_when_scope_then_only_owner():
     q = select(DeviceProfile)
     scoped = scope_profiles(q, user_id="u1", include_templates=False)
     sql = str(scoped)
-    assert "owner_id" in sql
\ No newline at end of file
+    assert "owner_id" in sql
+
+def test_given_owner_branch_when_scope_owned_then_no_template_clause():
+    sql = str(scope_owned(select(DeviceProfile), user_id="u1"))
+    assert "owner_id =" in sql
+    assert "visibility =" not in sql.split("WHERE", 1)[1]
+
+
+def test_given_template_branch_when_scope_global_templates_then_excludes_own_rows():
+    sql = str(scope_global_templates(select(DeviceProfile), user_id="u1"))
+    assert "is_template IS true" in sql
+    assert "owner_id !=" in sql
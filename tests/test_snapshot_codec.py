@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import select
+
+from app.db.session import get_session
+from app.db.models import DeviceProfileVersion, DeviceType
+from app.profiles.dto import CreateProfile, UpdateProfile, Window
+from app.profiles.repository import DeviceProfileRepository
+from app.profiles.snapshots import CODEC_JSON, CODEC_ZLIB, decode_payload, encode_payload
+
+
+def test_given_zlib_codec_when_encode_then_round_trips_smaller():
+    payload = {
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "custom_headers": {"accept-language": "en-US,en;q=0.9"},
+        "version": 4,
+    }
+    plain, blob, codec = encode_payload(payload, CODEC_ZLIB)
+    assert plain is None and codec == "zlib:1"
+    assert blob is not None and len(blob) < len(str(payload))
+    assert decode_payload(plain, blob, codec) == payload
+
+
+def test_given_json_codec_when_encode_then_plain_and_legacy_rows_readable():
+    payload = {"name": "n"}
+    assert encode_payload(payload, CODEC_JSON) == (payload, None, None)
+    assert decode_payload(payload, None, None) == payload
+
+
+def test_given_unknown_codec_when_decode_then_raises():
+    with pytest.raises(ValueError):
+        decode_payload(None, b"x", "zstd:9")
+
+
+def test_given_zlib_repo_when_patch_then_versions_compressed_and_readable(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        legacy = DeviceProfileRepository(s, snapshot_codec=CODEC_JSON)
+        dp = legacy.create(
+            uid,
+            CreateProfile(name="ZC0", device_type=DeviceType.desktop, window=Window(width=5, height=5), user_agent="ua", country="us"),
+        )
+        repo = DeviceProfileRepository(s, snapshot_codec=CODEC_ZLIB)
+        repo.update_optimistic(uid, dp.id, UpdateProfile(name="ZC1", version=1))
+        s.commit()
+        rows = s.execute(
+            select(DeviceProfileVersion.codec).where(DeviceProfileVersion.profile_id == dp.id).order_by(DeviceProfileVersion.version)
+        ).scalars().all()
+        assert rows == [None, "zlib:1"]
+        assert repo.get_version(uid, dp.id, 1).name == "ZC0"
+        assert repo.get_version(uid, dp.id, 2).name == "ZC1"
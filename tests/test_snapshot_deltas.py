@@ -0,0 +1,63 @@
+from sqlalchemy import select
+
+from app.db.session import get_session
+from app.db.models import DeviceProfileVersion, DeviceType
+from app.profiles.dto import CreateProfile, UpdateProfile, Window, HeaderKV
+from app.profiles.repository import DeviceProfileRepository
+from app.profiles.snapshots import apply_deltas, diff_snapshot, encode_version, is_checkpoint
+
+
+def test_given_interval_when_is_checkpoint_then_first_and_every_kth():
+    assert is_checkpoint(1, 5)
+    assert not is_checkpoint(2, 5)
+    assert is_checkpoint(6, 5)
+    assert is_checkpoint(3, 1)
+
+
+def test_given_changed_name_when_diff_then_only_changed_keys():
+    prev = {"id": "p", "name": "a", "user_agent": "long ua", "version": 1}
+    cur = {"id": "p", "name": "b", "user_agent": "long ua", "version": 2}
+    assert diff_snapshot(prev, cur) == {"name": "b", "version": 2}
+    assert apply_deltas(prev, [diff_snapshot(prev, cur)]) == cur
+
+
+def test_given_no_previous_when_encode_then_full_checkpoint():
+    snap = {"id": "p", "version": 3}
+    assert encode_version(3, snap, None, 10) == (snap, True)
+    assert encode_version(3, snap, {"id": "p", "version": 2}, 10) == ({"version": 3}, False)
+
+
+def test_given_many_patches_when_get_version_then_reconstructs_from_checkpoint(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s, checkpoint_interval=3)
+        dp = repo.create(
+            uid,
+            CreateProfile(
+                name="DELTA0",
+                device_type=DeviceType.desktop,
+                window=Window(width=10, height=10),
+                user_agent="ua-long-value",
+                country="us",
+                custom_headers=[HeaderKV(key="x-a", value="1")],
+            ),
+        )
+        pid = dp.id
+        for i in range(1, 7):
+            repo.update_optimistic(uid, pid, UpdateProfile(name=f"DELTA{i}", version=i))
+        repo.update_optimistic(uid, pid, UpdateProfile(custom_headers=[], version=7))
+        s.commit()
+        rows = s.execute(
+            select(DeviceProfileVersion.version, DeviceProfileVersion.is_checkpoint, DeviceProfileVersion.snapshot)
+            .where(DeviceProfileVersion.profile_id == pid)
+            .order_by(DeviceProfileVersion.version)
+        ).all()
+        assert [r[1] for r in rows] == [True, False, False, True, False, False, True, False]
+        assert "user_agent" not in rows[1][2]
+        for v in range(1, 9):
+            snap = repo.get_version(uid, pid, v)
+            assert snap.version == v
+            assert snap.user_agent == "ua-long-value"
+        assert repo.get_version(uid, pid, 5).name == "DELTA4"
+        assert repo.get_version(uid, pid, 7).custom_headers
+        assert not repo.get_version(uid, pid, 8).custom_headers
@@ -0,0 +1,48 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.profiles.pipeline import GetRequest, GetValidator, ListRequest, ListValidator, parse_fields
+from app.profiles.repository import PROFILE_COLUMNS, columns_for_fields
+
+
+def test_given_fields_when_parse_then_validated_and_deduplicated():
+    assert parse_fields(None) is None
+    assert parse_fields(" user_agent,window,user_agent ") == ("user_agent", "window")
+    for bad in ("", "width", "user_agent,secret"):
+        with pytest.raises(ValueError):
+            parse_fields(bad)
+    with pytest.raises(ValueError):
+        GetValidator().validate(GetRequest(user_id="u", profile_id="p", fields="nope"))
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", fields="nope"))
+
+
+def test_given_fields_when_columns_for_fields_then_minimal_set():
+    assert columns_for_fields(None) == PROFILE_COLUMNS
+    assert set(columns_for_fields(("window", "user_agent"))) == {"id", "version", "width", "height", "user_agent"}
+
+
+def test_given_fields_when_get_and_list_then_sparse_with_same_etag(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    body = {
+        "name": "SPARSE1", "device_type": "desktop", "window": {"width": 800, "height": 600}, "user_agent": "UA-S",
+        "country": "us", "custom_headers": [{"key": "X-A", "value": "1"}],
+    }
+    pid = client.post("/v1/device-profiles/", json=body, headers=h).json()["id"]
+
+    full = client.get(f"/v1/device-profiles/{pid}", headers=h)
+    r = client.get(f"/v1/device-profiles/{pid}?fields=user_agent,custom_headers,window", headers=h)
+    assert r.status_code == 200
+    assert r.json() == {
+        "id": pid, "version": 1, "user_agent": "UA-S", "custom_headers": [{"key": "x-a", "value": "1"}],
+        "window": {"width": 800, "height": 600},
+    }
+    assert r.headers["ETag"] == full.headers["ETag"]
+    assert client.get(f"/v1/device-profiles/{pid}?fields=user_agent", headers={**h, "If-None-Match": r.headers["ETag"]}).status_code == 304
+    assert client.get(f"/v1/device-profiles/{pid}?fields=bogus", headers=h).status_code == 400
+
+    page = client.get("/v1/device-profiles?fields=name&is_template=false&limit=1&sort=name", headers=h).json()
+    assert set(page["data"][0]) == {"id", "version", "name"}
@@ -0,0 +1,43 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import create_app
+from app.db.explain import explain, uses_index
+from app.db.session import get_session
+from app.profiles.pipeline import ListRequest, ListRequestTransformer, ListValidator
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+def test_given_blank_ua_when_validate_then_raises():
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", ua="  "))
+    assert ListRequestTransformer().transform(ListRequest(user_id="u", ua=" Chrome/120 ")).ua == "Chrome/120"
+
+
+def test_given_profiles_when_filter_by_ua_then_substring_matched_and_paged(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    base = {"device_type": "desktop", "window": {"width": 10, "height": 10}, "country": "us"}
+    for i in range(3):
+        client.post("/v1/device-profiles/", json={**base, "name": f"UA120-{i}", "user_agent": f"Mozilla/5.0 Chrome/120.0.{i} Safari"}, headers=h)
+    client.post("/v1/device-profiles/", json={**base, "name": "UA121", "user_agent": "Mozilla/5.0 Chrome/121.0 Safari"}, headers=h)
+
+    seen = []
+    url = "/v1/device-profiles?ua=chrome/120&limit=2"
+    r = client.get(url, headers=h)
+    seen += [p["name"] for p in r.json()["data"]]
+    r = client.get(f"{url}&cursor={r.json()['next_cursor']}", headers=h)
+    seen += [p["name"] for p in r.json()["data"]]
+    assert sorted(seen) == ["UA120-0", "UA120-1", "UA120-2"]
+    assert client.get("/v1/device-profiles?ua=%20", headers=h).status_code == 400
+
+
+def test_given_trgm_index_when_ua_filter_then_index_used(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        s.execute(text("SET LOCAL enable_seqscan = off"))
+        s.execute(text("SET LOCAL enable_indexscan = off"))
+        plan = explain(s, DeviceProfileRepository(s)._page_query(uid, ListFilters(ua="Chrome/120", is_template=False)))
+        assert uses_index(plan, "idx_profiles_ua_trgm")
@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+from app.profiles.dto import CreateProfile
+from app.profiles.pipeline import UpsertRequest, UpsertValidator
+
+
+def test_given_body_name_for_other_profile_when_validate_then_raises(profile_payload):
+    with pytest.raises(ValueError):
+        UpsertValidator().validate(UpsertRequest(owner_id="u", name="a", payload=CreateProfile(name="b", **profile_payload)))
+    UpsertValidator().validate(UpsertRequest(owner_id="u", name="a", payload=CreateProfile(name="A", **profile_payload)))
+
+
+def test_given_put_by_name_when_repeated_then_created_unchanged_updated(seed_env, profile_payload):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+
+    first = client.put("/v1/device-profiles/by-name/UPS1", json=profile_payload, headers=h)
+    assert first.status_code == 201
+    assert first.json()["result"] == "created"
+    pid = first.json()["profile"]["id"]
+    assert first.headers["ETag"] == "1"
+
+    same = client.put("/v1/device-profiles/by-name/ups1", json={**profile_payload, "name": "UPS1"}, headers=h)
+    assert (same.status_code, same.json()["result"], same.json()["profile"]["version"]) == (200, "unchanged", 1)
+
+    changed = client.put("/v1/device-profiles/by-name/UPS1", json={**profile_payload, "country": "de"}, headers=h)
+    body = changed.json()
+    assert (body["result"], body["profile"]["id"], body["profile"]["version"], body["profile"]["country"]) == (
+        "updated",
+        pid,
+        2,
+        "de",
+    )
+    versions = client.get(f"/v1/device-profiles/{pid}/versions", headers=h).json()
+    assert [v["version"] for v in versions] == [1, 2]
+    assert client.get(f"/v1/device-profiles/{pid}/versions/1", headers=h).json()["country"] == "us"
+
+    facets = client.get("/v1/device-profiles:facets", headers=h).json()
+    assert facets["country"].get("de", 0) >= 1
+
+    client.delete(f"/v1/device-profiles/{pid}", headers=h)
+    again = client.put("/v1/device-profiles/by-name/UPS1", json=profile_payload, headers=h)
+    assert again.json()["result"] == "created"
+    assert again.json()["profile"]["id"] != pid
+
+    assert client.put("/v1/device-profiles/by-name/UPS2", json={**profile_payload, "country": "zz"}, headers=h).status_code == 422
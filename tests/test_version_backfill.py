@@ -0,0 +1,43 @@
+import importlib.util
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.main import create_app
+
+
+def _backfill_sql() -> str:
+    path = Path(__file__).parent.parent / "migrations" / "versions" / "7c3f9a1e6b54_backfill_version_checkpoints.py"
+    spec = importlib.util.spec_from_file_location("backfill_version_checkpoints", path)
+    assert spec is not None and spec.loader is not None
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod.BACKFILL_SQL
+
+
+def test_given_profile_without_history_when_backfilled_then_later_versions_readable(seed_env):
+    raw, uid = seed_env
+    eng = create_engine(os.environ["DATABASE_URL"], isolation_level="AUTOCOMMIT")
+    with eng.connect() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO device_profiles(id, owner_id, name, device_type, width, height, user_agent, country, visibility, version)
+                VALUES ('prof_legacy', :o, 'Legacy', 'mobile', 10, 20, 'ua', 'us', 'global_', 3)
+                """
+            ),
+            {"o": uid},
+        )
+        conn.execute(text(_backfill_sql()))
+        conn.execute(text(_backfill_sql()))
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+
+    assert [v["version"] for v in client.get("/v1/device-profiles/prof_legacy/versions", headers=h).json()] == [3]
+    r = client.patch("/v1/device-profiles/prof_legacy", json={"user_agent": "ua2", "version": 3}, headers=h)
+    assert r.json()["version"] == 4
+    v4 = client.get("/v1/device-profiles/prof_legacy/versions/4", headers=h)
+    assert v4.status_code == 200
+    assert (v4.json()["user_agent"], v4.json()["visibility"], v4.json()["window"]) == ("ua2", "global", {"width": 10, "height": 20})
@@ -0,0 +1,53 @@
+from sqlalchemy import func, select
+
+from app.db.session import get_session
+from app.db.models import DeviceProfileVersion, DeviceProfileVersionOutbox, DeviceType
+from app.profiles.dto import CreateProfile, UpdateProfile, Window
+from app.profiles.outbox import OutboxWriter, drain_all
+from app.profiles.repository import DeviceProfileRepository, WRITE_MODE_OUTBOX
+
+
+def _count(s, model, pid):
+    return s.execute(select(func.count()).select_from(model).where(model.profile_id == pid)).scalar_one()
+
+
+def test_given_outbox_mode_when_write_then_reads_through_and_drains_in_order(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s, snapshot_write_mode=WRITE_MODE_OUTBOX, checkpoint_interval=2)
+        dp = repo.create(
+            uid,
+            CreateProfile(name="OB0", device_type=DeviceType.desktop, window=Window(width=5, height=5), user_agent="ua", country="us"),
+        )
+        pid = dp.id
+        repo.update_optimistic(uid, pid, UpdateProfile(name="OB1", version=1))
+        repo.update_optimistic(uid, pid, UpdateProfile(name="OB2", version=2))
+        s.commit()
+        assert _count(s, DeviceProfileVersion, pid) == 0
+        assert [m.version for m in repo.list_versions(uid, pid)] == [1, 2, 3]
+        assert repo.get_version(uid, pid, 2).name == "OB1"
+
+        drain_all(s, batch_size=2)
+        assert _count(s, DeviceProfileVersionOutbox, pid) == 0
+        assert _count(s, DeviceProfileVersion, pid) == 3
+        items, _ = repo.list_versions_page(uid, pid, limit=10, cursor_version=None)
+        assert [m.version for m in items] == [1, 2, 3]
+        assert repo.get_version(uid, pid, 3).name == "OB2"
+
+
+def test_given_writer_when_stopped_then_outbox_flushed(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        repo = DeviceProfileRepository(s, snapshot_write_mode=WRITE_MODE_OUTBOX)
+        dp = repo.create(
+            uid,
+            CreateProfile(name="OBW", device_type=DeviceType.desktop, window=Window(width=5, height=5), user_agent="ua", country="us"),
+        )
+        pid = dp.id
+        s.commit()
+    writer = OutboxWriter(get_session, flush_ms=10_000, batch_size=100)
+    writer.start()
+    writer.stop()
+    with get_session() as s:
+        assert _count(s, DeviceProfileVersion, pid) == 1
+        assert _count(s, DeviceProfileVersionOutbox, pid) == 0
@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import create_app
+from app.db.explain import explain, uses_index
+from app.db.session import get_session
+from app.profiles.pipeline import ListRequest, ListValidator, NearestRequest, NearestValidator
+from app.profiles.repository import DeviceProfileRepository, ListFilters
+
+
+def test_given_bad_ranges_when_validate_then_raises():
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", min_width=900, max_width=800))
+    with pytest.raises(ValueError):
+        ListValidator().validate(ListRequest(user_id="u", max_height=20000))
+    ListValidator().validate(ListRequest(user_id="u", min_width=800))
+    with pytest.raises(ValueError):
+        NearestValidator().validate(NearestRequest(user_id="u", width=0, height=10))
+    with pytest.raises(ValueError):
+        NearestValidator().validate(NearestRequest(user_id="u", width=10, height=10, k=500))
+    with pytest.raises(ValueError):
+        NearestValidator().validate(NearestRequest(user_id="u", width=10, height=10, device_type="tv"))
+
+
+def test_given_viewports_when_range_and_nearest_then_matched(seed_env):
+    raw, _ = seed_env
+    client = TestClient(create_app())
+    h = {"X-API-Key": raw}
+    base = {"device_type": "desktop", "user_agent": "UA", "country": "us"}
+    for name, (w, ht) in {"VP1": (1366, 768), "VP2": (1440, 900), "VP3": (1920, 1080), "VP4": (390, 844)}.items():
+        client.post("/v1/device-profiles/", json={**base, "name": name, "window": {"width": w, "height": ht}}, headers=h)
+
+    r = client.get("/v1/device-profiles?min_width=1400&max_width=2000&is_template=false&limit=100", headers=h)
+    assert {p["name"] for p in r.json()["data"]} == {"VP2", "VP3"}
+    r = client.get("/v1/device-profiles?max_height=800&is_template=false", headers=h)
+    assert [p["name"] for p in r.json()["data"]] == ["VP1"]
+
+    r = client.get("/v1/device-profiles:nearest?width=1440&height=880&k=2&is_template=false", headers=h)
+    assert r.status_code == 200
+    body = r.json()
+    assert [m["profile"]["name"] for m in body] == ["VP2", "VP1"]
+    assert body[0]["distance"] == pytest.approx(20.0)
+    assert client.get("/v1/device-profiles:nearest?width=0&height=1", headers=h).status_code == 400
+
+
+def test_given_gist_indexes_when_nearest_then_knn_scans(seed_env):
+    _, uid = seed_env
+    with get_session() as s:
+        s.execute(text("SET LOCAL enable_seqscan = off"))
+        s.execute(text("SET LOCAL enable_sort = off"))
+        plan = explain(s, DeviceProfileRepository(s)._nearest_query(uid, 1440, 900, 5, ListFilters()))
+        assert uses_index(plan, "idx_profiles_owner_viewport")
+        assert uses_index(plan, "idx_profiles_global_tmpl_viewport")